@@ -0,0 +1,416 @@
+import argparse
+import contextlib
+import datetime
+import io
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import runpy
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+try:
+    import resource # Hanya Unix; di Windows kolom RSS bernilai 0
+except ImportError:
+    resource = None
+
+from dashboard_pjk import (
+    bagi_hierarki, bagi_kelompok_rata, buat_data_dummy, buat_data_dummy_massal, cek_proporsi_dan_std, hitung_verifikasi,
+    optimasi_proporsi, simpan_hasil, simpan_laporan_kelompok, simpan_laporan_verifikasi, _modul_laporan,
+    PENULIS_OUTPUT, FOLDER_REPO, NAMA_FILE_DUMMY,
+    JUMLAH_KB, JUMLAH_KS, KOLOM_FAKULTAS, KOLOM_JALUR, KOLOM_JK, KOLOM_KB_OUTPUT, KOLOM_KS_OUTPUT,
+)
+
+# --- Konfigurasi Benchmark ---
+UKURAN_BENCHMARK = [10_000, 30_000, 100_000, 300_000]
+UKURAN_BENCHMARK_PARALEL = 1_000_000
+JUMLAH_KB_PARALEL = 40 # Skenario multi-kampus: banyak KB
+UKURAN_BENCHMARK_FORMAT = 1_000_000
+UKURAN_BENCHMARK_OUTPUT = 100_000
+UKURAN_BENCHMARK_OPTIMASI = 50_000
+UKURAN_BENCHMARK_LAPORAN = 2000 # 5 KB x 25 KS = 130 PDF
+UKURAN_SUITE = [1_000, 10_000, 100_000] # Ukuran angkatan default untuk suite (bisa sampai 1_000_000 via --ukuran)
+BARIS_TABEL_SUITE = [1_000, 10_000] # Jumlah baris default untuk kasus print_table / print_tabel_cepat
+NAMA_FILE_HASIL_BENCHMARK = 'hasil_benchmark.json'
+AMBANG_REGRESI = 0.20 # Lebih lambat/boros >20% dari baseline dianggap regresi
+SELISIH_MIN_REGRESI = {'waktu_min': 0.02, 'impor_ms': 10.0} # Selisih absolut di bawah ini dianggap derau (mis. startup ~30 ms)
+EKSTENSI_FORMAT = {'xlsx': '.xlsx', 'xlsx-stream': '.xlsx', 'csv': '.csv', 'parquet': '.parquet'}
+ULANGAN = 3
+CLI_PJK = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cli_pjk.py')
+JUMLAH_MODUL_TERATAS = 5 # Import tingkat atas terlama per subperintah yang dicatat di JSON
+
+def ukur_waktu(fungsi, *args, ulangan=ULANGAN, **kwargs):
+    """Waktu terbaik (detik) dari beberapa kali pemanggilan fungsi (pesan progres disembunyikan)."""
+    terbaik = float('inf')
+    for _ in range(ulangan):
+        with contextlib.redirect_stdout(io.StringIO()):
+            mulai = time.perf_counter()
+            fungsi(*args, **kwargs)
+            terbaik = min(terbaik, time.perf_counter() - mulai)
+    return terbaik
+
+def benchmark_pembagian(ukuran=UKURAN_BENCHMARK, jumlah_kb=JUMLAH_KB, jumlah_ks=JUMLAH_KS):
+    """Mengukur waktu bagi_kelompok_rata untuk beberapa ukuran data (harus tumbuh ~linear)."""
+    print(f"\n--- Benchmark bagi_kelompok_rata (KB={jumlah_kb}, KS={jumlah_ks}) ---")
+    print(f"{'Jumlah Data':>12} {'Waktu (s)':>10} {'us/baris':>10}")
+    hasil = []
+    for n in ukuran:
+        df = buat_data_dummy_massal(n, rng=0)
+        waktu = ukur_waktu(bagi_kelompok_rata, df, jumlah_kb, jumlah_ks)
+        hasil.append((n, waktu))
+        print(f"{n:>12} {waktu:>10.3f} {waktu / n * 1e6:>10.2f}")
+    return hasil
+
+def benchmark_paralel(jumlah_data=UKURAN_BENCHMARK_PARALEL, jumlah_kb=JUMLAH_KB_PARALEL, jumlah_ks=JUMLAH_KS,
+                      daftar_worker=None):
+    """Membandingkan bagi_kelompok_rata dengan 1 worker vs N worker pada data yang sama."""
+    if daftar_worker is None:
+        daftar_worker = sorted({1, 2, os.cpu_count() or 1})
+    print(f"\n--- Benchmark paralel ({jumlah_data} baris, KB={jumlah_kb}, KS={jumlah_ks}) ---")
+    print(f"{'Worker':>8} {'Waktu (s)':>10} {'Speedup':>8}")
+    df = buat_data_dummy_massal(jumlah_data, rng=0)
+    hasil = []
+    for jumlah_worker in daftar_worker:
+        waktu = ukur_waktu(bagi_kelompok_rata, df, jumlah_kb, jumlah_ks, rng=0, jumlah_worker=jumlah_worker)
+        hasil.append((jumlah_worker, waktu))
+        print(f"{jumlah_worker:>8} {waktu:>10.3f} {hasil[0][1] / waktu:>8.2f}x")
+    return hasil
+
+def benchmark_format_kompak(jumlah_data=UKURAN_BENCHMARK_FORMAT, jumlah_kb=JUMLAH_KB, jumlah_ks=JUMLAH_KS):
+    """Membandingkan memori & waktu layout string (object) vs Categorical + label int16."""
+    print(f"\n--- Benchmark format data ({jumlah_data} baris) ---")
+    print(f"{'Format':>10} {'Memori (MB)':>12} {'Pembagian (s)':>14} {'Verifikasi (s)':>15}")
+    df_kompak = buat_data_dummy_massal(jumlah_data, rng=0)
+    df_object = df_kompak.astype({kolom: object for kolom in [KOLOM_FAKULTAS, KOLOM_JALUR, KOLOM_JK]})
+    hasil = {}
+    for nama_format, df in [('object', df_object), ('kompak', df_kompak)]:
+        with contextlib.redirect_stdout(io.StringIO()):
+            df_hasil = bagi_kelompok_rata(df, jumlah_kb, jumlah_ks, rng=0)
+        memori = df_hasil.memory_usage(deep=True).sum() / 2**20
+        waktu_bagi = ukur_waktu(bagi_kelompok_rata, df, jumlah_kb, jumlah_ks, rng=0)
+        waktu_cek = ukur_waktu(hitung_verifikasi, df, df_hasil, jumlah_kb, jumlah_ks)
+        hasil[nama_format] = (memori, waktu_bagi, waktu_cek)
+        print(f"{nama_format:>10} {memori:>12.1f} {waktu_bagi:>14.3f} {waktu_cek:>15.3f}")
+    return hasil
+
+def _rss_puncak_kb():
+    """Peak RSS proses ini (KB di Linux); 0 jika modul resource tidak tersedia."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else 0
+
+def _ukur_writer(format_output, jumlah_data, per_kb):
+    """Dijalankan di proses baru: waktu tulis dan kenaikan peak RSS (MB) yang disebabkan writer."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        df_hasil = bagi_kelompok_rata(buat_data_dummy_massal(jumlah_data, rng=0), JUMLAH_KB, JUMLAH_KS, rng=0)
+    rss_awal = _rss_puncak_kb()
+    with tempfile.TemporaryDirectory() as folder:
+        mulai = time.perf_counter()
+        simpan_hasil(df_hasil, os.path.join(folder, 'hasil' + EKSTENSI_FORMAT[format_output]), format_output, per_kb=per_kb)
+        waktu = time.perf_counter() - mulai
+    rss_akhir = _rss_puncak_kb()
+    return waktu, (rss_akhir - rss_awal) / 1024 # ru_maxrss dalam KB di Linux
+
+def benchmark_output(jumlah_data=UKURAN_BENCHMARK_OUTPUT, per_kb=False):
+    """Waktu dan peak RSS tiap writer di PENULIS_OUTPUT, masing-masing di proses terpisah."""
+    print(f"\n--- Benchmark writer output ({jumlah_data} baris, per_kb={per_kb}) ---")
+    print(f"{'Format':>12} {'Waktu (s)':>10} {'+Peak RSS (MB)':>15}")
+    hasil = {}
+    konteks = multiprocessing.get_context('spawn') # Proses bersih agar peak RSS tidak tercampur
+    for format_output in PENULIS_OUTPUT:
+        with ProcessPoolExecutor(max_workers=1, mp_context=konteks) as executor:
+            try:
+                waktu, rss = executor.submit(_ukur_writer, format_output, jumlah_data, per_kb).result()
+            except ImportError as e:
+                print(f"{format_output:>12} dilewati: {e}")
+                continue
+        hasil[format_output] = (waktu, rss)
+        print(f"{format_output:>12} {waktu:>10.3f} {rss:>15.1f}")
+    return hasil
+
+def benchmark_optimasi(jumlah_data=UKURAN_BENCHMARK_OPTIMASI, jumlah_kb=JUMLAH_KB, jumlah_ks=JUMLAH_KS, batas_waktu=10.0):
+    """Objektif sebelum/sesudah optimasi_proporsi, waktu konvergensi, dan jumlah KS yang melewati toleransi."""
+    print(f"\n--- Benchmark optimasi proporsi ({jumlah_data} baris, batas {batas_waktu} detik) ---")
+    df = buat_data_dummy_massal(jumlah_data, rng=0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        df_hasil = bagi_kelompok_rata(df, jumlah_kb, jumlah_ks, rng=0)
+    df_optimal, laporan = optimasi_proporsi(df_hasil, jumlah_ks, batas_waktu=batas_waktu, rng=0)
+    ks_awal = hitung_verifikasi(df, df_hasil, jumlah_kb, jumlah_ks).ks
+    ks_akhir = hitung_verifikasi(df, df_optimal, jumlah_kb, jumlah_ks).ks
+    print(f"Objektif: {laporan.objektif_awal:.1f} -> {laporan.objektif_akhir:.1f} dalam {laporan.durasi:.2f} detik "
+          f"({laporan.jumlah_tukar} tukar / {laporan.jumlah_usulan} usulan)")
+    print(f"KS melewati toleransi: {int(ks_awal['signifikan'].sum())} -> {int(ks_akhir['signifikan'].sum())}")
+    return laporan
+
+def benchmark_laporan_kelompok(jumlah_data=UKURAN_BENCHMARK_LAPORAN, jumlah_kb=JUMLAH_KB, jumlah_ks=JUMLAH_KS,
+                               daftar_worker=None):
+    """Throughput (dokumen/detik) render PDF per KB dan per KS dengan 1 vs N worker."""
+    if daftar_worker is None:
+        daftar_worker = sorted({1, os.cpu_count() or 1})
+    print(f"\n--- Benchmark laporan PDF per kelompok ({jumlah_data} baris, KB={jumlah_kb}, KS={jumlah_ks}) ---")
+    print(f"{'Worker':>8} {'Dokumen':>8} {'Waktu (s)':>10} {'Dok/detik':>10}")
+    with contextlib.redirect_stdout(io.StringIO()):
+        df_hasil = bagi_kelompok_rata(buat_data_dummy_massal(jumlah_data, rng=0), jumlah_kb, jumlah_ks, rng=0)
+    hasil = []
+    for jumlah_worker in daftar_worker:
+        with tempfile.TemporaryDirectory() as folder, contextlib.redirect_stdout(io.StringIO()):
+            batch = simpan_laporan_kelompok(df_hasil, folder, jumlah_worker=jumlah_worker)
+        hasil.append((jumlah_worker, batch))
+        print(f"{jumlah_worker:>8} {batch.jumlah:>8} {batch.durasi:>10.2f} {batch.dokumen_per_detik:>10.1f}")
+    return hasil
+
+# --- Suite Benchmark (hasil JSON untuk baseline & deteksi regresi) ---
+@dataclass
+class KasusBenchmark:
+    persiapan: object # fungsi(parameter, folder, font_dir) -> fungsi tanpa argumen yang diukur
+    dimensi: tuple # nama parameter yang divariasikan, mis. ('jumlah_data', 'jumlah_kb', 'jumlah_ks')
+
+def _data_hasil(parameter):
+    df = buat_data_dummy_massal(parameter['jumlah_data'], rng=0)
+    return df, bagi_kelompok_rata(df, parameter.get('jumlah_kb', JUMLAH_KB), parameter.get('jumlah_ks', JUMLAH_KS), rng=0)
+
+def _persiapan_buat_data_dummy(parameter, folder, font_dir):
+    path = os.path.join(folder, os.path.basename(NAMA_FILE_DUMMY)) # Termasuk menulis file dummy, di folder sementara kasus
+    return lambda: buat_data_dummy(parameter['jumlah_data'], rng=0, path=path)
+
+def _persiapan_buat_data_dummy_massal(parameter, folder, font_dir):
+    return lambda: buat_data_dummy_massal(parameter['jumlah_data'], rng=0)
+
+def _persiapan_bagi_kelompok_rata(parameter, folder, font_dir):
+    df = buat_data_dummy_massal(parameter['jumlah_data'], rng=0)
+    return lambda: bagi_kelompok_rata(df, parameter['jumlah_kb'], parameter['jumlah_ks'], rng=0)
+
+def _persiapan_bagi_hierarki_4_tingkat(parameter, folder, font_dir):
+    df = buat_data_dummy_massal(parameter['jumlah_data'], rng=0)
+    hierarki = [('klaster', 2, [KOLOM_FAKULTAS]), (KOLOM_KB_OUTPUT, parameter['jumlah_kb'], [KOLOM_FAKULTAS], True),
+                (KOLOM_KS_OUTPUT, parameter['jumlah_ks'], [KOLOM_JK, KOLOM_JALUR]), ('kelompok_kecil', 4, [KOLOM_FAKULTAS])]
+    return lambda: bagi_hierarki(df, hierarki, rng=0)
+
+def _persiapan_cek_proporsi(parameter, folder, font_dir):
+    df, df_hasil = _data_hasil(parameter)
+    return lambda: cek_proporsi_dan_std(df, df_hasil, parameter['jumlah_kb'], parameter['jumlah_ks'])
+
+def _persiapan_simpan_hasil(format_output):
+    def persiapan(parameter, folder, font_dir):
+        if format_output == 'parquet':
+            import pyarrow # noqa: F401 -- dilewati lebih awal jika tidak terpasang
+        _, df_hasil = _data_hasil(parameter)
+        path = os.path.join(folder, 'hasil' + EKSTENSI_FORMAT[format_output])
+        return lambda: simpan_hasil(df_hasil, path, format_output)
+    return persiapan
+
+def _persiapan_tabel(nama_fungsi):
+    def persiapan(parameter, folder, font_dir):
+        lp = _modul_laporan()
+        print_fungsi = getattr(lp, nama_fungsi)
+        builder = lp.ReportBuilder(font_dir=font_dir, verbose=False)
+        data = [[f"MHS{i:07d}", f"Nama Mahasiswa {i}", 'Teknik', 'SNMPTN', 'Laki-laki'] for i in range(parameter['baris_tabel'])]
+        return lambda: print_fungsi(builder.buat_pdf('Benchmark'), ['NIM', 'Nama', 'Fakultas', 'Jalur', 'JK'], data)
+    return persiapan
+
+def _persiapan_laporan_riset(parameter, folder, font_dir):
+    lp = _modul_laporan()
+    laporan = runpy.run_path(os.path.join(FOLDER_REPO, 'pembagian-kelompok.py'))['laporan_riset']
+    builder = lp.ReportBuilder(font_dir=font_dir, verbose=False)
+    return lambda: builder.render(laporan)
+
+def _persiapan_laporan_verifikasi(parameter, folder, font_dir):
+    df, df_hasil = _data_hasil(parameter)
+    hasil = hitung_verifikasi(df, df_hasil, parameter['jumlah_kb'], parameter['jumlah_ks'])
+    path = os.path.join(folder, 'laporan.pdf')
+    return lambda: simpan_laporan_verifikasi(hasil, df_hasil, path, font_dir=font_dir)
+
+KASUS_BENCHMARK = {
+    'buat_data_dummy': KasusBenchmark(_persiapan_buat_data_dummy, ('jumlah_data',)),
+    'buat_data_dummy_massal': KasusBenchmark(_persiapan_buat_data_dummy_massal, ('jumlah_data',)),
+    'bagi_kelompok_rata': KasusBenchmark(_persiapan_bagi_kelompok_rata, ('jumlah_data', 'jumlah_kb', 'jumlah_ks')),
+    'bagi_hierarki_4_tingkat': KasusBenchmark(_persiapan_bagi_hierarki_4_tingkat, ('jumlah_data', 'jumlah_kb', 'jumlah_ks')),
+    'cek_proporsi_dan_std': KasusBenchmark(_persiapan_cek_proporsi, ('jumlah_data', 'jumlah_kb', 'jumlah_ks')),
+    **{f"simpan_hasil[{f}]": KasusBenchmark(_persiapan_simpan_hasil(f), ('jumlah_data',)) for f in PENULIS_OUTPUT},
+    'print_table': KasusBenchmark(_persiapan_tabel('print_table'), ('baris_tabel',)),
+    'print_tabel_cepat': KasusBenchmark(_persiapan_tabel('print_tabel_cepat'), ('baris_tabel',)),
+    'render_laporan_riset': KasusBenchmark(_persiapan_laporan_riset, ()),
+    'laporan_verifikasi': KasusBenchmark(_persiapan_laporan_verifikasi, ('jumlah_data', 'jumlah_kb', 'jumlah_ks')),
+}
+
+def _jalankan_kasus(nama, parameter, ulangan, font_dir):
+    """Dijalankan di proses baru: waktu (min & median), peak RSS, dan puncak alokasi tracemalloc satu kasus."""
+    with tempfile.TemporaryDirectory() as folder: # Semua file samping kasus ditulis ke sini lewat path absolut
+        with contextlib.redirect_stdout(io.StringIO()):
+            fungsi = KASUS_BENCHMARK[nama].persiapan(parameter, folder, font_dir)
+            rss_awal = _rss_puncak_kb()
+            waktu = []
+            for _ in range(ulangan):
+                mulai = time.perf_counter()
+                fungsi()
+                waktu.append(time.perf_counter() - mulai)
+            rss_akhir = _rss_puncak_kb()
+            tracemalloc.start() # Putaran terpisah: tracemalloc memperlambat, jadi tidak ikut diukur waktunya
+            fungsi()
+            _, alokasi_puncak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+    return {
+        'waktu_min': min(waktu), 'waktu_median': statistics.median(waktu), 'ulangan': ulangan,
+        'rss_puncak_mb': rss_akhir / 1024, 'rss_tambahan_mb': (rss_akhir - rss_awal) / 1024, # ru_maxrss dalam KB di Linux
+        'alokasi_puncak_mb': alokasi_puncak / 2**20,
+    }
+
+def daftar_parameter(kasus, nilai_dimensi):
+    """Semua kombinasi parameter untuk dimensi yang dipakai kasus."""
+    dimensi = KASUS_BENCHMARK[kasus].dimensi
+    for kombinasi in itertools.product(*(nilai_dimensi[d] for d in dimensi)):
+        yield dict(zip(dimensi, kombinasi))
+
+def jalankan_suite(daftar_kasus=None, ukuran=UKURAN_SUITE, jumlah_kb=(JUMLAH_KB,), jumlah_ks=(JUMLAH_KS,),
+                   baris_tabel=BARIS_TABEL_SUITE, ulangan=ULANGAN, font_dir=None):
+    """Menjalankan setiap (kasus, parameter) di proses spawn tersendiri; mengembalikan dict siap ditulis sebagai JSON."""
+    nilai_dimensi = {'jumlah_data': ukuran, 'jumlah_kb': jumlah_kb, 'jumlah_ks': jumlah_ks, 'baris_tabel': baris_tabel}
+    font_dir = os.getcwd() if font_dir is None else os.path.abspath(font_dir) # Font dicari relatif folder kerja awal
+    konteks = multiprocessing.get_context('spawn')
+    hasil = []
+    print(f"{'Kasus':<28} {'Parameter':<40} {'Waktu (s)':>10} {'+RSS (MB)':>10} {'Alokasi (MB)':>12}")
+    for kasus in daftar_kasus or KASUS_BENCHMARK:
+        for parameter in daftar_parameter(kasus, nilai_dimensi):
+            teks_parameter = ', '.join(f"{k}={v}" for k, v in parameter.items())
+            with ProcessPoolExecutor(max_workers=1, mp_context=konteks) as executor:
+                try:
+                    ukuran_kasus = executor.submit(_jalankan_kasus, kasus, parameter, ulangan, font_dir).result()
+                except ImportError as e:
+                    print(f"{kasus:<28} {teks_parameter:<40} dilewati: {e}")
+                    hasil.append({'kasus': kasus, 'parameter': parameter, 'dilewati': str(e)})
+                    continue
+            hasil.append({'kasus': kasus, 'parameter': parameter, **ukuran_kasus})
+            print(f"{kasus:<28} {teks_parameter:<40} {ukuran_kasus['waktu_min']:>10.3f} "
+                  f"{ukuran_kasus['rss_tambahan_mb']:>10.1f} {ukuran_kasus['alokasi_puncak_mb']:>12.1f}")
+    return {
+        'dibuat': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(), 'platform': platform.platform(), 'jumlah_cpu': os.cpu_count(),
+        'hasil': hasil,
+    }
+
+# --- Waktu Startup CLI (-X importtime) ---
+# Jalankan kecil khas cron per subperintah; 'bantuan' = biaya CLI murni tanpa pekerjaan
+PERINTAH_STARTUP = {
+    'bantuan': ['--help'],
+    'generate': ['generate', '--jumlah', '200', '--seed', '1', '--output', 'roster.csv'],
+    'assign': ['assign', 'roster.csv', '--seed', '1', '--jumlah-ks', '5', '--output', 'hasil.csv'],
+    'verify': ['verify', 'hasil.csv'],
+    'export': ['export', 'hasil.csv', '--output', 'ekspor.xlsx'],
+    'report': ['report', 'riset', '--output', 'riset.pdf'],
+}
+
+def _ringkas_importtime(stderr):
+    """Total waktu import (ms, jumlah kolom self) dan import tingkat atas terlama dari keluaran -X importtime."""
+    total_us, tingkat_atas = 0, []
+    for baris in stderr.splitlines():
+        if not baris.startswith('import time:') or 'self [us]' in baris:
+            continue
+        sendiri, kumulatif, nama = baris.split(':', 1)[1].split('|')
+        total_us += int(sendiri)
+        if not nama[1:].startswith(' '): # Modul bersarang diindentasi dua spasi per tingkat
+            tingkat_atas.append((nama.strip(), int(kumulatif) / 1000))
+    tingkat_atas.sort(key=lambda m: m[1], reverse=True)
+    return total_us / 1000, tingkat_atas[:JUMLAH_MODUL_TERATAS]
+
+def _jalankan_cli(argumen, folder, importtime=False):
+    perintah = [sys.executable, *(['-X', 'importtime'] if importtime else []), CLI_PJK, *argumen]
+    return subprocess.run(perintah, cwd=folder, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+
+def jalankan_startup(daftar_perintah=None, ulangan=ULANGAN, font_dir=None):
+    """Waktu dinding dan waktu import tiap subperintah cli_pjk.py di interpreter baru; baris hasil seperti suite."""
+    font_dir = os.getcwd() if font_dir is None else os.path.abspath(font_dir)
+    hasil = []
+    print(f"\n{'Startup CLI':<28} {'Waktu (s)':>10} {'Import (ms)':>12}  Import teratas")
+    with tempfile.TemporaryDirectory() as folder:
+        for nama in ('generate', 'assign'): # Input untuk verify/export tanpa ikut diukur
+            _jalankan_cli(PERINTAH_STARTUP[nama], folder)
+        for nama in daftar_perintah or PERINTAH_STARTUP:
+            argumen = PERINTAH_STARTUP[nama] + (['--font-dir', font_dir] if nama == 'report' else [])
+            waktu, ukuran_impor = [], []
+            for _ in range(ulangan):
+                mulai = time.perf_counter()
+                proses = _jalankan_cli(argumen, folder, importtime=True)
+                waktu.append(time.perf_counter() - mulai)
+                ukuran_impor.append(_ringkas_importtime(proses.stderr))
+            impor_ms, teratas = min(ukuran_impor)
+            hasil.append({'kasus': f"startup[{nama}]", 'parameter': {}, 'waktu_min': min(waktu),
+                          'waktu_median': statistics.median(waktu), 'ulangan': ulangan,
+                          'impor_ms': impor_ms, 'modul_teratas': teratas})
+            print(f"{'startup[' + nama + ']':<28} {min(waktu):>10.3f} {impor_ms:>12.1f}  "
+                  + ', '.join(f"{m} {ms:.0f}" for m, ms in teratas[:3]))
+    return hasil
+
+def _kunci_hasil(baris):
+    return baris['kasus'], json.dumps(baris['parameter'], sort_keys=True)
+
+def bandingkan_baseline(hasil, baseline, ambang=AMBANG_REGRESI, metrik=('waktu_min', 'alokasi_puncak_mb', 'impor_ms')):
+    """Membandingkan hasil dengan baseline per (kasus, parameter); mengembalikan daftar regresi."""
+    acuan = {_kunci_hasil(b): b for b in baseline['hasil'] if 'dilewati' not in b}
+    regresi = []
+    print(f"\n--- Perbandingan dengan baseline ({baseline.get('dibuat', '?')}, ambang {ambang:.0%}) ---")
+    for baris in hasil['hasil']:
+        lama = acuan.get(_kunci_hasil(baris))
+        if lama is None or 'dilewati' in baris:
+            continue
+        for nama_metrik in metrik:
+            if nama_metrik not in baris or nama_metrik not in lama: # Mis. impor_ms hanya ada di baris startup
+                continue
+            rasio = baris[nama_metrik] / lama[nama_metrik] if lama[nama_metrik] else 1.0
+            lebih_buruk = rasio > 1 + ambang and baris[nama_metrik] - lama[nama_metrik] >= SELISIH_MIN_REGRESI.get(nama_metrik, 0)
+            if lebih_buruk:
+                regresi.append((baris['kasus'], baris['parameter'], nama_metrik, rasio))
+            print(f"{baris['kasus']:<28} {json.dumps(baris['parameter']):<40} {nama_metrik:<18} {rasio:>6.2f}x"
+                  f"{'  <-- REGRESI' if lebih_buruk else ''}")
+    return regresi
+
+def jalankan_perbandingan():
+    """Benchmark perbandingan terarah (serial vs paralel, format data, writer, optimasi, laporan per kelompok)."""
+    benchmark_pembagian()
+    benchmark_paralel()
+    benchmark_format_kompak()
+    benchmark_output()
+    benchmark_optimasi()
+    benchmark_laporan_kelompok()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark pembagian kelompok dan pembuatan laporan PJK.")
+    parser.add_argument('--kasus', nargs='+', choices=list(KASUS_BENCHMARK), help="Kasus yang dijalankan (default: semua)")
+    parser.add_argument('--ukuran', nargs='+', type=int, default=UKURAN_SUITE, help="Ukuran angkatan, mis. 1000 100000 1000000")
+    parser.add_argument('--kb', nargs='+', type=int, default=[JUMLAH_KB], help="Jumlah Kelompok Besar")
+    parser.add_argument('--ks', nargs='+', type=int, default=[JUMLAH_KS], help="Jumlah Kelompok Sedang per KB")
+    parser.add_argument('--baris-tabel', nargs='+', type=int, default=BARIS_TABEL_SUITE, help="Jumlah baris untuk print_table / print_tabel_cepat")
+    parser.add_argument('--ulangan', type=int, default=ULANGAN)
+    parser.add_argument('--font-dir', default=None, help="Folder font DejaVu (default: folder kerja)")
+    parser.add_argument('--output', default=NAMA_FILE_HASIL_BENCHMARK, help="File JSON hasil")
+    parser.add_argument('--baseline', help="File JSON hasil sebelumnya untuk deteksi regresi")
+    parser.add_argument('--ambang', type=float, default=AMBANG_REGRESI)
+    parser.add_argument('--startup', nargs='+', choices=list(PERINTAH_STARTUP), help="Subperintah CLI yang diukur waktu startupnya (default: semua)")
+    parser.add_argument('--tanpa-startup', action='store_true', help="Lewati pengukuran startup CLI (-X importtime)")
+    parser.add_argument('--perbandingan', action='store_true', help="Jalankan benchmark perbandingan lama (output teks)")
+    args = parser.parse_args(argv)
+
+    if args.perbandingan:
+        jalankan_perbandingan()
+        return 0
+    hasil = jalankan_suite(args.kasus, args.ukuran, args.kb, args.ks, args.baris_tabel, args.ulangan, args.font_dir)
+    if not args.tanpa_startup:
+        hasil['hasil'] += jalankan_startup(args.startup, args.ulangan, args.font_dir)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(hasil, f, indent=2)
+    print(f"\nHasil benchmark disimpan ke {args.output}")
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regresi = bandingkan_baseline(hasil, json.load(f), args.ambang)
+        if regresi:
+            print(f"{len(regresi)} regresi terdeteksi.")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+import argparse
+import os
+import runpy
+import sys
+
+FOLDER_REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) # Sama dengan dashboard_pjk.FOLDER_REPO
+SKRIP_LAPORAN_RISET = os.path.join(FOLDER_REPO, 'pembagian-kelompok.py')
+FORMAT_TABEL = ['xlsx', 'xlsx-stream', 'csv', 'parquet'] # Kunci PENULIS_OUTPUT, ditulis ulang agar --help tidak meng-import pandas
+CONTOH_PEMAKAIAN = """contoh:
+  python cli_pjk.py generate --jumlah 2000 --seed 1 --output roster.csv
+  python cli_pjk.py assign roster.csv --seed 1 --output hasil.csv
+  python cli_pjk.py verify hasil.csv --ketat
+  python cli_pjk.py export hasil.csv --output hasil.xlsx --per-kb
+  python cli_pjk.py report verifikasi hasil.csv --output laporan.pdf
+  python cli_pjk.py report riset
+"""
+
+# Modul ini sengaja hanya meng-import pustaka standar: dashboard_pjk (pandas + numpy), Faker dan
+# laporan_pdf (fpdf) di-import oleh subperintah yang membutuhkannya, sehingga --help dan
+# `report riset` tidak membayar import pandas. Waktu startup diukur di benchmark_pjk.py (-X importtime).
+
+def _pjk():
+    """Import dashboard_pjk (pandas + numpy) hanya saat subperintah membutuhkannya."""
+    import dashboard_pjk
+    return dashboard_pjk
+
+def _jumlah_kelompok(pjk, df_hasil, args):
+    """Jumlah KB dan KS dari argumen, atau dari label terbesar di tabel hasil."""
+    jumlah_kb = args.jumlah_kb or int(df_hasil[pjk.KOLOM_KB_OUTPUT].max())
+    jumlah_ks = args.jumlah_ks or int(df_hasil[pjk.KOLOM_KS_OUTPUT].max())
+    return jumlah_kb, jumlah_ks
+
+# --- Subperintah ---
+def perintah_generate(args):
+    pjk = _pjk()
+    import numpy as np
+    jumlah = args.jumlah or pjk.JUMLAH_DATA_DUMMY
+    output = args.output or pjk.NAMA_FILE_DUMMY
+    rng = np.random.default_rng(pjk.SEED if args.seed is None else args.seed)
+    if args.massal:
+        print(f"Membuat {jumlah} data dummy (massal)...")
+        df = pjk.buat_data_dummy_massal(jumlah, rng=rng)
+        pjk.tulis_tabel([('Sheet1', df)], output, args.format)
+        print(f"Data dummy disimpan ke {output}")
+    else:
+        pjk.buat_data_dummy(jumlah, rng=rng, path=output, format_output=args.format)
+    return 0
+
+def perintah_assign(args):
+    pjk = _pjk()
+    import numpy as np
+    seed = pjk.SEED if args.seed is None else args.seed
+    rng = np.random.default_rng(seed)
+    df_mahasiswa = pjk.baca_data_mahasiswa(args.roster)
+
+    if pjk.HIERARKI_KELOMPOK and not (args.jumlah_kb or args.jumlah_ks):
+        hierarki = pjk.tingkat_hierarki(pjk.HIERARKI_KELOMPOK)
+    else:
+        hierarki = pjk.hierarki_standar(args.jumlah_kb or pjk.JUMLAH_KB, args.jumlah_ks or pjk.JUMLAH_KS)
+    bertingkat = len(hierarki) != 2
+    jumlah_per_tingkat = pjk.jumlah_kelompok_tingkat(hierarki)
+    jumlah_kb, jumlah_ks = jumlah_per_tingkat[pjk.KOLOM_KB_OUTPUT], jumlah_per_tingkat[pjk.KOLOM_KS_OUTPUT]
+    kolom_output = pjk.KOLOM_OUTPUT + [t.kolom for t in hierarki if t.kolom not in pjk.KOLOM_OUTPUT]
+    batas_waktu = None if bertingkat else args.optimasi
+
+    folder_cache = args.cache or pjk.FOLDER_CACHE_HASIL
+    cache_hasil = pjk.CacheHasil(folder_cache) if folder_cache and seed is not None else None
+    entri_cache = None
+    if cache_hasil:
+        if args.hapus_cache:
+            cache_hasil.hapus()
+            print(f"Cache hasil di {folder_cache} dikosongkan.")
+        kunci_cache = pjk.CacheHasil.kunci(df_mahasiswa, hierarki, rng, batas_waktu)
+        if args.segarkan_cache or pjk.SEGARKAN_CACHE_HASIL:
+            cache_hasil.hapus(kunci_cache)
+        entri_cache = cache_hasil.ambil(kunci_cache)
+
+    if entri_cache:
+        print(f"Hasil pembagian dimuat dari cache ({kunci_cache[:12]}).")
+        df_hasil = entri_cache.terapkan(df_mahasiswa)
+    elif bertingkat:
+        df_hasil = pjk.bagi_hierarki(df_mahasiswa, hierarki, rng=rng, jumlah_worker=args.worker)
+    elif batas_waktu:
+        df_hasil, _ = pjk.bagi_kelompok_optimal(df_mahasiswa, jumlah_kb, jumlah_ks, rng=rng, batas_waktu=batas_waktu, jumlah_worker=args.worker)
+    else:
+        df_hasil = pjk.bagi_kelompok_rata(df_mahasiswa, jumlah_kb, jumlah_ks, rng=rng, jumlah_worker=args.worker)
+    pjk.cek_proporsi_dan_std(df_mahasiswa, df_hasil, jumlah_kb, jumlah_ks)
+    if cache_hasil and not entri_cache:
+        cache_hasil.simpan(kunci_cache, df_hasil, hierarki)
+
+    output = args.output or pjk.NAMA_FILE_OUTPUT
+    if output:
+        tanda_output = pjk.CacheHasil.tanda_output(output, args.format, args.per_kb, df_hasil, kolom_output) if cache_hasil else None
+        if entri_cache and cache_hasil.output_terbaru(kunci_cache, tanda_output):
+            print(f"\n{output} sudah berisi hasil ini dan tidak berubah; penulisan ulang dilewati.")
+        else:
+            print(f"\nMenyimpan hasil akhir ke {output}...")
+            daftar_file = pjk.simpan_hasil(df_hasil, output, args.format, per_kb=args.per_kb, kolom=kolom_output)
+            if cache_hasil:
+                cache_hasil.catat_output(kunci_cache, tanda_output, daftar_file)
+    return 0
+
+def perintah_verify(args):
+    pjk = _pjk()
+    df_hasil = pjk.baca_hasil_pembagian(args.hasil)
+    jumlah_kb, jumlah_ks = _jumlah_kelompok(pjk, df_hasil, args)
+    verifikasi = pjk.cek_proporsi_dan_std(df_hasil, df_hasil, jumlah_kb, jumlah_ks)
+    if args.ketat and not (verifikasi.semua_kb_seimbang and verifikasi.ks_proporsi_ok):
+        return 1
+    return 0
+
+def perintah_export(args):
+    pjk = _pjk()
+    df_hasil = pjk.baca_hasil_pembagian(args.hasil)
+    print(f"Menulis {args.output}...")
+    daftar_file = pjk.simpan_hasil(df_hasil, args.output, args.format, per_kb=args.per_kb)
+    print(f"{len(daftar_file)} file ditulis.")
+    return 0
+
+def perintah_report(args):
+    if args.jenis == 'riset':
+        # Hanya laporan_pdf (fpdf); pandas tidak pernah di-import
+        if FOLDER_REPO not in sys.path:
+            sys.path.append(FOLDER_REPO)
+        import laporan_pdf
+        modul = runpy.run_path(SKRIP_LAPORAN_RISET, run_name='laporan_riset') # Hanya membangun model, tanpa render
+        output = args.output or modul['output_filename']
+        font_dir = modul['FONT_DIR'] if args.font_dir is None else args.font_dir
+        laporan_pdf.ReportBuilder(font_dir=font_dir).render_ke_file(modul['laporan_riset'], output)
+        print(f"Berhasil menghasilkan PDF: {output}")
+        return 0
+
+    if args.hasil is None:
+        raise SystemExit(f"report {args.jenis}: file hasil pembagian wajib diisi")
+    pjk = _pjk()
+    df_hasil = pjk.baca_hasil_pembagian(args.hasil)
+    if args.jenis == 'verifikasi':
+        jumlah_kb, jumlah_ks = _jumlah_kelompok(pjk, df_hasil, args)
+        verifikasi = pjk.hitung_verifikasi(df_hasil, df_hasil, jumlah_kb, jumlah_ks)
+        output = args.output or pjk.NAMA_FILE_LAPORAN or 'laporan_pembagian_kelompok.pdf'
+        pjk.simpan_laporan_verifikasi(verifikasi, df_hasil, output, dengan_roster=not args.tanpa_roster, font_dir=args.font_dir)
+    else:
+        folder = args.output or pjk.FOLDER_LAPORAN_KELOMPOK or 'laporan_kelompok'
+        pjk.simpan_laporan_kelompok(df_hasil, folder, jumlah_worker=args.worker, font_dir=args.font_dir)
+    return 0
+
+# --- Parser ---
+def buat_parser():
+    parser = argparse.ArgumentParser(description="CLI pembagian kelompok PJK.", epilog=CONTOH_PEMAKAIAN,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--profil', metavar='MODE', help="Instrumentasi per tahap seperti env PJK_PROFIL, mis. 'span' atau "
+                        "'span,cprofile,tracemalloc'; ringkasan ke PJK_PROFIL_OUTPUT")
+    sub = parser.add_subparsers(dest='perintah', required=True)
+
+    def opsi_kelompok(p):
+        p.add_argument('--jumlah-kb', type=int, help="Jumlah Kelompok Besar (default: JUMLAH_KB, atau dari tabel hasil)")
+        p.add_argument('--jumlah-ks', type=int, help="Jumlah KS per KB (default: JUMLAH_KS, atau dari tabel hasil)")
+
+    def opsi_tabel(p, wajib=False):
+        p.add_argument('--output', required=wajib, help="File tabel (.xlsx/.csv/.parquet)")
+        p.add_argument('--format', choices=FORMAT_TABEL, help="Format tabel (default: dari ekstensi file)")
+
+    p = sub.add_parser('generate', help="Buat roster dummy")
+    p.add_argument('--jumlah', type=int, help="Jumlah mahasiswa (default: JUMLAH_DATA_DUMMY)")
+    p.add_argument('--massal', action='store_true', help="Generator vektor untuk 100k-1M baris")
+    p.add_argument('--seed', type=int, help="Seed (default: SEED)")
+    opsi_tabel(p)
+    p.set_defaults(fungsi=perintah_generate)
+
+    p = sub.add_parser('assign', help="Bagi roster ke KB/KS, verifikasi, dan simpan hasil")
+    p.add_argument('roster', help="Roster (.xlsx/.csv/.parquet)")
+    opsi_kelompok(p)
+    p.add_argument('--seed', type=int, help="Seed (default: SEED)")
+    p.add_argument('--worker', type=int, default=1, help="Proses untuk pembagian per KB")
+    p.add_argument('--optimasi', type=float, metavar='DETIK', help="Batas waktu optimasi proporsi KS")
+    p.add_argument('--cache', metavar='FOLDER', help="Folder cache hasil (default: FOLDER_CACHE_HASIL; perlu seed)")
+    p.add_argument('--segarkan-cache', action='store_true', help="Abaikan entri cache yang cocok, hitung ulang dan timpa")
+    p.add_argument('--hapus-cache', action='store_true', help="Kosongkan seluruh folder cache sebelum membagi")
+    p.add_argument('--per-kb', action='store_true', help="Satu sheet/file per KB")
+    opsi_tabel(p)
+    p.set_defaults(fungsi=perintah_assign)
+
+    p = sub.add_parser('verify', help="Cetak verifikasi proporsi & ukuran dari tabel hasil")
+    p.add_argument('hasil', help="Tabel hasil assign (satu file, bukan output per KB)")
+    opsi_kelompok(p)
+    p.add_argument('--ketat', action='store_true', help="Keluar dengan kode 1 jika ada KB/KS di luar toleransi")
+    p.set_defaults(fungsi=perintah_verify)
+
+    p = sub.add_parser('export', help="Tulis ulang tabel hasil ke format lain / per KB")
+    p.add_argument('hasil', help="Tabel hasil assign")
+    opsi_tabel(p, wajib=True)
+    p.add_argument('--per-kb', action='store_true', help="Satu sheet/file per KB")
+    p.set_defaults(fungsi=perintah_export)
+
+    p = sub.add_parser('report', help="Laporan PDF: verifikasi, per kelompok, atau laporan riset")
+    p.add_argument('jenis', choices=['verifikasi', 'kelompok', 'riset'])
+    p.add_argument('hasil', nargs='?', help="Tabel hasil assign (untuk verifikasi & kelompok)")
+    opsi_kelompok(p)
+    p.add_argument('--output', help="File PDF (verifikasi/riset) atau folder (kelompok)")
+    p.add_argument('--tanpa-roster', action='store_true', help="PDF verifikasi tanpa lampiran roster")
+    p.add_argument('--worker', type=int, default=1, help="Proses untuk PDF per kelompok")
+    p.add_argument('--font-dir', help="Folder font DejaVu (default: FONT_DIR laporan_pdf)")
+    p.set_defaults(fungsi=perintah_report)
+    return parser
+
+def main(argv=None):
+    args = buat_parser().parse_args(argv)
+    if args.profil:
+        os.environ['PJK_PROFIL'] = args.profil # Dibaca dashboard_pjk saat di-import
+    kode = args.fungsi(args)
+    pjk = sys.modules.get('dashboard_pjk')
+    if pjk is not None and pjk.INSTRUMENTASI.aktif:
+        pjk.INSTRUMENTASI.simpan_ringkasan(pjk.FILE_RINGKASAN_PROFIL)
+        print(f"\nRingkasan profil per tahap disimpan ke {pjk.FILE_RINGKASAN_PROFIL}")
+    return kode
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,47 @@
 import pandas as pd
 import numpy as np
-import random
-from faker import Faker # Untuk generate nama realistis (install: pip install Faker)
-import math # Untuk floor/ceil jika diperlukan, tapi // dan % cukup
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
+import datetime
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+try:
+    import resource # Hanya Unix; di Windows RSS puncak tidak dicatat
+except ImportError:
+    resource = None
 
 # --- Konfigurasi ---
 JUMLAH_DATA_DUMMY = 2000
 NAMA_FILE_DUMMY = 'data_mahasiswa_dummy.xlsx'
-NAMA_FILE_OUTPUT = 'hasil_pembagian_kelompok_rata.xlsx' # Nama file output diubah
+NAMA_FILE_OUTPUT = 'hasil_pembagian_kelompok_rata.xlsx' # Nama file output diubah; None = tidak menulis tabel hasil
+NAMA_FILE_INPUT = None # Roster asli (.xlsx/.csv/.parquet); None = pakai data dummy
+UKURAN_CHUNK = 100_000 # Jumlah baris per chunk saat membaca roster
+FORMAT_OUTPUT = None # 'xlsx', 'xlsx-stream', 'csv', 'parquet'; None = dari ekstensi file
+OUTPUT_PER_KB = False # True = satu sheet (xlsx) atau satu file (csv/parquet) per Kelompok Besar
 JUMLAH_KB = 5
 JUMLAH_KS = 25 # Jumlah Kelompok Sedang per Kelompok Besar
+SEED = None # Isi dengan integer agar hasil pembagian dapat direproduksi
+JUMLAH_WORKER = 1 # Jumlah proses untuk pembagian KS per KB (1 = serial)
+BATAS_WAKTU_OPTIMASI = None # Detik untuk optimasi proporsi KS (lihat optimasi_proporsi); None = tanpa optimasi
+FOLDER_LAPORAN_KELOMPOK = None # Folder untuk satu PDF per KB dan per KS; None = tidak membuat PDF
+NAMA_FILE_LAPORAN = None # PDF verifikasi + roster untuk panitia (mis. 'laporan_pembagian_kelompok.pdf'); None = tidak dibuat
+LAPORAN_DENGAN_ROSTER = True # Lampirkan roster lengkap (urut KB, KS, NIM) di PDF verifikasi
+PENYUSUN_LAPORAN = 'Panitia PJK'
+# Hierarki kelompok bertingkat: daftar (kolom_output, jumlah per induk, kolom strata[, nomor_global]), mis.
+# [('klaster', 2, ['fakultas']), ('kelompok_besar', 5, ['fakultas'], True), ('kelompok_sedang', 25, ['jenis kelamin', 'jalur masuk']),
+#  ('kelompok_kecil', 4, ['fakultas'])]. Harus memuat tingkat kelompok_besar & kelompok_sedang untuk verifikasi/laporan;
+# jika ada tingkat di atas KB, beri nomor_global=True pada KB agar nomor KB unik (1..10 di contoh, bukan 1..5 per klaster).
+# None = dua tingkat standar: KB (JUMLAH_KB, Fakultas) -> KS (JUMLAH_KS, JK & Jalur). Optimasi proporsi hanya untuk hierarki standar.
+HIERARKI_KELOMPOK = None
+FOLDER_CACHE_HASIL = None # Folder cache label hasil pembagian (mis. '.cache_pjk'); hanya dipakai jika SEED diisi
+UKURAN_MAKS_CACHE_HASIL_MB = 256 # Entri yang paling lama tidak dipakai dihapus jika folder cache melebihi ini
+SEGARKAN_CACHE_HASIL = False # True = abaikan entri yang cocok, hitung ulang dan timpa
+UMUR_SEMENTARA_CACHE_DETIK = 3600 # File .tmp sisa penulisan yang terputus dihapus setelah setua ini (yang lebih muda mungkin sedang ditulis)
 
 # Kolom yang akan dibuat & digunakan
 KOLOM_NIM = 'nim'
@@ -19,130 +51,868 @@ KOLOM_JALUR = 'jalur masuk'
 KOLOM_JK = 'jenis kelamin'
 KOLOM_KB_OUTPUT = 'kelompok_besar'
 KOLOM_KS_OUTPUT = 'kelompok_sedang'
+KOLOM_INPUT = [KOLOM_NIM, KOLOM_NAMA, KOLOM_FAKULTAS, KOLOM_JALUR, KOLOM_JK] # Satu-satunya kolom yang dibaca dari roster
+KOLOM_KATEGORI = [KOLOM_FAKULTAS, KOLOM_JALUR, KOLOM_JK]
+KOLOM_OUTPUT = [
+    KOLOM_NIM, KOLOM_NAMA, KOLOM_FAKULTAS, KOLOM_JK, KOLOM_JALUR,
+    KOLOM_KB_OUTPUT, KOLOM_KS_OUTPUT
+]
+
+# Toleransi selisih proporsi KS terhadap target KB-nya
+TOLERANSI_JK = 0.15
+TOLERANSI_JALUR = 0.20
+
+# --- Instrumentasi (Span Waktu, cProfile & tracemalloc) ---
+# PJK_PROFIL: kosong = nonaktif; 'span' = catat waktu per tahap; tambahkan 'cprofile' dan/atau
+# 'tracemalloc' (dipisah koma, mis. 'cprofile,tracemalloc') untuk profil fungsi dan puncak memori per tahap.
+# Ringkasan JSON ditulis ke PJK_PROFIL_OUTPUT di akhir alur utama (statistik cProfile ke <nama>.prof).
+PROFIL_PJK = os.environ.get('PJK_PROFIL', '')
+FILE_RINGKASAN_PROFIL = os.environ.get('PJK_PROFIL_OUTPUT', 'profil_pjk.json')
+JUMLAH_FUNGSI_PROFIL = 25 # Fungsi teratas (kumulatif) dari cProfile di ringkasan JSON
+
+class _SpanNonaktif:
+    """Context manager kosong yang dipakai bersama saat instrumentasi nonaktif."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_SPAN_NONAKTIF = _SpanNonaktif()
+
+class _Span:
+    __slots__ = ('instrumentasi', 'nama', 'mulai', 'memori_awal', 'memori_puncak')
+
+    def __init__(self, instrumentasi, nama):
+        self.instrumentasi = instrumentasi
+        self.nama = nama
+        self.memori_awal = self.memori_puncak = 0
+
+    def __enter__(self):
+        self.instrumentasi._masuk(self)
+        self.mulai = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.instrumentasi._keluar(self, time.perf_counter() - self.mulai)
+        return False
+
+class Instrumentasi:
+    """Pencatat span bernama (bersarang menjadi 'induk/anak') dengan cProfile/tracemalloc opsional.
+
+    Saat nonaktif, span() mengembalikan satu objek kosong bersama sehingga overhead hanya satu
+    pemanggilan fungsi per tahap.
+    """
+
+    def __init__(self, mode=''):
+        self.mode = {m.strip().lower() for m in mode.split(',') if m.strip()} - {'0', 'false'}
+        self.aktif = bool(self.mode)
+        self.pakai_tracemalloc = 'tracemalloc' in self.mode
+        self.profiler = None
+        self.tumpukan = []
+        self.statistik = {} # nama span -> [jumlah, total_detik, maks_detik, rss_puncak_kb, memori_puncak_byte, memori_tambahan_byte]
+        self.mulai = time.perf_counter()
+        if 'cprofile' in self.mode:
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        if self.pakai_tracemalloc:
+            import tracemalloc
+            self._tracemalloc = tracemalloc
+            tracemalloc.start()
+
+    def span(self, nama):
+        if not self.aktif:
+            return _SPAN_NONAKTIF
+        return _Span(self, nama)
+
+    def _masuk(self, span):
+        if self.pakai_tracemalloc:
+            # Puncak sejauh ini milik span induk; reset agar puncak span ini terukur sendiri
+            sekarang, puncak = self._tracemalloc.get_traced_memory()
+            if self.tumpukan:
+                induk = self.tumpukan[-1]
+                induk.memori_puncak = max(induk.memori_puncak, puncak)
+            self._tracemalloc.reset_peak()
+            span.memori_awal = sekarang
+        span.nama = '/'.join([self.tumpukan[-1].nama, span.nama]) if self.tumpukan else span.nama
+        self.tumpukan.append(span)
+
+    def _keluar(self, span, durasi):
+        self.tumpukan.pop()
+        if self.pakai_tracemalloc:
+            span.memori_puncak = max(span.memori_puncak, self._tracemalloc.get_traced_memory()[1])
+            if self.tumpukan:
+                induk = self.tumpukan[-1]
+                induk.memori_puncak = max(induk.memori_puncak, span.memori_puncak)
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else 0 # KB di Linux
+        stat = self.statistik.setdefault(span.nama, [0, 0.0, 0.0, 0, 0, 0])
+        stat[0] += 1
+        stat[1] += durasi
+        stat[2] = max(stat[2], durasi)
+        stat[3] = max(stat[3], rss)
+        stat[4] = max(stat[4], span.memori_puncak)
+        stat[5] = max(stat[5], span.memori_puncak - span.memori_awal)
+
+    def ringkasan(self):
+        """Ringkasan siap JSON: per span jumlah, total/maks detik, RSS puncak, dan puncak tracemalloc (absolut & tambahan)."""
+        hasil = {
+            'dibuat': datetime.datetime.now().isoformat(timespec='seconds'),
+            'mode': sorted(self.mode),
+            'total_detik': time.perf_counter() - self.mulai,
+            'span': [],
+        }
+        for nama, (jumlah, total, maks, rss, memori, tambahan) in self.statistik.items():
+            baris = {'nama': nama, 'jumlah': jumlah, 'total_detik': total, 'maks_detik': maks, 'rss_puncak_mb': rss / 1024}
+            if self.pakai_tracemalloc:
+                baris['memori_puncak_mb'] = memori / 2**20
+                baris['memori_tambahan_mb'] = tambahan / 2**20
+            hasil['span'].append(baris)
+        if self.profiler is not None:
+            import pstats
+            stats = pstats.Stats(self.profiler)
+            teratas = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:JUMLAH_FUNGSI_PROFIL]
+            hasil['cprofile'] = [
+                {'fungsi': f"{path}:{baris}({fungsi})", 'panggilan': nc, 'total_detik': tt, 'kumulatif_detik': ct}
+                for (path, baris, fungsi), (cc, nc, tt, ct, _) in teratas
+            ]
+        return hasil
+
+    def simpan_ringkasan(self, path=FILE_RINGKASAN_PROFIL):
+        """Menulis ringkasan JSON (dan statistik cProfile ke <path>.prof jika aktif); mengembalikan ringkasan."""
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.profiler.dump_stats(os.path.splitext(path)[0] + '.prof')
+        ringkasan = self.ringkasan()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(ringkasan, f, indent=2)
+        return ringkasan
+
+INSTRUMENTASI = Instrumentasi(PROFIL_PJK)
+
+def span(nama):
+    """Context manager tahap bernama pada INSTRUMENTASI global (tanpa efek jika PJK_PROFIL kosong)."""
+    return INSTRUMENTASI.span(nama)
 
 # --- Bagian 1: Pembuatan Data Dummy (Sama seperti sebelumnya) ---
-def buat_data_dummy(jumlah_data):
+LIST_FAKULTAS = ['Teknik', 'MIPA', 'Ekonomi', 'Hukum', 'Kedokteran', 'Ilmu Budaya', 'ISIPOL']
+BOBOT_FAKULTAS = [0.25, 0.2, 0.18, 0.12, 0.1, 0.08, 0.07]
+LIST_JALUR = ['SNMPTN', 'SBMPTN', 'Mandiri', 'Afirmasi']
+BOBOT_JALUR = [0.35, 0.40, 0.20, 0.05]
+LIST_JK = ['Laki-laki', 'Perempuan']
+BOBOT_JK = [0.55, 0.45]
+UKURAN_POOL_NAMA = 5000 # Jumlah nama Faker yang dibuat sekali untuk mode massal
+
+def _faker(rng):
+    """Faker('id_ID') ber-seed dari rng; di-import dan dibuat hanya saat nama dummy benar-benar dibutuhkan."""
+    try:
+        from faker import Faker # Untuk generate nama realistis (install: pip install Faker)
+    except ImportError:
+        raise ImportError("Data dummy membutuhkan Faker (install: pip install Faker)")
     fake = Faker('id_ID')
-    data = []
-    list_fakultas = ['Teknik', 'MIPA', 'Ekonomi', 'Hukum', 'Kedokteran', 'Ilmu Budaya', 'ISIPOL']
-    bobot_fakultas = [0.25, 0.2, 0.18, 0.12, 0.1, 0.08, 0.07]
-    list_jalur = ['SNMPTN', 'SBMPTN', 'Mandiri', 'Afirmasi']
-    bobot_jalur = [0.35, 0.40, 0.20, 0.05]
-    list_jk = ['Laki-laki', 'Perempuan']
-    bobot_jk = [0.55, 0.45]
+    fake.seed_instance(int(rng.integers(2**32)))
+    return fake
+
+def buat_data_dummy(jumlah_data, massal=False, rng=None, path=None, format_output=None):
+    """Membuat data dummy mahasiswa; massal=True memakai generator vektor (lihat buat_data_dummy_massal).
+
+    rng: numpy Generator (atau seed) untuk semua pilihan acak, termasuk seed Faker.
+    path/format_output: file tujuan (default NAMA_FILE_DUMMY) dan formatnya (default dari ekstensi path).
+    """
+    rng = np.random.default_rng(rng)
+    path = path or NAMA_FILE_DUMMY
     print(f"Membuat {jumlah_data} data dummy...")
-    for i in range(jumlah_data):
-        nim = f"MHS{i+1:04d}"
-        nama = fake.name()
-        fakultas = random.choices(list_fakultas, weights=bobot_fakultas, k=1)[0]
-        jalur = random.choices(list_jalur, weights=bobot_jalur, k=1)[0]
-        jk = random.choices(list_jk, weights=bobot_jk, k=1)[0]
-        data.append({KOLOM_NIM: nim, KOLOM_NAMA: nama, KOLOM_FAKULTAS: fakultas, KOLOM_JALUR: jalur, KOLOM_JK: jk})
-    df_dummy = pd.DataFrame(data)
-    print("Data dummy selesai dibuat.")
-    try:
-        df_dummy.to_excel(NAMA_FILE_DUMMY, index=False)
-        print(f"Data dummy disimpan ke {NAMA_FILE_DUMMY}")
-    except Exception as e:
-        print(f"Gagal menyimpan data dummy: {e}")
+    with span('data_dummy'):
+        if massal:
+            df_dummy = buat_data_dummy_massal(jumlah_data, rng=rng)
+        else:
+            fake = _faker(rng)
+            df_dummy = pd.DataFrame({
+                KOLOM_NIM: [f"MHS{i+1:04d}" for i in range(jumlah_data)],
+                KOLOM_NAMA: [fake.name() for _ in range(jumlah_data)], # Hanya nama yang masih per baris (Faker)
+                KOLOM_FAKULTAS: _pilih_berbobot(rng, LIST_FAKULTAS, BOBOT_FAKULTAS, jumlah_data),
+                KOLOM_JALUR: _pilih_berbobot(rng, LIST_JALUR, BOBOT_JALUR, jumlah_data),
+                KOLOM_JK: _pilih_berbobot(rng, LIST_JK, BOBOT_JK, jumlah_data),
+            })
+        print("Data dummy selesai dibuat.")
+        try:
+            tulis_tabel([('Sheet1', df_dummy)], path, format_output) # Bukan FORMAT_OUTPUT: itu khusus file hasil
+            print(f"Data dummy disimpan ke {path}")
+        except Exception as e:
+            print(f"Gagal menyimpan data dummy: {e}")
     return df_dummy
 
+def _pilih_berbobot(rng, pilihan, bobot, jumlah):
+    """Satu kali Generator.choice untuk seluruh kolom, dikembalikan sebagai Categorical.
+
+    Yang diundi hanya kode integer; kategori diurutkan alfabetis agar kodenya sama dengan
+    hasil astype('category') pada data string biasa.
+    """
+    p = np.asarray(bobot, dtype=float)
+    kode = rng.choice(len(pilihan), size=jumlah, p=p / p.sum())
+    urutan = np.argsort(pilihan)
+    peta_kode = np.empty(len(pilihan), dtype=np.int8)
+    peta_kode[urutan] = np.arange(len(pilihan))
+    return pd.Categorical.from_codes(peta_kode[kode], categories=np.asarray(pilihan, dtype=object)[urutan])
+
+def buat_data_dummy_massal(jumlah_data, rng=None, ukuran_pool_nama=UKURAN_POOL_NAMA):
+    """Membuat data dummy secara vektor (100k-1M baris) tanpa menyimpan ke file; hasil sama untuk seed yang sama.
+
+    Fakultas, jalur dan JK masing-masing diambil dengan satu Generator.choice, NIM dibentuk
+    dengan operasi string vektor, dan nama diambil acak dari pool nama Faker yang dibuat sekali.
+    """
+    rng = np.random.default_rng(rng)
+    with span('data_dummy_massal'):
+        fake = _faker(rng)
+        pool_nama = np.array([fake.name() for _ in range(min(ukuran_pool_nama, max(jumlah_data, 1)))], dtype=object)
+
+        nomor = pd.Series(np.arange(1, jumlah_data + 1)).astype(str).str.zfill(4)
+        return pd.DataFrame({
+            KOLOM_NIM: ('MHS' + nomor).to_numpy(dtype=object),
+            KOLOM_NAMA: pool_nama[rng.integers(len(pool_nama), size=jumlah_data)],
+            KOLOM_FAKULTAS: _pilih_berbobot(rng, LIST_FAKULTAS, BOBOT_FAKULTAS, jumlah_data),
+            KOLOM_JALUR: _pilih_berbobot(rng, LIST_JALUR, BOBOT_JALUR, jumlah_data),
+            KOLOM_JK: _pilih_berbobot(rng, LIST_JK, BOBOT_JK, jumlah_data),
+        })
+
+def kompakkan_data(df):
+    """Mengubah kolom fakultas, jalur dan JK menjadi Categorical agar mask/groupby bekerja pada kode integer."""
+    df = df.copy()
+    for kolom in KOLOM_KATEGORI:
+        if not isinstance(df[kolom].dtype, pd.CategoricalDtype):
+            df[kolom] = df[kolom].astype('category')
+    return df
+
+# --- Bagian 1b: Membaca Roster Mahasiswa dari File (Streaming/Chunk) ---
+def _posisi_kolom(header, kolom_wajib=KOLOM_INPUT):
+    """Posisi kolom_wajib (default kelima KOLOM_INPUT) di baris header; error jika ada yang tidak ditemukan."""
+    header = [str(h).strip() if h is not None else None for h in (header or [])]
+    hilang = [kolom for kolom in kolom_wajib if kolom not in header]
+    if hilang:
+        raise ValueError(f"Kolom wajib tidak ditemukan di roster: {hilang}")
+    return [header.index(kolom) for kolom in kolom_wajib]
+
+def _chunk_xlsx(path, ukuran_chunk, kolom_wajib=KOLOM_INPUT):
+    """Membaca xlsx baris demi baris dengan reader read-only openpyxl (workbook tidak dimuat utuh)."""
+    from openpyxl import load_workbook
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        baris = wb.active.iter_rows(values_only=True)
+        posisi = _posisi_kolom(next(baris, None), kolom_wajib)
+        while True:
+            potongan = list(islice(baris, ukuran_chunk))
+            if not potongan:
+                break
+            data = [[b[i] if i < len(b) else None for i in posisi] for b in potongan]
+            data = [d for d in data if any(v is not None for v in d)] # Lewati baris kosong
+            df = pd.DataFrame(data, columns=kolom_wajib)
+            for kolom in [KOLOM_NIM, KOLOM_NAMA]: # NIM bisa terbaca sebagai angka di Excel
+                df[kolom] = df[kolom].map(lambda v: None if v is None else str(v))
+            yield df
+    finally:
+        wb.close()
+
+def _chunk_csv(path, ukuran_chunk, kolom_wajib=KOLOM_INPUT):
+    _posisi_kolom(list(pd.read_csv(path, nrows=0).columns), kolom_wajib)
+    dtype = {KOLOM_NIM: str, KOLOM_NAMA: str, **{kolom: 'category' for kolom in KOLOM_KATEGORI}}
+    for df in pd.read_csv(path, usecols=kolom_wajib, dtype=dtype, chunksize=ukuran_chunk):
+        yield df[kolom_wajib]
+
+def _chunk_parquet(path, ukuran_chunk, kolom_wajib=KOLOM_INPUT):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Membaca Parquet membutuhkan pyarrow (install: pip install pyarrow)")
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=ukuran_chunk, columns=kolom_wajib):
+        yield batch.to_pandas()[kolom_wajib]
+
+def _gabung_chunk(chunks, kolom_wajib=KOLOM_INPUT):
+    """Menggabungkan chunk; kolom kategori digabung dengan union_categoricals agar tidak kembali ke object."""
+    if not chunks:
+        return kompakkan_data(pd.DataFrame({kolom: pd.Series(dtype=object) for kolom in kolom_wajib}))
+    df = pd.concat([c[[k for k in kolom_wajib if k not in KOLOM_KATEGORI]] for c in chunks], ignore_index=True)
+    for kolom in KOLOM_KATEGORI:
+        df[kolom] = pd.api.types.union_categoricals([c[kolom] for c in chunks], sort_categories=True)
+    return df[kolom_wajib]
+
+def baca_data_mahasiswa(path, ukuran_chunk=UKURAN_CHUNK, kolom_wajib=KOLOM_INPUT):
+    """Membaca roster (.xlsx/.xlsm, .csv, .parquet) per chunk, hanya KOLOM_INPUT, langsung ke dtype kompak.
+
+    Setiap chunk langsung dipangkas ke lima kolom dan kolom fakultas/jalur/JK diubah menjadi
+    Categorical, sehingga kolom tambahan di roster tidak pernah menumpuk di memori.
+    """
+    ekstensi = os.path.splitext(path)[1].lower()
+    pembaca = {'.xlsx': _chunk_xlsx, '.xlsm': _chunk_xlsx, '.csv': _chunk_csv, '.parquet': _chunk_parquet}.get(ekstensi)
+    if pembaca is None:
+        raise ValueError(f"Format roster tidak didukung: {ekstensi!r} (gunakan .xlsx, .csv atau .parquet)")
+    print(f"Membaca roster dari {path}...")
+    with span('baca_roster'):
+        chunks = []
+        for df in pembaca(path, ukuran_chunk, kolom_wajib):
+            for kolom in KOLOM_KATEGORI:
+                df[kolom] = df[kolom].astype('category')
+            chunks.append(df)
+        df_roster = _gabung_chunk(chunks, kolom_wajib)
+    print(f"Roster selesai dibaca: {len(df_roster)} mahasiswa.")
+    return df_roster
+
+def baca_hasil_pembagian(path, kolom_label=(KOLOM_KB_OUTPUT, KOLOM_KS_OUTPUT), ukuran_chunk=UKURAN_CHUNK):
+    """Membaca kembali tabel hasil simpan_hasil (satu file/sheet, bukan output per KB) dengan label kelompok kompak."""
+    df_hasil = baca_data_mahasiswa(path, ukuran_chunk, KOLOM_INPUT + list(kolom_label))
+    for kolom in kolom_label:
+        label = df_hasil[kolom].to_numpy(dtype=np.int64, na_value=0)
+        label = label.astype(_dtype_label(label.max(initial=0)))
+        df_hasil[kolom] = pd.arrays.IntegerArray(label, label == 0) # Sel kosong = tidak diassign (NA), seperti hasil pembagian
+    return df_hasil
+
 # --- Bagian 2: Kode Inti Pembagian Kelompok (MODIFIKASI LOGIKA ASSIGNMENT) ---
-def bagi_kelompok_rata(df_input, jumlah_kb, jumlah_ks):
-    """Membagi mahasiswa ke Kelompok Besar dan Sedang dengan ukuran lebih merata."""
+def kode_strata(*kolom):
+    """Menggabungkan beberapa kolom menjadi satu kode stratum integer (-1 jika ada nilai kosong).
+
+    Nilai tiap kolom dikodekan berurutan (sort=True), sehingga kode sebuah stratum hanya
+    bergantung pada nilai-nilainya, bukan pada urutan baris data.
+    """
+    kode = np.zeros(len(kolom[0]), dtype=np.int64)
+    valid = np.ones(len(kolom[0]), dtype=bool)
+    for k in kolom:
+        kode_k, unik = pd.factorize(k, sort=True)
+        valid &= kode_k >= 0
+        kode = kode * max(len(unik), 1) + kode_k
+    kode[~valid] = -1
+    return kode
+
+def _dtype_label(num_groups):
+    """Dtype integer terkecil untuk label kelompok (0 = tidak diassign)."""
+    return np.int16 if num_groups <= np.iinfo(np.int16).max else np.int32
+
+def rng_stratum(entropi, kode):
+    """Generator anak independen untuk satu stratum (SeedSequence dengan spawn_key = kode stratum)."""
+    return np.random.default_rng(np.random.SeedSequence(entropi, spawn_key=(int(kode),)))
+
+def assign_merata(kode, num_groups, rng=None):
+    """Membagi setiap stratum (kode sama) ke num_groups kelompok dengan ukuran selisih maksimal 1.
+
+    rng (numpy Generator) hanya dipakai untuk mengambil satu entropi induk; setiap stratum
+    lalu mendapat aliran acak sendiri dari rng_stratum. Mengembalikan array label
+    1..num_groups (0 = tidak diassign).
+    """
+    rng = np.random.default_rng(rng)
+    return _assign_merata_entropi(kode, num_groups, int(rng.integers(2**63)))
+
+def _assign_merata_entropi(kode, num_groups, entropi):
+    """Inti assign_merata: hasil tiap stratum hanya ditentukan oleh (entropi, kode stratum, urutan barisnya).
+
+    Karena itu subset data yang berisi stratum utuh (mis. satu KB) memberi label yang sama
+    persis baik diproses sendiri-sendiri maupun sekaligus.
+    """
+    kode = np.asarray(kode)
+    label = np.zeros(len(kode), dtype=_dtype_label(num_groups))
+    idx_valid = np.flatnonzero(kode >= 0)
+    num_items = len(idx_valid)
+    if num_items == 0:
+        return label # Tidak ada yang perlu diassign
+
+    # 1. Kelompokkan item per stratum (urutan baris asli dipertahankan di dalam stratum);
+    #    kode kecil diturunkan ke int16 agar sort stabil numpy memakai radix sort
+    kode_valid = kode[idx_valid]
+    if kode_valid.max() <= np.iinfo(np.int16).max:
+        kode_valid = kode_valid.astype(np.int16)
+    urutan = idx_valid[np.argsort(kode_valid, kind='stable')]
+    kode_urut = kode[urutan]
+    awal_stratum = np.flatnonzero(np.r_[True, kode_urut[1:] != kode_urut[:-1]])
+    ukuran_stratum = np.diff(np.r_[awal_stratum, num_items])
+
+    # 2. Acak urutan item di dalam setiap stratum dengan kunci acak dari aliran stratum itu (sort per
+    #    potongan, tanpa lexsort atas seluruh data), lalu ambil permutasi kelompoknya
+    permutasi_kelompok = np.empty((len(awal_stratum), num_groups), dtype=np.int64)
+    for s, (awal, ukuran) in enumerate(zip(awal_stratum, ukuran_stratum)):
+        rng_s = rng_stratum(entropi, kode_urut[awal])
+        potongan = urutan[awal:awal + ukuran]
+        urutan[awal:awal + ukuran] = potongan[np.argsort(rng_s.random(ukuran), kind='stable')]
+        permutasi_kelompok[s] = rng_s.permutation(num_groups)
+
+    # 3. Posisi item di dalam stratumnya (setara groupby-cumcount)
+    nomor_stratum = np.repeat(np.arange(len(awal_stratum)), ukuran_stratum)
+    posisi = np.arange(num_items) - np.repeat(awal_stratum, ukuran_stratum)
+
+    # 4. Slot round-robin (slot kecil mendapat sisa +1), dipetakan ke nomor kelompok lewat
+    #    permutasi acak per stratum sehingga kelompok yang mendapat anggota lebih tetap acak
+    slot = posisi % num_groups
+    label[urutan] = permutasi_kelompok[nomor_stratum, slot] + 1
+    return label
+
+def assign_merata_paralel(kode, partisi, num_groups, rng=None, jumlah_worker=None):
+    """assign_merata yang dipecah per partisi (mis. per KB) ke ProcessPoolExecutor.
+
+    Setiap partisi harus berisi stratum utuh. Data dipartisi sekali dengan argsort, worker hanya
+    menerima array kode stratum partisinya, dan label digabung kembali dalam satu langkah.
+    Hasilnya identik dengan assign_merata serial untuk rng yang sama.
+    """
+    rng = np.random.default_rng(rng)
+    entropi = int(rng.integers(2**63))
+    kode = np.asarray(kode)
+    partisi = np.asarray(partisi)
+
+    urutan = np.argsort(partisi, kind='stable')
+    partisi_urut = partisi[urutan]
+    batas = np.flatnonzero(np.r_[True, partisi_urut[1:] != partisi_urut[:-1], True])
+    potongan = [urutan[awal:akhir] for awal, akhir in zip(batas[:-1], batas[1:])]
+
+    with ProcessPoolExecutor(max_workers=jumlah_worker) as executor:
+        hasil = list(executor.map(_assign_merata_entropi, [kode[idx] for idx in potongan], repeat(num_groups), repeat(entropi)))
+
+    label = np.zeros(len(kode), dtype=_dtype_label(num_groups))
+    if potongan:
+        label[np.concatenate(potongan)] = np.concatenate(hasil)
+    return label
+
+@dataclass
+class TingkatKelompok:
+    """Satu tingkat hierarki: `jumlah` kelompok di dalam setiap kelompok induk, merata per kombinasi `strata`."""
+    kolom: str # Kolom label output, mis. KOLOM_KB_OUTPUT
+    jumlah: int
+    strata: tuple = ()
+    nomor_global: bool = False # True = label diberi nomor urut lintas induk (1..jumlah x banyak induk), bukan 1..jumlah per induk
+
+    def __post_init__(self):
+        self.strata = tuple(self.strata)
+
+def hierarki_standar(jumlah_kb=JUMLAH_KB, jumlah_ks=JUMLAH_KS):
+    """Hierarki dua tingkat bawaan: KB berdasarkan Fakultas, lalu KS berdasarkan (JK, Jalur) di dalam KB."""
+    return [TingkatKelompok(KOLOM_KB_OUTPUT, jumlah_kb, (KOLOM_FAKULTAS,)),
+            TingkatKelompok(KOLOM_KS_OUTPUT, jumlah_ks, (KOLOM_JK, KOLOM_JALUR))]
+
+def tingkat_hierarki(hierarki):
+    """Menormalkan spesifikasi hierarki (TingkatKelompok atau tuple (kolom, jumlah, strata)) menjadi daftar TingkatKelompok.
+
+    ValueError jika tingkat KB/KS (dipakai verifikasi, cache, dan laporan) tidak ada.
+    """
+    hierarki = [t if isinstance(t, TingkatKelompok) else TingkatKelompok(*t) for t in hierarki]
+    kolom = {t.kolom for t in hierarki}
+    hilang = [k for k in (KOLOM_KB_OUTPUT, KOLOM_KS_OUTPUT) if k not in kolom]
+    if hilang:
+        raise ValueError(f"Hierarki kelompok harus memuat tingkat {' dan '.join(hilang)} "
+                         f"(tingkat yang ada: {', '.join(t.kolom for t in hierarki) or '-'})")
+    return hierarki
+
+def jumlah_kelompok_tingkat(hierarki):
+    """kolom -> banyak nomor kelompok yang mungkin di kolom itu (jumlah, atau hasil kali dengan induknya jika nomor_global)."""
+    hasil, total = {}, 1
+    for tingkat in tingkat_hierarki(hierarki):
+        total *= tingkat.jumlah
+        hasil[tingkat.kolom] = total if tingkat.nomor_global else tingkat.jumlah
+    return hasil
+
+def bagi_hierarki(df_input, hierarki, rng=None, jumlah_worker=JUMLAH_WORKER):
+    """Membagi mahasiswa ke kelompok bertingkat sesuai spesifikasi hierarki (daftar TingkatKelompok atau tuple).
+
+    Setiap tingkat hanya satu assign_merata atas seluruh data: kode stratum tingkat ke-i adalah
+    gabungan label semua tingkat di atasnya dan kolom strata tingkat itu, sehingga satu sort
+    mengelompokkan baris per (induk, strata) tanpa menyaring DataFrame per kelompok induk.
+    Baris yang tidak terassign di suatu tingkat (strata kosong) juga tidak diassign di bawahnya.
+    jumlah_worker > 1: tingkat kedua dst. dibagi paralel per kelompok tingkat pertama.
+    """
+    hierarki = tingkat_hierarki(hierarki)
+    rng = np.random.default_rng(rng)
     df = df_input.copy()
-    df[KOLOM_KB_OUTPUT] = pd.NA
-    df[KOLOM_KS_OUTPUT] = pd.NA
+    label_leluhur = []
+    for nomor, tingkat in enumerate(hierarki, start=1):
+        nama_strata = ', '.join(tingkat.strata) or 'tanpa strata'
+        print(f"Tahap {nomor}: Membagi {tingkat.kolom} ({tingkat.jumlah} per induk) berdasarkan {nama_strata}...")
+        with span(f"pembagian[{tingkat.kolom}]"):
+            kolom = label_leluhur + [df[k] for k in tingkat.strata]
+            kode = kode_strata(*kolom) if kolom else np.zeros(len(df), dtype=np.int64)
+            for label in label_leluhur:
+                kode[label == 0] = -1
+            if label_leluhur and jumlah_worker > 1:
+                label = assign_merata_paralel(kode, label_leluhur[0], tingkat.jumlah, rng, jumlah_worker)
+            else:
+                label = assign_merata(kode, tingkat.jumlah, rng)
+        label_leluhur.append(label)
+
+    # Satu kali assignment kolom per tingkat di akhir, tetap int16/int32 (0 berarti tidak terassign -> NA)
+    for i, (tingkat, label) in enumerate(zip(hierarki, label_leluhur)):
+        if tingkat.nomor_global and i > 0:
+            # Nomor urut (induk..., label) lintas seluruh hierarki: induk ke-j mendapat j*jumlah + 1 .. (j+1)*jumlah
+            induk = np.zeros(len(df), dtype=np.int64)
+            for tingkat_induk, label_induk in zip(hierarki[:i], label_leluhur[:i]):
+                induk = induk * tingkat_induk.jumlah + (label_induk.astype(np.int64) - 1)
+            label_global = induk * tingkat.jumlah + label
+            label = np.where(label == 0, 0, label_global).astype(_dtype_label(label_global.max(initial=0)))
+        df[tingkat.kolom] = pd.arrays.IntegerArray(label, label == 0)
+    return df
+
+def bagi_kelompok_rata(df_input, jumlah_kb, jumlah_ks, rng=None, jumlah_worker=JUMLAH_WORKER):
+    """Membagi mahasiswa ke Kelompok Besar dan Sedang dengan ukuran lebih merata.
+
+    rng: numpy Generator (atau seed) sumber semua keacakan; seed yang sama memberi hasil yang sama.
+    jumlah_worker: >1 membagi KS per KB secara paralel (hasil sama dengan serial).
+    """
     print("Memulai proses pembagian kelompok (metode rata)...")
+    df = bagi_hierarki(df_input, hierarki_standar(jumlah_kb, jumlah_ks), rng, jumlah_worker)
+    print("Pembagian Kelompok Besar & Sedang selesai.")
+    return df
+
+# --- Bagian 2a: Optimasi Proporsi Multi-Atribut (Local Search Tukar Anggota) ---
+@dataclass
+class LaporanOptimasi:
+    """Ringkasan optimasi_proporsi: objektif = jumlah kuadrat selisih hitungan vs harapan di semua KS."""
+    objektif_awal: float
+    objektif_akhir: float
+    jumlah_usulan: int
+    jumlah_tukar: int
+    durasi: float
+
+def optimasi_proporsi(df_hasil, jumlah_ks, batas_waktu=5.0, rng=None, ukuran_batch=4096, batch_tanpa_perbaikan=20):
+    """Memperbaiki proporsi fakultas, JK dan jalur sekaligus di setiap KS dengan menukar dua mahasiswa.
+
+    Pertukaran hanya terjadi antar KS di dalam KB yang sama, sehingga ukuran KS dan komposisi KB
+    (termasuk keseimbangan fakultas antar KB) tidak berubah. Untuk tiap atribut disimpan matriks
+    D = hitungan - harapan per KS (harapan = ukuran KS x proporsi di KB-nya); objektif = sum(D**2).
+    Usulan tukar dinilai per batch secara vektor, lalu usulan yang memperbaiki objektif diterapkan
+    satu per satu dengan delta yang dihitung ulang dari D terkini (pembaruan inkremental O(atribut)).
+    Berhenti saat batas_waktu habis atau beberapa batch berturut-turut tanpa perbaikan.
+    Mengembalikan (df_hasil_baru, LaporanOptimasi).
+    """
+    rng = np.random.default_rng(rng)
+    mulai = time.perf_counter()
+    df = df_hasil.copy()
+    terisi = np.flatnonzero(df[KOLOM_KB_OUTPUT].notna().to_numpy() & df[KOLOM_KS_OUTPUT].notna().to_numpy())
+    kb = df[KOLOM_KB_OUTPUT].to_numpy(dtype=np.int64, na_value=0)[terisi]
+    sel = (kb - 1) * jumlah_ks + df[KOLOM_KS_OUTPUT].to_numpy(dtype=np.int64, na_value=0)[terisi] - 1
+    jumlah_sel = int(kb.max()) * jumlah_ks if len(kb) else 0
+    atribut = [pd.factorize(df[kolom].iloc[terisi], sort=True)[0] for kolom in KOLOM_KATEGORI]
+
+    # Matriks selisih D per atribut: baris = sel (KB, KS), kolom = kategori
+    ukuran_sel = np.bincount(sel, minlength=jumlah_sel).astype(float)
+    selisih = []
+    for kode in atribut:
+        jumlah_kategori = kode.max() + 1
+        hitung = np.bincount(sel * jumlah_kategori + kode, minlength=jumlah_sel * jumlah_kategori).reshape(jumlah_sel, jumlah_kategori)
+        hitung_kb = hitung.reshape(-1, jumlah_ks, jumlah_kategori).sum(axis=1)
+        proporsi_kb = hitung_kb / np.maximum(hitung_kb.sum(axis=1, keepdims=True), 1)
+        selisih.append(hitung - ukuran_sel[:, None] * np.repeat(proporsi_kb, jumlah_ks, axis=0))
+    objektif_awal = float(sum((d ** 2).sum() for d in selisih))
+
+    # Anggota tiap KB berurutan agar pasangan usulan selalu dari KB yang sama
+    urutan_kb = np.argsort(kb, kind='stable')
+    awal_kb = np.searchsorted(kb[urutan_kb], np.arange(kb.max() + 2 if len(kb) else 1))
+
+    def delta_tukar(i, j):
+        a, b = sel[i], sel[j]
+        total = 0.0
+        for kode, d in zip(atribut, selisih):
+            ci, cj = kode[i], kode[j]
+            if ci != cj:
+                total += 4 + 2 * (d[a, cj] - d[a, ci] + d[b, ci] - d[b, cj])
+        return total
+
+    jumlah_usulan = jumlah_tukar = tanpa_perbaikan = 0
+    while len(kb) and time.perf_counter() - mulai < batas_waktu and tanpa_perbaikan < batch_tanpa_perbaikan:
+        # 1. Usulan pasangan (i, j) di KB yang sama, dinilai sekaligus dengan D saat ini
+        i = rng.integers(len(kb), size=ukuran_batch)
+        kb_i = kb[i]
+        j = urutan_kb[awal_kb[kb_i] + (rng.random(ukuran_batch) * (awal_kb[kb_i + 1] - awal_kb[kb_i])).astype(np.int64)]
+        a, b = sel[i], sel[j]
+        delta = np.zeros(ukuran_batch)
+        for kode, d in zip(atribut, selisih):
+            ci, cj = kode[i], kode[j]
+            delta += np.where(ci != cj, 4 + 2 * (d[a, cj] - d[a, ci] + d[b, ci] - d[b, cj]), 0)
+        calon = np.flatnonzero((delta < 0) & (a != b))
+        jumlah_usulan += ukuran_batch
+
+        # 2. Terapkan calon terbaik dulu; delta dihitung ulang karena D berubah setelah tiap tukar
+        ditukar = 0
+        for k in calon[np.argsort(delta[calon])]:
+            ii, jj = i[k], j[k]
+            if sel[ii] == sel[jj] or delta_tukar(ii, jj) >= 0:
+                continue
+            sa, sb = sel[ii], sel[jj]
+            for kode, d in zip(atribut, selisih):
+                ci, cj = kode[ii], kode[jj]
+                if ci != cj:
+                    d[sa, ci] -= 1; d[sa, cj] += 1
+                    d[sb, cj] -= 1; d[sb, ci] += 1
+            sel[ii], sel[jj] = sb, sa
+            ditukar += 1
+        jumlah_tukar += ditukar
+        tanpa_perbaikan = 0 if ditukar else tanpa_perbaikan + 1
 
-    # Fungsi helper untuk assign kelompok secara merata
-    def assign_merata(indices, num_groups, column_name):
-        num_items = len(indices)
-        if num_items == 0:
-            return # Tidak ada yang perlu diassign
-
-        # 1. Acak urutan item (mahasiswa) dalam stratum ini
-        indices_acak = np.random.permutation(indices)
-
-        # 2. Hitung ukuran target per kelompok
-        base_size = num_items // num_groups
-        remainder = num_items % num_groups
-        # Buat daftar ukuran kelompok (beberapa akan +1 jika ada sisa)
-        target_sizes = [base_size + 1] * remainder + [base_size] * (num_groups - remainder)
-
-        # 3. Acak urutan kelompok mana yg dapat ukuran lebih besar
-        random.shuffle(target_sizes)
-
-        # 4. Assign berdasarkan ukuran target yang sudah diacak
-        current_start_index = 0
-        # Iterasi sesuai jumlah kelompok (1-based index untuk group_num)
-        for group_num_idx, size in enumerate(target_sizes):
-            group_num = group_num_idx + 1 # Nomor kelompok (1, 2, 3, ...)
-            # Ambil slice dari mahasiswa yang sudah diacak
-            indices_for_this_group = indices_acak[current_start_index : current_start_index + size]
-            # Assign nomor kelompok ke DataFrame utama
-            df.loc[indices_for_this_group, column_name] = group_num
-            # Update index awal untuk slice berikutnya
-            current_start_index += size
-
-    # Tahap 1: Pembagian Kelompok Besar (KB) berdasarkan Fakultas
-    print("Tahap 1: Membagi Kelompok Besar berdasarkan proporsi Fakultas...")
-    fakultas_unik = df[KOLOM_FAKULTAS].unique()
-    for fakultas in fakultas_unik:
-        mask_fakultas = df[KOLOM_FAKULTAS] == fakultas
-        indices_fakultas = df.loc[mask_fakultas].index
-        # Gunakan fungsi helper untuk assign KB
-        assign_merata(indices_fakultas, jumlah_kb, KOLOM_KB_OUTPUT)
-    print("Pembagian Kelompok Besar selesai.")
-
-    # Tahap 2: Pembagian Kelompok Sedang (KS) di dalam Setiap KB
-    print("Tahap 2: Membagi Kelompok Sedang di dalam setiap Kelompok Besar...")
-    for kb_id in range(1, jumlah_kb + 1):
-        df_kb = df[df[KOLOM_KB_OUTPUT] == kb_id]
-        if df_kb.empty: continue
-
-        strata_ks = df_kb.groupby([KOLOM_JK, KOLOM_JALUR])
-        for (jk, jalur), group in strata_ks:
-            indices_stratum = group.index
-            # Gunakan fungsi helper untuk assign KS
-            assign_merata(indices_stratum, jumlah_ks, KOLOM_KS_OUTPUT)
-    print("Pembagian Kelompok Sedang selesai.")
-
-    df[KOLOM_KB_OUTPUT] = df[KOLOM_KB_OUTPUT].astype('Int64')
-    df[KOLOM_KS_OUTPUT] = df[KOLOM_KS_OUTPUT].astype('Int64')
+    label_ks = df[KOLOM_KS_OUTPUT].to_numpy(dtype=np.int64, na_value=0)
+    label_ks[terisi] = sel % jumlah_ks + 1
+    label_ks = label_ks.astype(_dtype_label(jumlah_ks))
+    df[KOLOM_KS_OUTPUT] = pd.arrays.IntegerArray(label_ks, label_ks == 0)
+    laporan = LaporanOptimasi(
+        objektif_awal=objektif_awal,
+        objektif_akhir=float(sum((d ** 2).sum() for d in selisih)),
+        jumlah_usulan=jumlah_usulan,
+        jumlah_tukar=jumlah_tukar,
+        durasi=time.perf_counter() - mulai,
+    )
+    return df, laporan
+
+def bagi_kelompok_optimal(df_input, jumlah_kb, jumlah_ks, rng=None, batas_waktu=5.0, jumlah_worker=JUMLAH_WORKER):
+    """Pembagian hierarkis bagi_kelompok_rata lalu optimasi_proporsi; mengembalikan (df, LaporanOptimasi)."""
+    rng = np.random.default_rng(rng)
+    df = bagi_kelompok_rata(df_input, jumlah_kb, jumlah_ks, rng=rng, jumlah_worker=jumlah_worker)
+    print(f"Tahap 3: Optimasi proporsi Fakultas/JK/Jalur di setiap KS (maks. {batas_waktu} detik)...")
+    with span('optimasi'):
+        df, laporan = optimasi_proporsi(df, jumlah_ks, batas_waktu=batas_waktu, rng=rng)
+    print(f"Optimasi selesai: objektif {laporan.objektif_awal:.1f} -> {laporan.objektif_akhir:.1f} "
+          f"({laporan.jumlah_tukar} tukar dari {laporan.jumlah_usulan} usulan, {laporan.durasi:.2f} detik).")
+    return df, laporan
+
+# --- Bagian 2b: Penugasan Inkremental (Pendaftar Susulan & Pengunduran Diri) ---
+class IndeksPengisian:
+    """Penghitung isi kelompok per stratum agar perubahan roster tidak perlu membagi ulang semua mahasiswa.
+
+    isi_kb[fakultas] dan isi_ks[(kb, jk, jalur)] menyimpan jumlah anggota tiap kelompok, dan
+    anggota[nim] menyimpan stratum serta label tiap mahasiswa. Indeks dibangun sekali dari hasil
+    bagi_kelompok_rata (O(N)); setelah itu tambah/hapus hanya menyentuh satu stratum (O(1) per
+    mahasiswa). Mahasiswa baru masuk ke kelompok paling sedikit isinya di stratumnya (seri diundi),
+    sehingga selisih ukuran maksimal 1 tetap terjaga. Pengunduran diri tidak memindahkan siapa pun;
+    selisih yang timbul ditutup oleh pendaftar berikutnya.
+    """
+
+    def __init__(self, jumlah_kb, jumlah_ks, rng=None):
+        self.jumlah_kb = jumlah_kb
+        self.jumlah_ks = jumlah_ks
+        self.rng = np.random.default_rng(rng)
+        self.isi_kb = {}
+        self.isi_ks = {}
+        self.anggota = {}
+
+    @classmethod
+    def dari_hasil(cls, df_hasil, jumlah_kb, jumlah_ks, rng=None):
+        """Membangun indeks dari DataFrame hasil bagi_kelompok_rata (satu kali lintasan)."""
+        indeks = cls(jumlah_kb, jumlah_ks, rng)
+        terisi = df_hasil[df_hasil[KOLOM_KB_OUTPUT].notna()]
+        for fakultas, isi in terisi.groupby([KOLOM_FAKULTAS, KOLOM_KB_OUTPUT], observed=True).size().groupby(level=0):
+            indeks._isi(indeks.isi_kb, fakultas, jumlah_kb)[isi.index.get_level_values(1) - 1] = isi.to_numpy()
+        for (kb, jk, jalur), isi in terisi.groupby([KOLOM_KB_OUTPUT, KOLOM_JK, KOLOM_JALUR, KOLOM_KS_OUTPUT], observed=True).size().groupby(level=[0, 1, 2]):
+            indeks._isi(indeks.isi_ks, (kb, jk, jalur), jumlah_ks)[isi.index.get_level_values(3) - 1] = isi.to_numpy()
+        kb = df_hasil[KOLOM_KB_OUTPUT].astype(object).where(df_hasil[KOLOM_KB_OUTPUT].notna(), None)
+        ks = df_hasil[KOLOM_KS_OUTPUT].astype(object).where(df_hasil[KOLOM_KS_OUTPUT].notna(), None)
+        indeks.anggota = dict(zip(df_hasil[KOLOM_NIM], zip(
+            df_hasil[KOLOM_FAKULTAS], df_hasil[KOLOM_JK], df_hasil[KOLOM_JALUR], kb, ks)))
+        return indeks
+
+    @staticmethod
+    def _isi(tabel, kunci, jumlah_kelompok):
+        if kunci not in tabel:
+            tabel[kunci] = np.zeros(jumlah_kelompok, dtype=np.int64)
+        return tabel[kunci]
+
+    def _paling_sedikit(self, isi):
+        """Nomor kelompok (1-based) dengan isi paling sedikit; jika seri dipilih acak."""
+        kandidat = np.flatnonzero(isi == isi.min())
+        return int(kandidat[self.rng.integers(len(kandidat))]) + 1
+
+    def tambah(self, nim, fakultas, jk, jalur):
+        """Menempatkan satu mahasiswa baru; mengembalikan (kb, ks)."""
+        if nim in self.anggota:
+            raise ValueError(f"NIM {nim} sudah ada di pembagian kelompok.")
+        isi_kb = self._isi(self.isi_kb, fakultas, self.jumlah_kb)
+        kb = self._paling_sedikit(isi_kb)
+        isi_ks = self._isi(self.isi_ks, (kb, jk, jalur), self.jumlah_ks)
+        ks = self._paling_sedikit(isi_ks)
+        isi_kb[kb - 1] += 1
+        isi_ks[ks - 1] += 1
+        self.anggota[nim] = (fakultas, jk, jalur, kb, ks)
+        return kb, ks
+
+    def hapus(self, nim):
+        """Mengeluarkan satu mahasiswa tanpa memindahkan anggota lain; mengembalikan (kb, ks) lamanya."""
+        if nim not in self.anggota:
+            raise KeyError(f"NIM {nim} tidak ada di pembagian kelompok sebelumnya.")
+        fakultas, jk, jalur, kb, ks = self.anggota.pop(nim)
+        if kb is not None:
+            self.isi_kb[fakultas][kb - 1] -= 1
+            if ks is not None:
+                self.isi_ks[(kb, jk, jalur)][ks - 1] -= 1
+        return kb, ks
+
+def tempatkan_mahasiswa_baru(indeks, df_baru):
+    """Memberi label KB/KS kepada df_baru saja (O(jumlah mahasiswa baru)) dan memperbarui indeks."""
+    df = df_baru.copy()
+    label = [indeks.tambah(nim, fakultas, jk, jalur) for nim, fakultas, jk, jalur in
+             zip(df[KOLOM_NIM], df[KOLOM_FAKULTAS], df[KOLOM_JK], df[KOLOM_JALUR])]
+    label = np.array(label, dtype=_dtype_label(max(indeks.jumlah_kb, indeks.jumlah_ks))).reshape(-1, 2)
+    df[KOLOM_KB_OUTPUT] = pd.arrays.IntegerArray(label[:, 0], np.zeros(len(df), dtype=bool))
+    df[KOLOM_KS_OUTPUT] = pd.arrays.IntegerArray(label[:, 1], np.zeros(len(df), dtype=bool))
     return df
 
+@dataclass
+class DeltaKelompok:
+    """Satu perubahan roster yang sudah ditempatkan: baris mahasiswa baru berlabel dan NIM yang keluar."""
+    baru: pd.DataFrame
+    keluar: list
+
+def perbarui_kelompok(indeks, df_baru=None, nim_keluar=()):
+    """Menerapkan delta roster (mahasiswa baru & NIM yang keluar) pada indeks pengisian.
+
+    Anggota lama tidak dipindahkan dan tabel hasil tidak disentuh, sehingga waktu hanya sebanding
+    dengan ukuran delta. Indeks dibangun sekali dengan IndeksPengisian.dari_hasil lalu diteruskan
+    antar pemanggilan. Mengembalikan DeltaKelompok; gabungkan ke tabel hasil dengan terapkan_delta
+    (O(N)) hanya saat tabel lengkap dibutuhkan, mis. sebelum disimpan.
+    """
+    nim_keluar = list(nim_keluar)
+    for nim in nim_keluar:
+        indeks.hapus(nim)
+    print(f"Perubahan roster: {len(nim_keluar)} mahasiswa keluar, {0 if df_baru is None else len(df_baru)} mahasiswa baru.")
+    if df_baru is None:
+        df_baru = pd.DataFrame(columns=KOLOM_INPUT)
+    with span('tempatkan_mahasiswa_baru'):
+        return DeltaKelompok(baru=tempatkan_mahasiswa_baru(indeks, df_baru), keluar=nim_keluar)
+
+def terapkan_delta(df_hasil, *daftar_delta):
+    """Menggabungkan satu atau beberapa DeltaKelompok (urut waktu) ke tabel hasil dalam satu lintasan O(N).
+
+    Status akhir tiap NIM ditentukan oleh kejadian terakhirnya, jadi mahasiswa yang masuk lalu keluar
+    (atau keluar lalu mendaftar ulang) di antara materialisasi tetap benar.
+    """
+    status = {} # NIM -> True (ada di baris baru terakhir) / False (keluar)
+    for delta in daftar_delta:
+        status.update(dict.fromkeys(delta.keluar, False))
+        status.update(dict.fromkeys(delta.baru[KOLOM_NIM], True))
+    if not status:
+        return df_hasil
+    bagian_baru = [delta.baru for delta in daftar_delta if len(delta.baru)]
+    df_gabung = df_hasil[~df_hasil[KOLOM_NIM].isin(list(status))]
+    if bagian_baru:
+        df_baru = pd.concat(bagian_baru, ignore_index=True).drop_duplicates(KOLOM_NIM, keep='last')
+        df_baru = df_baru[df_baru[KOLOM_NIM].map(status).astype(bool)]
+        df_gabung = pd.concat([df_gabung, df_baru], ignore_index=True)
+        for kolom in KOLOM_KATEGORI: # concat Categorical dengan kategori berbeda menjadi object
+            if not isinstance(df_gabung[kolom].dtype, pd.CategoricalDtype) and isinstance(df_baru[kolom].dtype, pd.CategoricalDtype):
+                df_gabung[kolom] = df_gabung[kolom].astype('category')
+    return df_gabung
+
 # --- Bagian 3: Kode Eksekusi & Verifikasi Proporsi (TAMBAH CEK STD DEV) ---
-def cek_proporsi_dan_std(df_asli, df_hasil, jumlah_kb, jumlah_ks):
-    """Mencetak perbandingan proporsi dan standar deviasi ukuran kelompok."""
+@dataclass
+class HasilVerifikasi:
+    """Semua metrik verifikasi proporsi & ukuran kelompok, dihitung dari satu kali groupby."""
+    jumlah_kb: int
+    jumlah_ks: int
+    proporsi_fakultas_global: pd.Series
+    proporsi_fakultas_kb: pd.DataFrame # baris: KB, kolom: fakultas
+    fakultas_kb_seimbang: pd.Series # bool per KB
+    ukuran_kb: pd.Series # indeks 1..jumlah_kb, termasuk KB kosong (0)
+    proporsi_jk_kb: pd.DataFrame # target proporsi JK per KB
+    proporsi_jalur_kb: pd.DataFrame # target proporsi Jalur per KB
+    proporsi_jk_ks: pd.DataFrame # baris: (KB, KS) yang terisi
+    proporsi_jalur_ks: pd.DataFrame
+    ks: pd.DataFrame # per (KB, KS): ukuran, selisih_jk, selisih_jalur, signifikan
+    ukuran_ks_per_kb: pd.DataFrame # per KB: min, max, mean, std ukuran KS
+
+    @property
+    def semua_kb_seimbang(self):
+        return bool(self.fakultas_kb_seimbang.all())
+
+    @property
+    def ks_proporsi_ok(self):
+        return not bool(self.ks['signifikan'].any())
+
+    @property
+    def rata_std_ks(self):
+        std = self.ukuran_ks_per_kb['std']
+        return sum(std) / len(std) if len(std) else None
+
+def _proporsi(counts):
+    """Normalisasi tabel hitungan per baris (baris kosong menjadi 0)."""
+    total = counts.sum(axis=1)
+    return counts.div(total.where(total > 0, 1), axis=0)
+
+def _selisih_maks(proporsi_ks, target):
+    """Selisih absolut terbesar terhadap target, hanya pada kategori yang muncul di KS (seperti value_counts)."""
+    selisih = (proporsi_ks - target.to_numpy()).abs()
+    return selisih.where(proporsi_ks > 0, 0).max(axis=1)
+
+def hitung_verifikasi(df_asli, df_hasil, jumlah_kb, jumlah_ks):
+    """Menghitung metrik verifikasi dari satu groupby (KB, KS, fakultas, JK, jalur) atas df_hasil."""
+    proporsi_fakultas_global = df_asli[KOLOM_FAKULTAS].value_counts(normalize=True).sort_index()
+    proporsi_fakultas_global = proporsi_fakultas_global[proporsi_fakultas_global > 0] # Kategori tanpa data (Categorical)
+
+    # Satu kali lintasan atas seluruh data; semua tabel lain diturunkan dari hasil agregat kecil ini
+    agregat = df_hasil.groupby(
+        [KOLOM_KB_OUTPUT, KOLOM_KS_OUTPUT, KOLOM_FAKULTAS, KOLOM_JK, KOLOM_JALUR], observed=True, dropna=False
+    ).size()
+    agregat = agregat[agregat.index.get_level_values(KOLOM_KB_OUTPUT).notna()]
+    id_kb = pd.RangeIndex(1, jumlah_kb + 1, name=KOLOM_KB_OUTPUT)
+
+    # Kelompok Besar
+    fakultas_kb = agregat.groupby(level=[KOLOM_KB_OUTPUT, KOLOM_FAKULTAS]).sum().unstack(fill_value=0)
+    fakultas_kb = fakultas_kb.reindex(index=id_kb, fill_value=0).sort_index(axis=1)
+    proporsi_fakultas_kb = _proporsi(fakultas_kb)
+    # Setara proporsi_kb.round(2).equals(proporsi_global.round(2)): fakultas yang muncul harus sama persis
+    kolom = proporsi_fakultas_kb.columns.union(proporsi_fakultas_global.index)
+    p_kb = proporsi_fakultas_kb.reindex(columns=kolom, fill_value=0)
+    p_global = proporsi_fakultas_global.reindex(kolom, fill_value=0)
+    fakultas_kb_seimbang = ((p_kb > 0) == (p_global > 0)).all(axis=1) & (p_kb.round(2) == p_global.round(2)).all(axis=1)
+    ukuran_kb = fakultas_kb.sum(axis=1)
+
+    # Kelompok Sedang di dalam KB
+    jk_ks = agregat.groupby(level=[KOLOM_KB_OUTPUT, KOLOM_KS_OUTPUT, KOLOM_JK]).sum().unstack(fill_value=0)
+    jalur_ks = agregat.groupby(level=[KOLOM_KB_OUTPUT, KOLOM_KS_OUTPUT, KOLOM_JALUR]).sum().unstack(fill_value=0)
+    jk_ks = jk_ks[jk_ks.index.get_level_values(KOLOM_KS_OUTPUT).notna()].sort_index(axis=1)
+    jalur_ks = jalur_ks.loc[jk_ks.index].sort_index(axis=1)
+    proporsi_jk_kb = _proporsi(jk_ks.groupby(level=KOLOM_KB_OUTPUT).sum())
+    proporsi_jalur_kb = _proporsi(jalur_ks.groupby(level=KOLOM_KB_OUTPUT).sum())
+    proporsi_jk_ks = _proporsi(jk_ks)
+    proporsi_jalur_ks = _proporsi(jalur_ks)
+
+    kb_per_ks = jk_ks.index.get_level_values(KOLOM_KB_OUTPUT)
+    ks = pd.DataFrame({
+        'ukuran': jk_ks.sum(axis=1),
+        'selisih_jk': _selisih_maks(proporsi_jk_ks, proporsi_jk_kb.loc[kb_per_ks]),
+        'selisih_jalur': _selisih_maks(proporsi_jalur_ks, proporsi_jalur_kb.loc[kb_per_ks]),
+    })
+    ks['signifikan'] = (ks['selisih_jk'] > TOLERANSI_JK) | (ks['selisih_jalur'] > TOLERANSI_JALUR)
+    ukuran_ks_per_kb = ks['ukuran'].groupby(level=KOLOM_KB_OUTPUT).agg(['min', 'max', 'mean', 'std'])
+
+    return HasilVerifikasi(
+        jumlah_kb=jumlah_kb, jumlah_ks=jumlah_ks,
+        proporsi_fakultas_global=proporsi_fakultas_global,
+        proporsi_fakultas_kb=proporsi_fakultas_kb,
+        fakultas_kb_seimbang=fakultas_kb_seimbang,
+        ukuran_kb=ukuran_kb,
+        proporsi_jk_kb=proporsi_jk_kb,
+        proporsi_jalur_kb=proporsi_jalur_kb,
+        proporsi_jk_ks=proporsi_jk_ks,
+        proporsi_jalur_ks=proporsi_jalur_ks,
+        ks=ks,
+        ukuran_ks_per_kb=ukuran_ks_per_kb,
+    )
+
+def _format_proporsi(baris, indent):
+    """Format satu baris proporsi (hanya kategori yang muncul) seperti value_counts().to_string()."""
+    baris = baris[baris > 0]
+    return baris.apply(lambda x: f"{indent}{x:.2%}").to_string()
+
+def cetak_verifikasi(hasil):
+    """Mencetak laporan verifikasi yang dapat dibaca manusia dari objek HasilVerifikasi."""
     print("\n--- Verifikasi Proporsi & Ukuran Kelompok ---")
 
     # 1. Verifikasi Kelompok Besar (KB)
     print("\n1. Verifikasi Kelompok Besar (KB)")
-    # Proporsi Fakultas
-    proporsi_fakultas_global = df_asli[KOLOM_FAKULTAS].value_counts(normalize=True).sort_index()
     print("   - Proporsi Fakultas Global (Target):")
-    print(proporsi_fakultas_global.apply(lambda x: f"     {x:.2%}").to_string())
-
-    all_kb_faculty_proportions_match = True
-    kb_sizes = [] # Untuk simpan ukuran tiap KB
-    for kb_id in range(1, jumlah_kb + 1):
-        df_kb = df_hasil[df_hasil[KOLOM_KB_OUTPUT] == kb_id]
-        kb_sizes.append(len(df_kb))
-        proporsi_kb = df_kb[KOLOM_FAKULTAS].value_counts(normalize=True).sort_index()
-        print(f"\n   - KB {kb_id} (Total: {len(df_kb)}):")
-        print(proporsi_kb.apply(lambda x: f"     {x:.2%}").to_string())
-        if not proporsi_kb.round(2).equals(proporsi_fakultas_global.round(2)):
-             all_kb_faculty_proportions_match = False
+    print(hasil.proporsi_fakultas_global.apply(lambda x: f"     {x:.2%}").to_string())
+
+    for kb_id in range(1, hasil.jumlah_kb + 1):
+        print(f"\n   - KB {kb_id} (Total: {hasil.ukuran_kb[kb_id]}):")
+        print(_format_proporsi(hasil.proporsi_fakultas_kb.loc[kb_id], "     "))
+        if not hasil.fakultas_kb_seimbang[kb_id]:
              print(f"     *Peringatan: Proporsi fakultas KB {kb_id} sedikit berbeda dari target global.*")
 
-    if all_kb_faculty_proportions_match:
+    if hasil.semua_kb_seimbang:
          print("\n   ==> Distribusi Fakultas antar Kelompok Besar terlihat seimbang.")
     else:
          print("\n   ==> Perhatian: Ada sedikit perbedaan proporsi fakultas antar Kelompok Besar (wajar karena pembagian).")
 
     # Ukuran dan Standar Deviasi KB
-    kb_sizes_series = pd.Series(kb_sizes)
+    kb_sizes_series = hasil.ukuran_kb
     print(f"   Ukuran Kelompok Besar: Min={kb_sizes_series.min()}, Max={kb_sizes_series.max()}, Mean={kb_sizes_series.mean():.2f}, StdDev={kb_sizes_series.std():.2f}")
     if kb_sizes_series.std() < 2: # Contoh batas toleransi std dev
          print("   ==> Variasi ukuran antar Kelompok Besar sangat kecil (distribusi merata).")
@@ -152,106 +922,572 @@ def cek_proporsi_dan_std(df_asli, df_hasil, jumlah_kb, jumlah_ks):
 
     # 2. Verifikasi Kelompok Sedang (KS) dalam KB
     print("\n2. Verifikasi Kelompok Sedang (KS) di dalam setiap KB")
-    overall_ks_proportions_ok = True
-    all_ks_std_devs = [] # Kumpulkan std dev ukuran KS dari semua KB
-    for kb_id in range(1, jumlah_kb + 1):
+    kb_terisi = hasil.ukuran_ks_per_kb.index
+    for kb_id in range(1, hasil.jumlah_kb + 1):
         print(f"\n   --- Analisis Kelompok Besar {kb_id} ---")
-        df_kb = df_hasil[df_hasil[KOLOM_KB_OUTPUT] == kb_id]
-        if df_kb.empty:
+        if kb_id not in kb_terisi:
             print("      KB ini kosong.")
             continue
 
-        # Proporsi target JK & Jalur di dalam KB ini
-        proporsi_jk_kb = df_kb[KOLOM_JK].value_counts(normalize=True).sort_index()
-        proporsi_jalur_kb = df_kb[KOLOM_JALUR].value_counts(normalize=True).sort_index()
         print(f"      - Target Proporsi JK (di KB {kb_id}):")
-        print(proporsi_jk_kb.apply(lambda x: f"        {x:.2%}").to_string())
+        print(_format_proporsi(hasil.proporsi_jk_kb.loc[kb_id], "        "))
         print(f"      - Target Proporsi Jalur Masuk (di KB {kb_id}):")
-        print(proporsi_jalur_kb.apply(lambda x: f"        {x:.2%}").to_string())
-        print(f"      - Memeriksa proporsi & ukuran di {jumlah_ks} KS dalam KB {kb_id}...")
-
-        ks_proportions_match_in_this_kb = True
-        ks_sizes_in_kb = [] # Ukuran KS khusus di KB ini
-        count_significant_diff = 0
-        for ks_id in range(1, jumlah_ks + 1):
-            df_ks = df_kb[df_kb[KOLOM_KS_OUTPUT] == ks_id]
-            if df_ks.empty: continue # Abaikan KS kosong
-            ks_sizes_in_kb.append(len(df_ks))
-
-            # Cek proporsi
-            proporsi_jk_ks = df_ks[KOLOM_JK].value_counts(normalize=True).sort_index()
-            proporsi_jalur_ks = df_ks[KOLOM_JALUR].value_counts(normalize=True).sort_index()
-            target_jk_aligned = proporsi_jk_kb.reindex(proporsi_jk_ks.index).fillna(0)
-            target_jalur_aligned = proporsi_jalur_kb.reindex(proporsi_jalur_ks.index).fillna(0)
-            diff_jk = abs(proporsi_jk_ks - target_jk_aligned).max() if not target_jk_aligned.empty else 0
-            diff_jalur = abs(proporsi_jalur_ks - target_jalur_aligned).max() if not target_jalur_aligned.empty else 0
-            TOLERANSI_JK = 0.15
-            TOLERANSI_JALUR = 0.20
-            if diff_jk > TOLERANSI_JK or diff_jalur > TOLERANSI_JALUR:
-                ks_proportions_match_in_this_kb = False
-                overall_ks_proportions_ok = False
-                count_significant_diff += 1
-                if count_significant_diff <= 3:
-                     print(f"      * Peringatan di KS {ks_id} (Total: {len(df_ks)}) - Proporsi berbeda signifikan:")
-                     print(f"         -> JK   : {proporsi_jk_ks.apply(lambda x: f'{x:.1%}').to_dict()}")
-                     print(f"         -> Jalur: {proporsi_jalur_ks.apply(lambda x: f'{x:.1%}').to_dict()}")
-                elif count_significant_diff == 4:
-                     print("      * (Peringatan proporsi serupa di KS lainnya tidak ditampilkan...)")
-
-        if ks_proportions_match_in_this_kb:
+        print(_format_proporsi(hasil.proporsi_jalur_kb.loc[kb_id], "        "))
+        print(f"      - Memeriksa proporsi & ukuran di {hasil.jumlah_ks} KS dalam KB {kb_id}...")
+
+        ks_kb = hasil.ks.loc[kb_id]
+        ks_signifikan = ks_kb.index[ks_kb['signifikan']]
+        for ks_id in ks_signifikan[:3]:
+            jk = hasil.proporsi_jk_ks.loc[(kb_id, ks_id)]
+            jalur = hasil.proporsi_jalur_ks.loc[(kb_id, ks_id)]
+            print(f"      * Peringatan di KS {ks_id} (Total: {ks_kb.at[ks_id, 'ukuran']}) - Proporsi berbeda signifikan:")
+            print(f"         -> JK   : {jk[jk > 0].apply(lambda x: f'{x:.1%}').to_dict()}")
+            print(f"         -> Jalur: {jalur[jalur > 0].apply(lambda x: f'{x:.1%}').to_dict()}")
+        if len(ks_signifikan) > 3:
+            print("      * (Peringatan proporsi serupa di KS lainnya tidak ditampilkan...)")
+
+        if len(ks_signifikan) == 0:
              print(f"      ==> Distribusi Proporsi JK & Jalur Masuk antar KS di KB {kb_id} terlihat seimbang.")
         else:
-             print(f"      ==> Perhatian: Ada perbedaan proporsi JK/Jalur pada {count_significant_diff} KS di KB {kb_id}.")
+             print(f"      ==> Perhatian: Ada perbedaan proporsi JK/Jalur pada {len(ks_signifikan)} KS di KB {kb_id}.")
 
         # Ukuran dan Standar Deviasi KS di dalam KB ini
-        if ks_sizes_in_kb:
-            ks_sizes_series = pd.Series(ks_sizes_in_kb)
-            std_dev_ks = ks_sizes_series.std()
-            all_ks_std_devs.append(std_dev_ks) # Kumpulkan untuk rata-rata nanti
-            print(f"      Ukuran KS di KB {kb_id}: Min={ks_sizes_series.min()}, Max={ks_sizes_series.max()}, Mean={ks_sizes_series.mean():.2f}, StdDev={std_dev_ks:.2f}")
-            if std_dev_ks < 1.0: # KS biasanya lebih kecil, toleransi std dev lebih ketat
-                 print("      ==> Variasi ukuran antar KS di KB ini sangat kecil.")
-            else:
-                 print("      ==> Terdapat variasi ukuran antar KS di KB ini.")
+        ukuran_ks = hasil.ukuran_ks_per_kb.loc[kb_id]
+        print(f"      Ukuran KS di KB {kb_id}: Min={ukuran_ks['min']:.0f}, Max={ukuran_ks['max']:.0f}, Mean={ukuran_ks['mean']:.2f}, StdDev={ukuran_ks['std']:.2f}")
+        if ukuran_ks['std'] < 1.0: # KS biasanya lebih kecil, toleransi std dev lebih ketat
+             print("      ==> Variasi ukuran antar KS di KB ini sangat kecil.")
         else:
-            print("      Tidak ada Kelompok Sedang yang terisi di KB ini.")
+             print("      ==> Terdapat variasi ukuran antar KS di KB ini.")
 
 
     print("\n--- Verifikasi Proporsi & Ukuran Selesai ---")
-    if overall_ks_proportions_ok:
+    if hasil.ks_proporsi_ok:
         print("Secara keseluruhan, proporsi di KS dalam masing-masing KB tampak terjaga.")
     else:
         print("Perhatian: Terdapat KS dengan proporsi JK/Jalur yang berbeda signifikan dari target KB-nya.")
 
     # Rata-rata std dev ukuran KS di semua KB
-    if all_ks_std_devs:
-        avg_ks_std_dev = sum(all_ks_std_devs) / len(all_ks_std_devs)
-        print(f"\nRata-rata Standar Deviasi ukuran Kelompok Sedang (di seluruh KB): {avg_ks_std_dev:.2f}")
+    if hasil.rata_std_ks is not None:
+        print(f"\nRata-rata Standar Deviasi ukuran Kelompok Sedang (di seluruh KB): {hasil.rata_std_ks:.2f}")
+
+def cek_proporsi_dan_std(df_asli, df_hasil, jumlah_kb, jumlah_ks):
+    """Mencetak perbandingan proporsi dan standar deviasi ukuran kelompok, lalu mengembalikan HasilVerifikasi."""
+    with span('verifikasi'):
+        hasil = hitung_verifikasi(df_asli, df_hasil, jumlah_kb, jumlah_ks)
+    cetak_verifikasi(hasil)
+    return hasil
+
+
+# --- Bagian 3b: Cache Hasil Pembagian (Disk) ---
+VERSI_ALGORITMA = 1 # Naikkan jika logika pembagian/verifikasi berubah; entri lama otomatis tidak terpakai lagi
+
+@dataclass
+class EntriCache:
+    label: dict # kolom tingkat -> array label (0 = tidak terassign)
+
+    def terapkan(self, df_input):
+        """Salinan df_input dengan kolom label tersimpan (urutan baris harus sama dengan saat disimpan)."""
+        df = df_input.copy()
+        for kolom, label in self.label.items():
+            df[kolom] = pd.arrays.IntegerArray(label, label == 0)
+        return df
+
+class CacheHasil:
+    """Cache disk hasil pembagian: label setiap tingkat sebagai array integer biasa (npz terkompresi), per kunci.
+
+    Kunci = hash isi kolom strata roster + spesifikasi hierarki + state rng + batas optimasi +
+    VERSI_ALGORITMA, sehingga perubahan roster/parameter otomatis memakai entri baru. Entri yang
+    paling lama tidak dipakai (mtime) dihapus saat total ukuran folder melebihi batas.
+    Berkas samping <kunci>.json mencatat file output yang sudah ditulis dari entri itu.
+    Verifikasi tidak disimpan (HasilVerifikasi berisi objek pandas yang bergantung versi); menghitung
+    ulang dari label hanya satu groupby.
+    """
+
+    def __init__(self, folder, ukuran_maks_mb=UKURAN_MAKS_CACHE_HASIL_MB):
+        self.folder = folder
+        self.ukuran_maks = ukuran_maks_mb * 2**20
+        self.hit = 0
+        self.miss = 0
+
+    @staticmethod
+    def kunci(df, hierarki, rng, batas_waktu_optimasi=None):
+        hierarki = tingkat_hierarki(hierarki)
+        kolom = list(dict.fromkeys(k for t in hierarki for k in t.strata))
+        parameter = {
+            'versi': VERSI_ALGORITMA,
+            'hierarki': [[t.kolom, t.jumlah, list(t.strata), t.nomor_global] for t in hierarki],
+            'rng': np.random.default_rng(rng).bit_generator.state, # State tepat sebelum pembagian, bukan hanya SEED
+            'optimasi': batas_waktu_optimasi,
+            'baris': len(df),
+            'kolom': kolom,
+        }
+        h = hashlib.sha256(json.dumps(parameter, sort_keys=True, default=str).encode('utf-8'))
+        if kolom:
+            h.update(pd.util.hash_pandas_object(df[kolom], index=False).to_numpy().tobytes())
+        return h.hexdigest()
+
+    def _path(self, kunci, ekstensi='.npz'):
+        return os.path.join(self.folder, kunci + ekstensi)
+
+    def _tulis_atomik(self, path, tulis):
+        os.makedirs(self.folder, exist_ok=True)
+        fd, path_sementara = tempfile.mkstemp(dir=self.folder, prefix='.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                tulis(f)
+            os.replace(path_sementara, path)
+        except BaseException:
+            os.unlink(path_sementara)
+            raise
+
+    def ambil(self, kunci):
+        """EntriCache untuk kunci, atau None; entri yang gagal dibaca dengan alasan apa pun dihapus dan dihitung miss."""
+        path = self._path(kunci)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                label = {str(data['kolom'][i]): data[f"label_{i}"] for i in range(len(data['kolom']))}
+        except FileNotFoundError:
+            self.miss += 1
+            return None
+        except Exception:
+            self.hapus(kunci)
+            self.miss += 1
+            return None
+        os.utime(path) # Tandai baru dipakai (LRU berbasis mtime)
+        self.hit += 1
+        return EntriCache(label)
+
+    def simpan(self, kunci, df_hasil, hierarki):
+        """Menyimpan label semua tingkat, lalu memangkas cache ke batas ukuran."""
+        kolom = [t.kolom for t in tingkat_hierarki(hierarki)]
+        array = {'kolom': np.array(kolom)}
+        for i, k in enumerate(kolom):
+            label = df_hasil[k].to_numpy(dtype=np.int64, na_value=0)
+            array[f"label_{i}"] = label.astype(_dtype_label(label.max(initial=0)))
+        self._tulis_atomik(self._path(kunci), lambda f: np.savez_compressed(f, **array))
+        self.pangkas()
+
+    def _baca_output(self, kunci):
+        try:
+            with open(self._path(kunci, '.json'), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def tanda_output(path, format_output, per_kb, df_hasil, kolom):
+        """Tanda file output: lokasi + format + hash isi semua kolom yang diekspor (bukan hanya kolom strata kunci).
+
+        Roster dengan strata sama tetapi NIM/nama berbeda memakai label cache yang sama, namun tandanya
+        berbeda sehingga file output tetap ditulis ulang.
+        """
+        h = hashlib.sha256(pd.util.hash_pandas_object(df_hasil[kolom], index=False).to_numpy().tobytes())
+        return json.dumps([os.path.abspath(path), format_output, per_kb, kolom, h.hexdigest()])
+
+    @staticmethod
+    def _tanda_file(path):
+        info = os.stat(path)
+        return [info.st_size, info.st_mtime_ns]
+
+    def output_terbaru(self, kunci, tanda_output):
+        """True jika file output untuk tanda_output sudah ditulis dari entri ini dan belum berubah sejak itu."""
+        tercatat = self._baca_output(kunci).get(tanda_output)
+        if not tercatat:
+            return False
+        try:
+            return all(self._tanda_file(path) == tanda for path, tanda in tercatat.items())
+        except OSError:
+            return False
+
+    def catat_output(self, kunci, tanda_output, daftar_file):
+        catatan = self._baca_output(kunci)
+        catatan[tanda_output] = {path: self._tanda_file(path) for path in daftar_file}
+        self._tulis_atomik(self._path(kunci, '.json'), lambda f: f.write(json.dumps(catatan).encode('utf-8')))
+
+    def _sapu_sementara(self, nama_file):
+        """Menghapus file .tmp basi dari _tulis_atomik yang terputus; mengembalikan ukuran .tmp yang masih muda."""
+        batas = time.time() - UMUR_SEMENTARA_CACHE_DETIK
+        ukuran_muda = 0
+        for nama in nama_file:
+            if not (nama.startswith('.') and nama.endswith('.tmp')):
+                continue
+            path = os.path.join(self.folder, nama)
+            try:
+                info = os.stat(path)
+                if info.st_mtime < batas:
+                    os.remove(path)
+                else:
+                    ukuran_muda += info.st_size
+            except FileNotFoundError: # Sudah diganti/dihapus proses lain
+                pass
+        return ukuran_muda
+
+    def pangkas(self):
+        """Menghapus entri yang paling lama tidak dipakai sampai total ukuran <= batas; mengembalikan jumlah entri terhapus.
+
+        File .tmp basi ikut dihapus; yang masih muda dihitung ke total ukuran.
+        """
+        try:
+            nama_file = os.listdir(self.folder)
+        except FileNotFoundError:
+            return 0
+        ukuran_sementara = self._sapu_sementara(nama_file)
+        entri = []
+        for nama in nama_file:
+            if nama.endswith('.npz'):
+                kunci = nama[:-4]
+                path = self._path(kunci)
+                ukuran = os.path.getsize(path)
+                if os.path.exists(self._path(kunci, '.json')):
+                    ukuran += os.path.getsize(self._path(kunci, '.json'))
+                entri.append((os.path.getmtime(path), ukuran, kunci))
+        total = ukuran_sementara + sum(ukuran for _, ukuran, _ in entri)
+        terhapus = 0
+        for _, ukuran, kunci in sorted(entri):
+            if total <= self.ukuran_maks:
+                break
+            self.hapus(kunci)
+            total -= ukuran
+            terhapus += 1
+        return terhapus
+
+    def hapus(self, kunci=None):
+        """Menghapus satu entri, atau seluruh isi cache jika kunci None (invalidasi manual, termasuk .tmp basi)."""
+        if kunci is None:
+            if os.path.isdir(self.folder):
+                nama_file = os.listdir(self.folder)
+                for nama in nama_file:
+                    if nama.endswith(('.npz', '.json')):
+                        try:
+                            os.remove(os.path.join(self.folder, nama))
+                        except FileNotFoundError:
+                            pass
+                self._sapu_sementara(nama_file)
+            return
+        for ekstensi in ('.npz', '.json'):
+            try:
+                os.remove(self._path(kunci, ekstensi))
+            except FileNotFoundError:
+                pass
+
+    def statistik(self):
+        return {'hit': self.hit, 'miss': self.miss}
+
+
+# --- Bagian 4: Penyimpanan Hasil (Excel / CSV / Parquet) ---
+def _format_dari_path(path, format_output):
+    if format_output is not None:
+        return format_output
+    ekstensi = os.path.splitext(path)[1].lower()
+    format_output = {'.xlsx': 'xlsx', '.csv': 'csv', '.parquet': 'parquet'}.get(ekstensi)
+    if format_output is None:
+        raise ValueError(f"Format output tidak dikenali dari ekstensi {ekstensi!r}")
+    return format_output
+
+def _path_bagian(path, nama_bagian):
+    """Nama file untuk satu bagian, mis. hasil.csv -> hasil_KB_1.csv."""
+    dasar, ekstensi = os.path.splitext(path)
+    return f"{dasar}_{nama_bagian.replace(' ', '_')}{ekstensi}"
+
+def _tulis_xlsx(bagian, path, per_bagian):
+    """Writer pandas/openpyxl standar (workbook dibangun utuh di memori)."""
+    with pd.ExcelWriter(path) as writer:
+        baris_awal = 0
+        for nama_bagian, df in bagian:
+            if per_bagian:
+                df.to_excel(writer, sheet_name=nama_bagian, index=False)
+            else:
+                df.to_excel(writer, sheet_name='Sheet1', index=False, startrow=baris_awal, header=baris_awal == 0)
+                baris_awal += len(df) + (baris_awal == 0)
+    return [path]
+
+def _tulis_xlsx_stream(bagian, path, per_bagian):
+    """Writer xlsx memori konstan: openpyxl write_only menulis baris langsung ke file sementara."""
+    from openpyxl import Workbook
+    wb = Workbook(write_only=True)
+    ws = None
+    for nama_bagian, df in bagian:
+        if ws is None or per_bagian:
+            ws = wb.create_sheet(nama_bagian if per_bagian else 'Sheet1')
+            ws.append(list(df.columns))
+        kolom = [df[k].astype(object).where(df[k].notna(), None).to_numpy() for k in df.columns]
+        for baris in zip(*kolom):
+            ws.append(baris)
+    if ws is None:
+        wb.create_sheet('Sheet1')
+    wb.save(path)
+    return [path]
+
+def _tulis_csv(bagian, path, per_bagian):
+    ditulis = []
+    for nomor, (nama_bagian, df) in enumerate(bagian):
+        if per_bagian:
+            ditulis.append(_path_bagian(path, nama_bagian))
+            df.to_csv(ditulis[-1], index=False)
+        else:
+            df.to_csv(path, index=False, mode='w' if nomor == 0 else 'a', header=nomor == 0)
+            ditulis = [path]
+    return ditulis
+
+def _tulis_parquet(bagian, path, per_bagian):
+    """Parquet via pyarrow; tanpa per_bagian setiap bagian menjadi satu row group di file yang sama."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Menulis Parquet membutuhkan pyarrow (install: pip install pyarrow)")
+    ditulis = []
+    writer = None
+    try:
+        for nama_bagian, df in bagian:
+            tabel = pa.Table.from_pandas(df, preserve_index=False)
+            if per_bagian:
+                ditulis.append(_path_bagian(path, nama_bagian))
+                pq.write_table(tabel, ditulis[-1])
+            else:
+                if writer is None:
+                    writer = pq.ParquetWriter(path, tabel.schema)
+                    ditulis = [path]
+                writer.write_table(tabel)
+    finally:
+        if writer is not None:
+            writer.close()
+    return ditulis
+
+PENULIS_OUTPUT = {
+    'xlsx': _tulis_xlsx,
+    'xlsx-stream': _tulis_xlsx_stream,
+    'csv': _tulis_csv,
+    'parquet': _tulis_parquet,
+}
+
+def tulis_tabel(bagian, path, format_output=None, per_bagian=False):
+    """Menulis urutan (nama_bagian, DataFrame) dengan writer dari PENULIS_OUTPUT; mengembalikan daftar file."""
+    format_output = _format_dari_path(path, format_output)
+    if format_output not in PENULIS_OUTPUT:
+        raise ValueError(f"Format output tidak didukung: {format_output!r} (pilihan: {sorted(PENULIS_OUTPUT)})")
+    with span(f"ekspor_{format_output}"):
+        return PENULIS_OUTPUT[format_output](bagian, path, per_bagian)
+
+def bagian_per_kb(df_hasil, kolom=KOLOM_OUTPUT):
+    """Menghasilkan (nama_bagian, df_kb) urut KB, isi tiap KB urut (KS, NIM).
+
+    Data dipartisi sekali lewat groupby().indices dan hanya tiap partisi KB yang diurutkan,
+    tanpa sort_values atas seluruh frame. Mahasiswa tanpa KB (NA) berada di bagian terakhir.
+    """
+    df_hasil = df_hasil[kolom]
+    indeks_kb = df_hasil.groupby(KOLOM_KB_OUTPUT, sort=True, dropna=False).indices
+    for kb_id, posisi in indeks_kb.items():
+        nama_bagian = 'Tanpa KB' if pd.isna(kb_id) else f"KB {kb_id}"
+        yield nama_bagian, df_hasil.iloc[posisi].sort_values(by=[KOLOM_KS_OUTPUT, KOLOM_NIM])
+
+def simpan_hasil(df_hasil, path, format_output=None, per_kb=False, kolom=KOLOM_OUTPUT):
+    """Menyimpan hasil pembagian kelompok (urut KB, KS, NIM) ke xlsx/csv/parquet, opsional per KB."""
+    return tulis_tabel(bagian_per_kb(df_hasil, kolom), path, format_output, per_bagian=per_kb)
+
+# --- Bagian 5: Laporan PDF per Kelompok (Batch) ---
+FOLDER_REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) # Lokasi laporan_pdf.py
+KOLOM_ROSTER_PDF = [(KOLOM_NIM, 'NIM', 25), (KOLOM_NAMA, 'Nama', 56), (KOLOM_FAKULTAS, 'Fakultas', 30),
+                    (KOLOM_JALUR, 'Jalur Masuk', 30), (KOLOM_JK, 'Jenis Kelamin', 25)] # (kolom, header, lebar mm)
+KOLOM_KB_PER_TABEL = 6 # Kolom KB per tabel proporsi fakultas di laporan verifikasi
+KOLOM_PROPORSI_PDF = [(KOLOM_FAKULTAS, 'Fakultas'), (KOLOM_JK, 'Jenis Kelamin'), (KOLOM_JALUR, 'Jalur Masuk')]
+
+def _modul_laporan():
+    """Import laporan_pdf (root repo) hanya saat PDF dibutuhkan, agar fpdf2 tetap opsional."""
+    if FOLDER_REPO not in sys.path:
+        sys.path.append(FOLDER_REPO)
+    try:
+        import laporan_pdf
+    except ImportError as e:
+        raise ImportError(f"Laporan PDF membutuhkan fpdf2 (install: pip install fpdf2): {e}")
+    return laporan_pdf
+
+def laporan_kelompok(judul, df_grup, dengan_ks=False):
+    """Model Laporan satu kelompok: tabel proporsi fakultas/JK/jalur lalu roster anggota."""
+    lp = _modul_laporan()
+    jumlah = len(df_grup)
+    blok = [lp.JudulBagian('Ringkasan'), lp.Paragraf(f"Jumlah anggota: {jumlah} mahasiswa.")]
+    for kolom, label in KOLOM_PROPORSI_PDF:
+        counts = df_grup[kolom].value_counts(sort=False).sort_index()
+        counts = counts[counts > 0]
+        blok += [lp.Subjudul(f"Proporsi {label}"),
+                 lp.Tabel([label, 'Jumlah', 'Persentase'],
+                          [[nilai, n, f"{n / jumlah:.1%}"] for nilai, n in counts.items()], [70, 40, 40])]
+    kolom_roster = ([(KOLOM_KS_OUTPUT, 'KS', 12)] if dengan_ks else []) + KOLOM_ROSTER_PDF
+    data_roster = df_grup[[kolom for kolom, _, _ in kolom_roster]].astype(str).values.tolist()
+    blok += [lp.JudulBagian('Daftar Anggota'),
+             lp.Tabel([header for _, header, _ in kolom_roster], data_roster, [lebar for _, _, lebar in kolom_roster], ringkas=True)]
+    return lp.Laporan(judul=judul, penulis=PENYUSUN_LAPORAN, blok=blok)
+
+def tugas_laporan_kelompok(df_hasil):
+    """Menghasilkan (nama_file, Laporan) untuk setiap KB lalu setiap KS di dalamnya, anggota urut (KS, NIM)."""
+    df_hasil = df_hasil[KOLOM_OUTPUT]
+    for kb_id, posisi in df_hasil.groupby(KOLOM_KB_OUTPUT, sort=True).indices.items():
+        df_kb = df_hasil.iloc[posisi].sort_values(by=[KOLOM_KS_OUTPUT, KOLOM_NIM])
+        yield f"KB_{kb_id}.pdf", laporan_kelompok(f"Kelompok Besar {kb_id}", df_kb, dengan_ks=True)
+        for ks_id, posisi_ks in df_kb.groupby(KOLOM_KS_OUTPUT, sort=True).indices.items():
+            yield (f"KB_{kb_id}_KS_{ks_id}.pdf",
+                   laporan_kelompok(f"Kelompok Besar {kb_id} - Kelompok Sedang {ks_id}", df_kb.iloc[posisi_ks]))
+
+def simpan_laporan_kelompok(df_hasil, folder, jumlah_worker=JUMLAH_WORKER, font_dir=None):
+    """Merender satu PDF per KB dan per KS ke folder (paralel, file ditulis atomik); mengembalikan HasilBatch."""
+    lp = _modul_laporan()
+    print(f"\nMembuat laporan PDF per kelompok di {folder}...")
+    with span('pdf_kelompok'):
+        return lp.render_batch(tugas_laporan_kelompok(df_hasil), folder,
+                               font_dir=lp.FONT_DIR if font_dir is None else font_dir, jumlah_worker=jumlah_worker)
+
+def _persen(x):
+    return f"{x:.1%}"
+
+def laporan_verifikasi(hasil, df_hasil, dengan_roster=LAPORAN_DENGAN_ROSTER):
+    """Model Laporan untuk panitia langsung dari HasilVerifikasi dan df_hasil di memori (tanpa baca ulang Excel).
+
+    Roster lampiran berupa generator sehingga model ini hanya dapat dirender sekali.
+    """
+    lp = _modul_laporan()
+    ks = hasil.ks
+    ks_signifikan = ks[ks['signifikan']]
+    kesimpulan = [
+        "Distribusi fakultas antar Kelompok Besar seimbang." if hasil.semua_kb_seimbang
+        else "Ada sedikit perbedaan proporsi fakultas antar Kelompok Besar (wajar karena pembagian).",
+        f"Proporsi JK & jalur masuk seluruh KS dalam toleransi (JK {TOLERANSI_JK:.0%}, jalur {TOLERANSI_JALUR:.0%})."
+        if hasil.ks_proporsi_ok else f"{len(ks_signifikan)} KS memiliki proporsi JK/jalur di luar toleransi.",
+        f"Ukuran Kelompok Besar: Min={hasil.ukuran_kb.min()}, Max={hasil.ukuran_kb.max()}, StdDev={hasil.ukuran_kb.std():.2f}.",
+    ]
+    if hasil.rata_std_ks is not None:
+        kesimpulan.append(f"Rata-rata standar deviasi ukuran Kelompok Sedang: {hasil.rata_std_ks:.2f}.")
+
+    # Tabel KB: fakultas sebagai baris, maksimal KOLOM_KB_PER_TABEL KB per tabel agar tetap muat
+    fakultas = list(hasil.proporsi_fakultas_global.index)
+    p_kb = hasil.proporsi_fakultas_kb.reindex(columns=fakultas, fill_value=0)
+    tabel_kb = []
+    for awal in range(1, hasil.jumlah_kb + 1, KOLOM_KB_PER_TABEL):
+        id_kb = range(awal, min(awal + KOLOM_KB_PER_TABEL, hasil.jumlah_kb + 1))
+        data = [[f, _persen(hasil.proporsi_fakultas_global[f])] + [_persen(p_kb.at[kb_id, f]) for kb_id in id_kb]
+                for f in fakultas]
+        data.append(['Total', len(df_hasil)] + [hasil.ukuran_kb[kb_id] for kb_id in id_kb])
+        data.append(['Seimbang', '-'] + ['Ya' if hasil.fakultas_kb_seimbang[kb_id] else 'Tidak' for kb_id in id_kb])
+        lebar = (170 - 35) / (len(id_kb) + 1)
+        tabel_kb.append(lp.Tabel(['Fakultas', 'Target'] + [f"KB {kb_id}" for kb_id in id_kb], data,
+                                 [35] + [lebar] * (len(id_kb) + 1)))
+
+    jumlah_signifikan = ks['signifikan'].groupby(level=KOLOM_KB_OUTPUT).sum()
+    data_ks = [[f"KB {kb_id}", f"{u['min']:.0f}", f"{u['max']:.0f}", f"{u['mean']:.2f}", f"{u['std']:.2f}",
+                int(jumlah_signifikan.get(kb_id, 0))] for kb_id, u in hasil.ukuran_ks_per_kb.iterrows()]
+
+    blok = [
+        lp.JudulBagian('Ringkasan'),
+        lp.Paragraf(f"{len(df_hasil)} mahasiswa dibagi ke {hasil.jumlah_kb} Kelompok Besar, "
+                    f"masing-masing berisi {hasil.jumlah_ks} Kelompok Sedang."),
+        lp.Daftar(kesimpulan),
+        lp.JudulBagian('Kelompok Besar'),
+        lp.Subjudul('Ukuran dan proporsi fakultas per KB'),
+        *tabel_kb,
+        lp.JudulBagian('Kelompok Sedang'),
+        lp.Subjudul('Ukuran KS per KB'),
+        lp.Tabel(['KB', 'Min', 'Max', 'Rata-rata', 'StdDev', 'KS di luar toleransi'], data_ks),
+        lp.Subjudul('KS dengan proporsi di luar toleransi'),
+    ]
+    if len(ks_signifikan):
+        blok.append(lp.Tabel(['KB', 'KS', 'Ukuran', 'Selisih JK', 'Selisih Jalur'],
+                             [[kb_id, ks_id, r['ukuran'], _persen(r['selisih_jk']), _persen(r['selisih_jalur'])]
+                              for (kb_id, ks_id), r in ks_signifikan.iterrows()]))
+    else:
+        blok.append(lp.Paragraf("Tidak ada. Semua KS berada dalam toleransi proporsi KB-nya."))
+    if dengan_roster:
+        kolom_roster = [(KOLOM_KB_OUTPUT, 'KB', 12), (KOLOM_KS_OUTPUT, 'KS', 12)] + KOLOM_ROSTER_PDF
+        # Generator: baris roster dibaca print_tabel_cepat satu per satu, tanpa salinan seluruh roster sebagai list
+        data_roster = (baris for _, df_kb in bagian_per_kb(df_hasil, [kolom for kolom, _, _ in kolom_roster])
+                       for baris in df_kb.astype(str).itertuples(index=False, name=None))
+        blok += [lp.JudulBagian('Lampiran: Daftar Anggota'),
+                 lp.Tabel([header for _, header, _ in kolom_roster], data_roster, [lebar for _, _, lebar in kolom_roster],
+                          ringkas=True)]
+    return lp.Laporan(judul='Laporan Pembagian Kelompok PJK', penulis=PENYUSUN_LAPORAN, blok=blok)
+
+def simpan_laporan_verifikasi(hasil, df_hasil, path, dengan_roster=LAPORAN_DENGAN_ROSTER, font_dir=None):
+    """Merender laporan verifikasi (dan roster) ke PDF dengan output streaming; mengembalikan path."""
+    lp = _modul_laporan()
+    print(f"\nMembuat laporan PDF verifikasi di {path}...")
+    mulai = time.perf_counter()
+    builder = lp.ReportBuilder(font_dir=lp.FONT_DIR if font_dir is None else font_dir)
+    with span('pdf_verifikasi'):
+        builder.render_ke_file(laporan_verifikasi(hasil, df_hasil, dengan_roster), path, streaming=True)
+    print(f"Laporan PDF selesai dalam {time.perf_counter() - mulai:.2f} detik.")
+    return path
 
 
 # --- Alur Eksekusi Utama ---
 if __name__ == "__main__":
-    # 1. Buat Data Dummy
-    df_mahasiswa = buat_data_dummy(JUMLAH_DATA_DUMMY)
+    # Satu Generator untuk seluruh pipeline
+    rng = np.random.default_rng(SEED)
+
+    # 1. Baca roster asli, atau buat Data Dummy jika tidak ada
+    if NAMA_FILE_INPUT:
+        df_mahasiswa = baca_data_mahasiswa(NAMA_FILE_INPUT)
+    else:
+        df_mahasiswa = kompakkan_data(buat_data_dummy(JUMLAH_DATA_DUMMY, rng=rng))
 
     # 2. Lakukan Pembagian Kelompok (Gunakan fungsi baru)
-    df_hasil_kelompok = bagi_kelompok_rata(df_mahasiswa, JUMLAH_KB, JUMLAH_KS) # Panggil fungsi yg dimodifikasi
+    hierarki = tingkat_hierarki(HIERARKI_KELOMPOK or hierarki_standar(JUMLAH_KB, JUMLAH_KS))
+    jumlah_per_tingkat = jumlah_kelompok_tingkat(hierarki)
+    jumlah_kb, jumlah_ks = jumlah_per_tingkat[KOLOM_KB_OUTPUT], jumlah_per_tingkat[KOLOM_KS_OUTPUT]
+    kolom_output = KOLOM_OUTPUT + [t.kolom for t in hierarki if t.kolom not in KOLOM_OUTPUT]
+
+    # Cache hasil: roster + parameter + SEED yang sama memuat label dari disk (tanpa SEED hasil memang acak)
+    cache_hasil = CacheHasil(FOLDER_CACHE_HASIL) if FOLDER_CACHE_HASIL and SEED is not None else None
+    entri_cache = None
+    if cache_hasil:
+        kunci_cache = CacheHasil.kunci(df_mahasiswa, hierarki, rng, None if HIERARKI_KELOMPOK else BATAS_WAKTU_OPTIMASI)
+        if SEGARKAN_CACHE_HASIL:
+            cache_hasil.hapus(kunci_cache)
+        entri_cache = cache_hasil.ambil(kunci_cache)
+
+    if entri_cache:
+        print(f"Hasil pembagian dimuat dari cache ({kunci_cache[:12]}).")
+        df_hasil_kelompok = entri_cache.terapkan(df_mahasiswa)
+    elif HIERARKI_KELOMPOK:
+        df_hasil_kelompok = bagi_hierarki(df_mahasiswa, hierarki, rng=rng, jumlah_worker=JUMLAH_WORKER)
+    elif BATAS_WAKTU_OPTIMASI:
+        df_hasil_kelompok, _ = bagi_kelompok_optimal(df_mahasiswa, JUMLAH_KB, JUMLAH_KS, rng=rng, batas_waktu=BATAS_WAKTU_OPTIMASI, jumlah_worker=JUMLAH_WORKER)
+    else:
+        df_hasil_kelompok = bagi_kelompok_rata(df_mahasiswa, JUMLAH_KB, JUMLAH_KS, rng=rng, jumlah_worker=JUMLAH_WORKER) # Panggil fungsi yg dimodifikasi
 
     # 3. Cek Proporsi dan Standar Deviasi Ukuran (Gunakan fungsi baru)
-    cek_proporsi_dan_std(df_mahasiswa, df_hasil_kelompok, JUMLAH_KB, JUMLAH_KS) # Panggil fungsi cek yg dimodifikasi
+    hasil_verifikasi = cek_proporsi_dan_std(df_mahasiswa, df_hasil_kelompok, jumlah_kb, jumlah_ks) # Panggil fungsi cek yg dimodifikasi
+    if cache_hasil and not entri_cache:
+        cache_hasil.simpan(kunci_cache, df_hasil_kelompok, hierarki)
 
-    # 4. Siapkan Output Akhir (Sama seperti sebelumnya, sudah lengkap)
-    kolom_output = [
-        KOLOM_NIM, KOLOM_NAMA, KOLOM_FAKULTAS, KOLOM_JK, KOLOM_JALUR,
-        KOLOM_KB_OUTPUT, KOLOM_KS_OUTPUT
-    ]
-    df_output_final = df_hasil_kelompok[kolom_output]
-    df_output_final = df_output_final.sort_values(by=[KOLOM_KB_OUTPUT, KOLOM_KS_OUTPUT, KOLOM_NIM])
+    # 4. Simpan Hasil Akhir (urut KB, KS, NIM; format dari FORMAT_OUTPUT atau ekstensi file)
+    if NAMA_FILE_OUTPUT:
+        tanda_output = CacheHasil.tanda_output(NAMA_FILE_OUTPUT, FORMAT_OUTPUT, OUTPUT_PER_KB, df_hasil_kelompok, kolom_output) if cache_hasil else None
+        if entri_cache and cache_hasil.output_terbaru(kunci_cache, tanda_output):
+            print(f"\n{NAMA_FILE_OUTPUT} sudah berisi hasil ini dan tidak berubah; penulisan ulang dilewati.")
+        else:
+            try:
+                print(f"\nMenyimpan hasil akhir ke {NAMA_FILE_OUTPUT}...")
+                daftar_file = simpan_hasil(df_hasil_kelompok, NAMA_FILE_OUTPUT, FORMAT_OUTPUT, per_kb=OUTPUT_PER_KB, kolom=kolom_output)
+                print("Proses selesai! Hasil pembagian kelompok final telah disimpan.")
+                if cache_hasil:
+                    cache_hasil.catat_output(kunci_cache, tanda_output, daftar_file)
+            except Exception as e:
+                print(f"Error saat menyimpan file hasil akhir: {e}")
 
-    # 5. Simpan Hasil Akhir ke Excel
-    try:
-        print(f"\nMenyimpan hasil akhir ke {NAMA_FILE_OUTPUT}...")
-        df_output_final.to_excel(NAMA_FILE_OUTPUT, index=False)
-        print("Proses selesai! Hasil pembagian kelompok final telah disimpan.")
-    except Exception as e:
-        print(f"Error saat menyimpan file hasil akhir: {e}")
\ No newline at end of file
+    # 4b. Laporan PDF untuk panitia, langsung dari data di memori (opsional)
+    if NAMA_FILE_LAPORAN:
+        try:
+            simpan_laporan_verifikasi(hasil_verifikasi, df_hasil_kelompok, NAMA_FILE_LAPORAN)
+        except Exception as e:
+            print(f"Error saat membuat laporan PDF: {e}")
+
+    # 5. Laporan PDF per KB dan per KS (opsional)
+    if FOLDER_LAPORAN_KELOMPOK:
+        try:
+            simpan_laporan_kelompok(df_hasil_kelompok, FOLDER_LAPORAN_KELOMPOK, jumlah_worker=JUMLAH_WORKER)
+        except Exception as e:
+            print(f"Error saat membuat laporan PDF kelompok: {e}")
+
+    # 6. Ringkasan waktu & memori per tahap (hanya jika PJK_PROFIL diisi)
+    if INSTRUMENTASI.aktif:
+        INSTRUMENTASI.simpan_ringkasan(FILE_RINGKASAN_PROFIL)
+        print(f"\nRingkasan profil per tahap disimpan ke {FILE_RINGKASAN_PROFIL}")
@@ -0,0 +1,521 @@
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import os
+import pickle
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import traceback
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import dashboard_pjk as pjk
+
+# --- Konfigurasi Layanan ---
+HOST_LAYANAN = '127.0.0.1' # Hanya lokal; panel admin memanggil dari mesin yang sama
+PORT_LAYANAN = 8765
+JUMLAH_WORKER_LAYANAN = 2 # Proses worker yang menjaga pandas/numpy/fpdf tetap ter-import
+UKURAN_ANTRIAN = 16 # Pekerjaan menunggu maksimal; lebih dari ini ditolak 503 + Retry-After (backpressure)
+BATAS_UNGGAHAN_MB = 200
+FOLDER_KERJA_LAYANAN = None # Folder roster unggahan & hasil per pekerjaan; None = folder sementara yang dihapus saat layanan berhenti
+JUMLAH_PEKERJAAN_DISIMPAN = 1000 # Pekerjaan selesai tertua (beserta filenya) dilupakan setelah ini
+UKURAN_POTONGAN = 64 * 1024 # Ukuran potongan saat membaca unggahan / mengirim file hasil
+BATAS_BUANG_DETIK = 30 # Lama maksimal membuang body yang tidak dibaca setelah respons galat
+FORMAT_HASIL_LAYANAN = 'csv' # Default format tabel hasil ('csv', 'xlsx', 'xlsx-stream', 'parquet')
+EKSTENSI_HASIL = {'xlsx': '.xlsx', 'xlsx-stream': '.xlsx', 'csv': '.csv', 'parquet': '.parquet'}
+STATUS_AKHIR = ('selesai', 'gagal')
+
+# --- Bagian 1: Pekerjaan di Proses Worker ---
+def _inisialisasi_worker():
+    """Import modul berat sekali per worker; pesan progres dashboard tidak dicetak ke log layanan."""
+    sys.stdout = open(os.devnull, 'w')
+    with contextlib.suppress(ImportError):
+        pjk._modul_laporan()
+
+def kerjakan_pembagian(folder, path_roster, jumlah_kb, jumlah_ks, seed, format_output):
+    """bagi_kelompok_rata + hitung_verifikasi atas roster unggahan; hasil ditulis ke folder pekerjaan."""
+    waktu = {}
+    mulai = time.perf_counter()
+    df = pjk.baca_data_mahasiswa(path_roster)
+    waktu['baca'] = time.perf_counter() - mulai
+    mulai = time.perf_counter()
+    df_hasil = pjk.bagi_kelompok_rata(df, jumlah_kb, jumlah_ks, rng=seed, jumlah_worker=1)
+    waktu['pembagian'] = time.perf_counter() - mulai
+    mulai = time.perf_counter()
+    verifikasi = pjk.hitung_verifikasi(df, df_hasil, jumlah_kb, jumlah_ks)
+    waktu['verifikasi'] = time.perf_counter() - mulai
+    mulai = time.perf_counter()
+    path_hasil = os.path.join(folder, 'hasil' + EKSTENSI_HASIL[format_output])
+    pjk.simpan_hasil(df_hasil, path_hasil, format_output)
+    # Data untuk pekerjaan laporan PDF berikutnya, tanpa membaca ulang tabel hasil
+    with open(os.path.join(folder, 'hasil.pkl'), 'wb') as f:
+        pickle.dump((df_hasil[pjk.KOLOM_OUTPUT], verifikasi), f, protocol=pickle.HIGHEST_PROTOCOL)
+    waktu['simpan'] = time.perf_counter() - mulai
+    return path_hasil, {
+        'jumlah_mahasiswa': len(df),
+        'ukuran_kb': {int(kb): int(n) for kb, n in verifikasi.ukuran_kb.items()},
+        'semua_kb_seimbang': verifikasi.semua_kb_seimbang,
+        'ks_proporsi_ok': verifikasi.ks_proporsi_ok,
+        'ks_di_luar_toleransi': int(verifikasi.ks['signifikan'].sum()),
+        'rata_std_ks': None if verifikasi.rata_std_ks is None else float(verifikasi.rata_std_ks),
+        'waktu_tahap': waktu,
+    }
+
+def kerjakan_laporan(folder_sumber, folder, font_dir):
+    """PDF verifikasi + roster dari hasil pekerjaan pembagian sebelumnya."""
+    with open(os.path.join(folder_sumber, 'hasil.pkl'), 'rb') as f:
+        df_hasil, verifikasi = pickle.load(f)
+    path_hasil = os.path.join(folder, 'laporan.pdf')
+    pjk.simpan_laporan_verifikasi(verifikasi, df_hasil, path_hasil, font_dir=font_dir)
+    return path_hasil, {'ukuran_byte': os.path.getsize(path_hasil)}
+
+# --- Bagian 2: Antrian & Status Pekerjaan ---
+@dataclass
+class Pekerjaan:
+    id: str
+    jenis: str # 'pembagian' atau 'laporan'
+    folder: str
+    fungsi: object
+    argumen: tuple
+    sumber: str = None # Id pekerjaan pembagian yang foldernya dibaca (laporan)
+    status: str = 'antri'
+    dibuat: float = field(default_factory=time.time)
+    mulai: float = None
+    selesai: float = None
+    ringkasan: dict = None
+    path_hasil: str = None
+    galat: str = None
+    perubahan: asyncio.Event = field(default_factory=asyncio.Event)
+
+    def ubah_status(self, status):
+        self.status = status
+        self.perubahan.set() # Bangunkan semua pemantau, lalu siapkan event baru untuk perubahan berikutnya
+        self.perubahan = asyncio.Event()
+
+    def ke_dict(self):
+        hasil = {'id': self.id, 'jenis': self.jenis, 'status': self.status}
+        if self.mulai is not None:
+            hasil['waktu_antri'] = self.mulai - self.dibuat
+        if self.selesai is not None:
+            hasil['durasi'] = self.selesai - self.mulai
+            hasil['latensi'] = self.selesai - self.dibuat
+        if self.ringkasan is not None:
+            hasil['ringkasan'] = self.ringkasan
+        if self.galat is not None:
+            hasil['galat'] = self.galat
+        return hasil
+
+class LayananPJK:
+    """Antrian asyncio berbatas di depan ProcessPoolExecutor yang worker-nya tetap hidup antar permintaan."""
+
+    def __init__(self, jumlah_worker=JUMLAH_WORKER_LAYANAN, ukuran_antrian=UKURAN_ANTRIAN,
+                 folder_kerja=FOLDER_KERJA_LAYANAN, font_dir=None):
+        self.jumlah_worker = jumlah_worker
+        self.folder_sementara = folder_kerja is None # Folder buatan sendiri dihapus saat berhenti; folder konfigurasi dibiarkan
+        self.folder_kerja = folder_kerja or tempfile.mkdtemp(prefix='layanan_pjk_')
+        self.font_dir = None if font_dir is None else os.path.abspath(font_dir) # None = FONT_DIR laporan_pdf
+        self.antrian = asyncio.Queue(maxsize=ukuran_antrian)
+        self.pekerjaan = OrderedDict()
+        self.berjalan = 0
+        self.latensi = {'pembagian': deque(maxlen=JUMLAH_PEKERJAAN_DISIMPAN), 'laporan': deque(maxlen=JUMLAH_PEKERJAAN_DISIMPAN)}
+        self.jumlah_selesai = self.jumlah_gagal = self.jumlah_ditolak = 0
+        self.executor = None
+        self.konsumen = []
+
+    async def mulai(self):
+        self.executor = ProcessPoolExecutor(max_workers=self.jumlah_worker, initializer=_inisialisasi_worker)
+        # Panaskan semua worker sekarang, bukan saat pekerjaan pertama datang
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.executor, time.sleep, 0) for _ in range(self.jumlah_worker)))
+        self.konsumen = [asyncio.create_task(self._konsumen()) for _ in range(self.jumlah_worker)]
+
+    async def berhenti(self):
+        for tugas in self.konsumen:
+            tugas.cancel()
+        await asyncio.gather(*self.konsumen, return_exceptions=True)
+        self.executor.shutdown(cancel_futures=True)
+        if self.folder_sementara:
+            shutil.rmtree(self.folder_kerja, ignore_errors=True)
+
+    def folder_baru(self):
+        id_pekerjaan = uuid.uuid4().hex[:12]
+        folder = os.path.join(self.folder_kerja, id_pekerjaan)
+        os.makedirs(folder)
+        return id_pekerjaan, folder
+
+    def ajukan(self, id_pekerjaan, jenis, folder, fungsi, *argumen, sumber=None):
+        """Mengantrikan pekerjaan; asyncio.QueueFull jika antrian penuh (pemanggil menjawab 503)."""
+        pekerjaan = Pekerjaan(id_pekerjaan, jenis, folder, fungsi, argumen, sumber)
+        try:
+            self.antrian.put_nowait(pekerjaan)
+        except asyncio.QueueFull:
+            self.jumlah_ditolak += 1
+            shutil.rmtree(folder, ignore_errors=True)
+            raise
+        self.pekerjaan[id_pekerjaan] = pekerjaan
+        self._lupakan_lama()
+        return pekerjaan
+
+    def _lupakan_lama(self):
+        """Melupakan pekerjaan selesai tertua sampai tersisa JUMLAH_PEKERJAAN_DISIMPAN.
+
+        Pekerjaan yang belum selesai dan sumber laporan yang belum selesai dilewati, karena
+        foldernya masih dibaca worker.
+        """
+        lebih = len(self.pekerjaan) - JUMLAH_PEKERJAAN_DISIMPAN
+        if lebih <= 0:
+            return
+        dipakai = {p.sumber for p in self.pekerjaan.values() if p.sumber and p.status not in STATUS_AKHIR}
+        lama = [p for p in self.pekerjaan.values() if p.status in STATUS_AKHIR and p.id not in dipakai][:lebih]
+        for pekerjaan in lama:
+            del self.pekerjaan[pekerjaan.id]
+            shutil.rmtree(pekerjaan.folder, ignore_errors=True)
+
+    async def _konsumen(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pekerjaan = await self.antrian.get()
+            pekerjaan.mulai = time.time()
+            self.berjalan += 1
+            pekerjaan.ubah_status('berjalan')
+            try:
+                pekerjaan.path_hasil, pekerjaan.ringkasan = await loop.run_in_executor(
+                    self.executor, pekerjaan.fungsi, *pekerjaan.argumen)
+                status = 'selesai'
+                self.jumlah_selesai += 1
+            except Exception as e:
+                pekerjaan.galat = f"{type(e).__name__}: {e}"
+                status = 'gagal'
+                self.jumlah_gagal += 1
+            finally:
+                self.berjalan -= 1
+                self.antrian.task_done()
+            pekerjaan.selesai = time.time()
+            self.latensi[pekerjaan.jenis].append(pekerjaan.selesai - pekerjaan.dibuat)
+            pekerjaan.ubah_status(status)
+            info = pekerjaan.ke_dict()
+            print(f"[{pekerjaan.id}] {pekerjaan.jenis} {status}: antri {info['waktu_antri']:.2f}s, "
+                  f"proses {info['durasi']:.2f}s, total {info['latensi']:.2f}s (antrian {self.antrian.qsize()})", flush=True)
+
+    def status(self):
+        """Kedalaman antrian, worker sibuk, dan ringkasan latensi per jenis pekerjaan."""
+        latensi = {}
+        for jenis, nilai in self.latensi.items():
+            if nilai:
+                urut = sorted(nilai)
+                latensi[jenis] = {'jumlah': len(urut), 'rata': statistics.fmean(urut), 'p50': urut[len(urut) // 2],
+                                  'p95': urut[min(len(urut) - 1, int(len(urut) * 0.95))], 'maks': urut[-1]}
+        return {
+            'antrian': self.antrian.qsize(), 'kapasitas_antrian': self.antrian.maxsize,
+            'berjalan': self.berjalan, 'worker': self.jumlah_worker,
+            'selesai': self.jumlah_selesai, 'gagal': self.jumlah_gagal, 'ditolak': self.jumlah_ditolak,
+            'latensi': latensi,
+        }
+
+# --- Bagian 3: HTTP Minimal di atas asyncio ---
+PESAN_STATUS = {200: 'OK', 202: 'Accepted', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                409: 'Conflict', 413: 'Payload Too Large', 503: 'Service Unavailable'}
+TIPE_HASIL = {'.csv': 'text/csv', '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+              '.parquet': 'application/octet-stream', '.pdf': 'application/pdf'}
+
+class GalatHTTP(Exception):
+    def __init__(self, kode, pesan, header=None):
+        super().__init__(pesan)
+        self.kode = kode
+        self.header = header or {}
+
+def _kepala(kode, tipe, header=None, panjang=None):
+    baris = [f"HTTP/1.1 {kode} {PESAN_STATUS.get(kode, '')}", f"Content-Type: {tipe}", "Connection: close"]
+    baris.append(f"Content-Length: {panjang}" if panjang is not None else "Transfer-Encoding: chunked")
+    baris += [f"{k}: {v}" for k, v in (header or {}).items()]
+    return ('\r\n'.join(baris) + '\r\n\r\n').encode('latin-1')
+
+async def _kirim_json(writer, kode, data, header=None):
+    isi = json.dumps(data).encode('utf-8')
+    writer.write(_kepala(kode, 'application/json', header, len(isi)) + isi)
+    await writer.drain()
+
+async def _kirim_potongan(writer, data):
+    writer.write(f"{len(data):x}\r\n".encode('latin-1') + data + b"\r\n")
+    await writer.drain()
+
+async def _baca_permintaan(reader):
+    """(metode, path, query, header) dari request line + header HTTP/1.1."""
+    baris = (await reader.readline()).decode('latin-1').split()
+    if len(baris) != 3:
+        raise GalatHTTP(400, "Request line tidak valid")
+    metode, target, _ = baris
+    header = {}
+    while True:
+        teks = (await reader.readline()).decode('latin-1')
+        if teks in ('\r\n', '\n', ''):
+            break
+        nama, _, nilai = teks.partition(':')
+        header[nama.strip().lower()] = nilai.strip()
+    url = urllib.parse.urlsplit(target)
+    query = {k: v[-1] for k, v in urllib.parse.parse_qs(url.query).items()}
+    return metode, url.path.rstrip('/') or '/', query, header
+
+async def _simpan_unggahan(reader, header, path):
+    """Body request langsung ke file per potongan (roster besar tidak ditahan di memori)."""
+    if 'content-length' not in header:
+        raise GalatHTTP(400, "Content-Length wajib untuk unggahan roster")
+    try:
+        sisa = int(header['content-length'])
+    except ValueError:
+        raise GalatHTTP(400, "Content-Length harus bilangan bulat")
+    if sisa < 0:
+        raise GalatHTTP(400, "Content-Length tidak boleh negatif")
+    if sisa > BATAS_UNGGAHAN_MB * 2**20:
+        raise GalatHTTP(413, f"Roster lebih dari {BATAS_UNGGAHAN_MB} MB")
+    with open(path, 'wb') as f:
+        while sisa:
+            data = await reader.read(min(UKURAN_POTONGAN, sisa))
+            if not data:
+                raise GalatHTTP(400, "Unggahan terputus")
+            f.write(data)
+            sisa -= len(data)
+
+async def _buang_sisa(reader, batas_detik=BATAS_BUANG_DETIK):
+    """Membuang body yang belum dibaca sampai klien menutup koneksi.
+
+    Menutup socket selagi unggahan masih mengalir membuat kernel mengirim RST, sehingga klien
+    tidak sempat membaca respons galat (mis. 503 + Retry-After) yang sudah dikirim.
+    """
+    async def buang():
+        sisa = BATAS_UNGGAHAN_MB * 2**20
+        while sisa > 0 and (data := await reader.read(UKURAN_POTONGAN)):
+            sisa -= len(data)
+    with contextlib.suppress(ConnectionError, asyncio.TimeoutError):
+        await asyncio.wait_for(buang(), batas_detik)
+
+def _parameter_int(query, nama, default):
+    try:
+        return int(query[nama]) if nama in query else default
+    except ValueError:
+        raise GalatHTTP(400, f"Parameter {nama} harus bilangan bulat")
+
+class ServerPJK:
+    """Rute HTTP:
+    POST /pembagian?jumlah_kb=&jumlah_ks=&seed=&format=&nama=roster.csv  (body = file roster) -> 202 {id}
+    POST /pekerjaan/<id>/laporan   PDF verifikasi dari pekerjaan pembagian yang selesai -> 202 {id}
+    GET  /pekerjaan/<id>           status JSON
+    GET  /pekerjaan/<id>/pantau    status NDJSON (chunked) setiap kali berubah, sampai selesai/gagal
+    GET  /pekerjaan/<id>/hasil     file hasil (tabel atau PDF), dikirim per potongan
+    GET  /status                   kedalaman antrian, worker sibuk, latensi per jenis
+    """
+
+    def __init__(self, layanan):
+        self.layanan = layanan
+        self.koneksi = set() # Task tangani yang masih terbuka; dibatalkan saat layanan berhenti
+
+    async def tutup_koneksi(self):
+        for tugas in self.koneksi:
+            tugas.cancel()
+        await asyncio.gather(*self.koneksi, return_exceptions=True)
+
+    async def tangani(self, reader, writer):
+        tugas = asyncio.current_task()
+        self.koneksi.add(tugas)
+        try:
+            metode, path, query, header = await _baca_permintaan(reader)
+            await self.rute(metode, path, query, header, reader, writer)
+        except GalatHTTP as e:
+            with contextlib.suppress(ConnectionError):
+                await _kirim_json(writer, e.kode, {'galat': str(e)}, e.header)
+                await _buang_sisa(reader)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError as e: # Request rusak (header/angka/encoding tidak valid, baris terlalu panjang)
+            with contextlib.suppress(ConnectionError):
+                await _kirim_json(writer, 400, {'galat': f"Request tidak valid: {e}"})
+                await _buang_sisa(reader)
+        except Exception as e:
+            traceback.print_exc()
+            with contextlib.suppress(ConnectionError): # Jika respons sudah mulai dikirim, klien melihat stream terputus
+                await _kirim_json(writer, 500, {'galat': f"{type(e).__name__}: {e}"})
+        finally:
+            self.koneksi.discard(tugas)
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    def _ambil_pekerjaan(self, id_pekerjaan):
+        pekerjaan = self.layanan.pekerjaan.get(id_pekerjaan)
+        if pekerjaan is None:
+            raise GalatHTTP(404, f"Pekerjaan {id_pekerjaan} tidak ditemukan")
+        return pekerjaan
+
+    def _antrikan(self, jenis, folder_id, fungsi, *argumen, sumber=None):
+        id_pekerjaan, folder = folder_id
+        try:
+            return self.layanan.ajukan(id_pekerjaan, jenis, folder, fungsi, *argumen, sumber=sumber)
+        except asyncio.QueueFull:
+            raise GalatHTTP(503, "Antrian penuh, coba lagi nanti", {'Retry-After': '1'})
+
+    async def rute(self, metode, path, query, header, reader, writer):
+        bagian = path.strip('/').split('/')
+        if path == '/status' and metode == 'GET':
+            await _kirim_json(writer, 200, self.layanan.status())
+        elif path == '/pembagian' and metode == 'POST':
+            format_output = query.get('format', FORMAT_HASIL_LAYANAN)
+            if format_output not in EKSTENSI_HASIL:
+                raise GalatHTTP(400, f"Format tidak didukung: {format_output!r}")
+            # Semua parameter divalidasi sebelum folder dibuat dan body besar dibaca
+            jumlah_kb = _parameter_int(query, 'jumlah_kb', pjk.JUMLAH_KB)
+            jumlah_ks = _parameter_int(query, 'jumlah_ks', pjk.JUMLAH_KS)
+            seed = _parameter_int(query, 'seed', None)
+            if jumlah_kb < 1 or jumlah_ks < 1:
+                raise GalatHTTP(400, "jumlah_kb dan jumlah_ks harus minimal 1")
+            if self.layanan.antrian.full():
+                self.layanan.jumlah_ditolak += 1
+                raise GalatHTTP(503, "Antrian penuh, coba lagi nanti", {'Retry-After': '1'})
+            folder_id = self.layanan.folder_baru()
+            ekstensi = os.path.splitext(query.get('nama', 'roster.csv'))[1].lower() or '.csv'
+            path_roster = os.path.join(folder_id[1], 'roster' + ekstensi)
+            try:
+                await _simpan_unggahan(reader, header, path_roster)
+            except GalatHTTP:
+                shutil.rmtree(folder_id[1], ignore_errors=True)
+                raise
+            pekerjaan = self._antrikan('pembagian', folder_id, kerjakan_pembagian, folder_id[1], path_roster,
+                                       jumlah_kb, jumlah_ks, seed, format_output)
+            await _kirim_json(writer, 202, {**pekerjaan.ke_dict(), 'antrian': self.layanan.antrian.qsize()})
+        elif len(bagian) >= 2 and bagian[0] == 'pekerjaan':
+            pekerjaan = self._ambil_pekerjaan(bagian[1])
+            aksi = bagian[2] if len(bagian) > 2 else None
+            if aksi is None and metode == 'GET':
+                await _kirim_json(writer, 200, pekerjaan.ke_dict())
+            elif aksi == 'pantau' and metode == 'GET':
+                await self._pantau(pekerjaan, writer)
+            elif aksi == 'hasil' and metode == 'GET':
+                await self._kirim_hasil(pekerjaan, writer)
+            elif aksi == 'laporan' and metode == 'POST':
+                if pekerjaan.jenis != 'pembagian' or pekerjaan.status != 'selesai':
+                    raise GalatHTTP(409, "Laporan hanya untuk pekerjaan pembagian yang sudah selesai")
+                folder_id = self.layanan.folder_baru()
+                baru = self._antrikan('laporan', folder_id, kerjakan_laporan,
+                                      pekerjaan.folder, folder_id[1], self.layanan.font_dir, sumber=pekerjaan.id)
+                await _kirim_json(writer, 202, {**baru.ke_dict(), 'antrian': self.layanan.antrian.qsize()})
+            else:
+                raise GalatHTTP(405, f"{metode} {path} tidak didukung")
+        else:
+            raise GalatHTTP(404, f"Rute tidak dikenal: {path}")
+
+    async def _pantau(self, pekerjaan, writer):
+        writer.write(_kepala(200, 'application/x-ndjson'))
+        while True:
+            perubahan = pekerjaan.perubahan
+            await _kirim_potongan(writer, json.dumps(pekerjaan.ke_dict()).encode('utf-8') + b"\n")
+            if pekerjaan.status in STATUS_AKHIR:
+                break
+            await perubahan.wait()
+        await _kirim_potongan(writer, b"")
+
+    async def _kirim_hasil(self, pekerjaan, writer):
+        if pekerjaan.status != 'selesai':
+            raise GalatHTTP(409, f"Pekerjaan berstatus {pekerjaan.status}")
+        path = pekerjaan.path_hasil
+        tipe = TIPE_HASIL.get(os.path.splitext(path)[1], 'application/octet-stream')
+        writer.write(_kepala(200, tipe, {'Content-Disposition': f'attachment; filename="{os.path.basename(path)}"'},
+                             os.path.getsize(path)))
+        with open(path, 'rb') as f:
+            while data := f.read(UKURAN_POTONGAN):
+                writer.write(data)
+                await writer.drain()
+
+async def jalankan_layanan(host=HOST_LAYANAN, port=PORT_LAYANAN, siap=None, **opsi):
+    """Menjalankan layanan sampai dibatalkan; siap (asyncio.Event/threading.Event) diset setelah worker panas dan port terbuka."""
+    layanan = LayananPJK(**opsi)
+    await layanan.mulai()
+    server_pjk = ServerPJK(layanan)
+    server = await asyncio.start_server(server_pjk.tangani, host, port)
+    print(f"Layanan PJK berjalan di http://{host}:{port} ({layanan.jumlah_worker} worker, "
+          f"antrian maks {layanan.antrian.maxsize}, folder {layanan.folder_kerja})", flush=True)
+    if siap is not None:
+        siap.set()
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await server_pjk.tutup_koneksi()
+        await layanan.berhenti()
+
+# --- Bagian 4: Klien Lokal ---
+class KlienPJK:
+    """Klien urllib untuk layanan (tanpa dependensi tambahan), mis. untuk panel admin atau pengujian lokal."""
+
+    def __init__(self, url=f"http://{HOST_LAYANAN}:{PORT_LAYANAN}"):
+        self.url = url.rstrip('/')
+
+    def _minta(self, metode, path, data=None, query=None):
+        url = self.url + path + ('?' + urllib.parse.urlencode(query) if query else '')
+        return urllib.request.urlopen(urllib.request.Request(url, data=data, method=metode))
+
+    def _json(self, metode, path, data=None, query=None, coba_ulang=0):
+        """Respons JSON; saat antrian penuh (503) mencoba lagi sesuai Retry-After sampai coba_ulang kali."""
+        for percobaan in itertools.count():
+            try:
+                with self._minta(metode, path, data, query) as respons:
+                    return json.load(respons)
+            except urllib.error.HTTPError as e:
+                if e.code != 503 or percobaan >= coba_ulang:
+                    raise
+                e.close() # Lepas koneksi agar server tidak menunggu sebelum menutupnya
+                time.sleep(float(e.headers.get('Retry-After', 1)))
+
+    def kirim_pembagian(self, path_roster, jumlah_kb=pjk.JUMLAH_KB, jumlah_ks=pjk.JUMLAH_KS, seed=None,
+                        format_output=FORMAT_HASIL_LAYANAN, coba_ulang=10):
+        """Mengunggah roster dan mengantrikan pembagian; mengembalikan status awal pekerjaan (berisi id)."""
+        with open(path_roster, 'rb') as f:
+            data = f.read()
+        query = {'jumlah_kb': jumlah_kb, 'jumlah_ks': jumlah_ks, 'format': format_output, 'nama': os.path.basename(path_roster)}
+        if seed is not None:
+            query['seed'] = seed
+        return self._json('POST', '/pembagian', data, query, coba_ulang)
+
+    def minta_laporan(self, id_pekerjaan, coba_ulang=10):
+        return self._json('POST', f"/pekerjaan/{id_pekerjaan}/laporan", coba_ulang=coba_ulang)
+
+    def status(self, id_pekerjaan=None):
+        return self._json('GET', f"/pekerjaan/{id_pekerjaan}" if id_pekerjaan else '/status')
+
+    def pantau(self, id_pekerjaan):
+        """Generator status pekerjaan (NDJSON) sampai selesai/gagal."""
+        with self._minta('GET', f"/pekerjaan/{id_pekerjaan}/pantau") as respons:
+            for baris in respons:
+                yield json.loads(baris)
+
+    def tunggu(self, id_pekerjaan):
+        for status in self.pantau(id_pekerjaan):
+            pass
+        return status
+
+    def unduh_hasil(self, id_pekerjaan, path):
+        with self._minta('GET', f"/pekerjaan/{id_pekerjaan}/hasil") as respons, open(path, 'wb') as f:
+            shutil.copyfileobj(respons, f, UKURAN_POTONGAN)
+        return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Layanan HTTP lokal untuk pembagian kelompok dan laporan PDF PJK.")
+    parser.add_argument('--host', default=HOST_LAYANAN)
+    parser.add_argument('--port', type=int, default=PORT_LAYANAN)
+    parser.add_argument('--worker', type=int, default=JUMLAH_WORKER_LAYANAN)
+    parser.add_argument('--antrian', type=int, default=UKURAN_ANTRIAN, help="Maksimal pekerjaan menunggu")
+    parser.add_argument('--folder', default=FOLDER_KERJA_LAYANAN, help="Folder kerja (default: folder sementara, dihapus saat berhenti)")
+    parser.add_argument('--font-dir', default=None, help="Folder font DejaVu untuk PDF (default: FONT_DIR laporan_pdf)")
+    args = parser.parse_args()
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(jalankan_layanan(args.host, args.port, jumlah_worker=args.worker, ukuran_antrian=args.antrian,
+                                     folder_kerja=args.folder, font_dir=args.font_dir))
@@ -0,0 +1,183 @@
+import argparse
+import asyncio
+import glob
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+
+import dashboard_pjk as pjk
+import layanan_pjk
+from layanan_pjk import KlienPJK, jalankan_layanan
+
+# --- Konfigurasi Uji ---
+JUMLAH_MAHASISWA_UJI = 100_000 # Cukup besar agar pekerjaan masih berjalan saat antrian dibanjiri
+JUMLAH_KB_UJI = 5
+JUMLAH_KS_UJI = 10
+SEED_UJI = 7
+JUMLAH_BANJIR = 8 # Pengajuan beruntun tanpa coba ulang; > worker + antrian
+BATAS_WAKTU_SIAP = 60 # Detik menunggu worker panas & port terbuka
+
+# --- Layanan di Thread Latar ---
+def _port_bebas(host):
+    with socket.socket() as s:
+        s.bind((host, 0))
+        return s.getsockname()[1]
+
+class LayananLatar:
+    """jalankan_layanan di event loop thread terpisah; dipakai sebagai context manager."""
+
+    def __init__(self, host='127.0.0.1', **opsi):
+        self.host = host
+        self.port = _port_bebas(host)
+        self.opsi = opsi
+        self.loop = asyncio.new_event_loop()
+        self.siap = threading.Event()
+        self.tugas = None
+        self.thread = threading.Thread(target=self._jalankan, daemon=True)
+
+    def _jalankan(self):
+        asyncio.set_event_loop(self.loop)
+        self.tugas = self.loop.create_task(jalankan_layanan(self.host, self.port, siap=self.siap, **self.opsi))
+        try:
+            self.loop.run_until_complete(self.tugas)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.loop.close()
+
+    def __enter__(self):
+        self.thread.start()
+        if not self.siap.wait(BATAS_WAKTU_SIAP):
+            raise RuntimeError("Layanan tidak siap dalam batas waktu")
+        return KlienPJK(f"http://{self.host}:{self.port}")
+
+    def __exit__(self, *exc):
+        self.loop.call_soon_threadsafe(self.tugas.cancel)
+        self.thread.join()
+
+def _folder_kerja_sementara():
+    """Folder kerja mkdtemp milik layanan yang ada di folder temp sistem saat ini."""
+    return set(glob.glob(os.path.join(tempfile.gettempdir(), 'layanan_pjk_*')))
+
+def _kirim_mentah(host, port, data):
+    """Mengirim bytes apa adanya (untuk request rusak); mengembalikan baris status respons."""
+    with socket.create_connection((host, port), timeout=10) as s:
+        s.sendall(data)
+        return s.makefile('rb').readline().decode('latin-1').strip()
+
+# --- Skenario ---
+def uji_layanan(font_dir=None):
+    """Unggah + pantau + unduh, status layanan, 503 + Retry-After saat antrian penuh, laporan PDF, dan request rusak."""
+    with tempfile.TemporaryDirectory() as folder:
+        path_roster = os.path.join(folder, 'roster.csv')
+        df = pjk.buat_data_dummy_massal(JUMLAH_MAHASISWA_UJI, rng=SEED_UJI)
+        pjk.tulis_tabel([('Sheet1', df)], path_roster)
+        sebelum = _folder_kerja_sementara()
+        layanan = LayananLatar(jumlah_worker=1, ukuran_antrian=1, font_dir=font_dir)
+        with layanan as klien:
+            folder_kerja = _folder_kerja_sementara() - sebelum
+            assert len(folder_kerja) == 1, folder_kerja
+
+            # 1. Kirim pembagian, pantau status sampai selesai, unduh hasil
+            awal = klien.kirim_pembagian(path_roster, JUMLAH_KB_UJI, JUMLAH_KS_UJI, seed=SEED_UJI)
+            assert awal['status'] == 'antri', awal
+            riwayat = [s['status'] for s in klien.pantau(awal['id'])]
+            assert riwayat[-1] == 'selesai', riwayat
+            info = klien.status(awal['id'])
+            assert info['ringkasan']['jumlah_mahasiswa'] == JUMLAH_MAHASISWA_UJI, info
+            assert sum(info['ringkasan']['ukuran_kb'].values()) == JUMLAH_MAHASISWA_UJI, info
+            path_hasil = klien.unduh_hasil(awal['id'], os.path.join(folder, 'hasil.csv'))
+            df_hasil = pjk.baca_hasil_pembagian(path_hasil)
+            assert len(df_hasil) == JUMLAH_MAHASISWA_UJI
+            assert int(df_hasil[pjk.KOLOM_KB_OUTPUT].max()) == JUMLAH_KB_UJI
+            print(f"[ok] pembagian {awal['id']}: {' -> '.join(riwayat)}, hasil {os.path.getsize(path_hasil)} byte")
+
+            # 2. Banjiri antrian (1 worker, antrian 1): sebagian harus ditolak 503 dengan Retry-After
+            diterima, ditolak = [], []
+            for i in range(JUMLAH_BANJIR):
+                try:
+                    diterima.append(klien.kirim_pembagian(path_roster, JUMLAH_KB_UJI, JUMLAH_KS_UJI, seed=i, coba_ulang=0)['id'])
+                except urllib.error.HTTPError as e:
+                    assert e.code == 503, e.code
+                    assert e.headers.get('Retry-After'), dict(e.headers)
+                    ditolak.append(e.headers['Retry-After'])
+                    e.close()
+            assert ditolak, "Antrian penuh seharusnya ditolak 503"
+            for id_pekerjaan in diterima:
+                assert klien.tunggu(id_pekerjaan)['status'] == 'selesai'
+            jumlah_pembagian = 1 + len(diterima)
+            print(f"[ok] backpressure: {len(diterima)} diterima, {len(ditolak)} ditolak 503 (Retry-After {ditolak[0]})")
+
+            # 3. Pekerjaan yang tidak dikenal
+            try:
+                klien.status('tidak-ada')
+                raise AssertionError("Pekerjaan tidak dikenal seharusnya 404")
+            except urllib.error.HTTPError as e:
+                assert e.code == 404, e.code
+                e.close()
+
+            # 4. Laporan PDF dari pekerjaan pembagian pertama (dilewati jika fpdf tidak terpasang)
+            try:
+                pjk._modul_laporan()
+            except ImportError as e:
+                print(f"[lewati] laporan PDF: {e}")
+            else:
+                laporan = klien.minta_laporan(awal['id'])
+                # Riwayat dibatasi 1: pengajuan berikut memicu eviksi, tetapi folder sumber laporan yang
+                # belum selesai tidak boleh dihapus
+                batas_lama, layanan_pjk.JUMLAH_PEKERJAAN_DISIMPAN = layanan_pjk.JUMLAH_PEKERJAAN_DISIMPAN, 1
+                try:
+                    pemicu = klien.kirim_pembagian(path_roster, JUMLAH_KB_UJI, JUMLAH_KS_UJI, seed=SEED_UJI)
+                    jumlah_pembagian += 1
+                    assert klien.status(awal['id'])['status'] == 'selesai'
+                    akhir = klien.tunggu(laporan['id'])
+                    assert akhir['status'] == 'selesai', akhir
+                    assert klien.tunggu(pemicu['id'])['status'] == 'selesai'
+                finally:
+                    layanan_pjk.JUMLAH_PEKERJAAN_DISIMPAN = batas_lama
+                path_pdf = klien.unduh_hasil(laporan['id'], os.path.join(folder, 'laporan.pdf'))
+                with open(path_pdf, 'rb') as f:
+                    assert f.read(5) == b'%PDF-'
+                print(f"[ok] laporan {laporan['id']}: {os.path.getsize(path_pdf)} byte")
+
+            # 5. Request rusak dijawab 400, bukan koneksi terputus
+            status = _kirim_mentah(layanan.host, layanan.port, b"POST /pembagian HTTP/1.1\r\nContent-Length: abc\r\n\r\n")
+            assert status.startswith('HTTP/1.1 400'), status
+            status = _kirim_mentah(layanan.host, layanan.port, b"SAMPAH\r\n\r\n")
+            assert status.startswith('HTTP/1.1 400'), status
+            folder_layanan = next(iter(folder_kerja))
+            isi_sebelum = set(os.listdir(folder_layanan))
+            try:
+                klien.kirim_pembagian(path_roster, seed='abc')
+                raise AssertionError("Parameter tidak valid seharusnya 400")
+            except urllib.error.HTTPError as e:
+                assert e.code == 400, e.code
+                e.close()
+            assert set(os.listdir(folder_layanan)) == isi_sebelum, "Parameter tidak valid tidak boleh meninggalkan folder"
+            print("[ok] request rusak -> 400")
+
+            # 6. Status layanan: kedalaman antrian & latensi per jenis
+            ringkas = klien.status()
+            assert ringkas['antrian'] == 0 and ringkas['berjalan'] == 0, ringkas
+            assert ringkas['ditolak'] == len(ditolak), ringkas
+            assert ringkas['latensi']['pembagian']['jumlah'] == jumlah_pembagian, ringkas
+            print(f"[ok] status: {ringkas['selesai']} selesai, p95 pembagian {ringkas['latensi']['pembagian']['p95']:.2f}s")
+
+        # 7. Folder kerja sementara dihapus saat layanan berhenti
+        assert not any(os.path.exists(f) for f in folder_kerja), folder_kerja
+        print("[ok] folder kerja sementara dihapus")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Uji asap layanan_pjk.py dengan KlienPJK (layanan dijalankan lokal di port bebas).")
+    parser.add_argument('--font-dir', default=None, help="Folder font DejaVu untuk PDF (default: FONT_DIR laporan_pdf)")
+    args = parser.parse_args()
+    mulai = time.perf_counter()
+    kode = uji_layanan(args.font_dir)
+    print(f"Semua skenario lulus dalam {time.perf_counter() - mulai:.1f} detik.")
+    sys.exit(kode)
@@ -0,0 +1,980 @@
+import copy
+import datetime
+import functools
+import hashlib
+import inspect
+import io
+import json
+import os # To check font file existence
+import pickle
+import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from itertools import accumulate
+from typing import Callable, List, Optional, Sequence, Union
+
+from fontTools import ttLib
+from fpdf import FPDF, FPDF_VERSION
+from fpdf.enums import XPos, YPos # Import for deprecation fix
+from fpdf.font_type_3 import get_color_font_object
+from fpdf.fonts import CoreFont, SubsetMap, TTFFont
+from fpdf.output import OutputProducer
+from fpdf.syntax import Name, PDFContentStream, PDFObject
+
+# --- PDF Generation ---
+
+# Define font file paths (assuming they are in the same directory)
+FONT_DIR = "" # Leave empty if in same dir, otherwise set path e.g., "fonts/"
+DEJAVU_FILES = {
+    '': "DejaVuSans.ttf",
+    'B': "DejaVuSans-Bold.ttf",
+    'I': "DejaVuSans-Oblique.ttf", # Or DejaVuSans-Italic.ttf
+    'BI': "DejaVuSans-BoldOblique.ttf", # Or DejaVuSans-BoldItalic.ttf
+}
+DEJAVU_REGULAR = os.path.join(FONT_DIR, DEJAVU_FILES[''])
+DEJAVU_BOLD = os.path.join(FONT_DIR, DEJAVU_FILES['B'])
+DEJAVU_ITALIC = os.path.join(FONT_DIR, DEJAVU_FILES['I'])
+DEJAVU_BOLD_ITALIC = os.path.join(FONT_DIR, DEJAVU_FILES['BI'])
+
+# Default font family in case DejaVu is not found
+DEFAULT_FONT_FAMILY = 'Helvetica'
+
+# Folder cache pickle metrik font (None = hanya cache di memori). Hanya arahkan ke folder tepercaya:
+# pickle dimuat apa adanya.
+FONT_CACHE_DIR = None
+
+# --- Kompatibilitas fpdf2 ---
+# Jalur cepat modul ini (font bersama, output streaming, teks rata dan tabel cepat) memakai bagian
+# privat fpdf2 yang diuji pada versi di bawah. Ketersediaannya diperiksa sekali saat pertama dipakai;
+# yang tidak ada di versi terpasang kembali ke API publik (add_font, multi_cell, print_table, output)
+# alih-alih gagal dengan AttributeError atau menghasilkan PDF rusak.
+VERSI_FPDF_TERUJI = '2.8.9'
+
+def _punya(objek, *nama):
+    return all(hasattr(objek, n) for n in nama)
+
+@functools.lru_cache(maxsize=None)
+def fitur_fpdf():
+    """Dict fitur -> bool untuk jalur cepat yang bergantung pada internal fpdf2 versi terpasang."""
+    pdf = FPDF()
+    pdf.add_page()
+    halaman = pdf.pages.get(1)
+    set_font_halaman = getattr(pdf, '_set_font_for_page', None)
+    return {
+        # text_rata, print_tabel_cepat: perintah konten mentah + font per halaman
+        'konten_mentah': (_punya(pdf, '_out', 'current_font_is_set_on_page') and set_font_halaman is not None
+                          and 'wrap_in_text_object' in inspect.signature(set_font_halaman).parameters
+                          and _punya(TTFFont, 'encode_text', 'cw') and _punya(CoreFont, 'encode_text', 'cw')),
+        # PDF(streaming=True): spool isi halaman + OutputProducer yang menulis objek demi objek
+        'streaming': ('output_producer_class' in inspect.signature(FPDF.output).parameters and _punya(OutputProducer, '_add_pages') and _punya(PDFContentStream, '_COMPRESSION_LEVEL', 'serialize')
+                      and isinstance(getattr(halaman, 'contents', None), bytearray)
+                      and _punya(halaman, 'index', 'get_text_substitutions')),
+        # RegistriFont.pasang: TTFFont dirakit dari atribut hasil parsing bersama
+        'font_bersama': _punya(pdf, '_set_min_pdf_version', 'render_color_fonts', 'fonts'),
+    }
+
+# --- Registri Font ---
+# Atribut TTFFont yang murni hasil parsing file font dan aman dibagi antar dokumen.
+# Atribut lain (nomor font, subset, glyph hilang, objek fontTools) dibuat baru per dokumen
+# karena fpdf mengubahnya saat menulis PDF (subsetting dilakukan in-place pada ttfont).
+_ATRIBUT_FONT_BERSAMA = (
+    'type', 'name', 'glyph_ids', 'sp', 'ss', 'up', 'ut', 'cw', 'emphasis', 'scale', 'cmap',
+    'palette_index', 'is_compressed', 'is_cff', 'is_cid_keyed', 'is_symbol', 'cff_ros', 'collection_font_number',
+)
+_ATRIBUT_FONT_PER_DOKUMEN = (
+    'desc', 'i', 'fontkey', 'ttffile', 'ttfont', '_hbfont', 'biggest_size_pt', 'missing_glyphs', 'subset', 'color_font',
+)
+
+def _atribut_terisi(font):
+    """Nama slot TTFFont yang terisi setelah konstruktor fpdf selesai."""
+    slot = [nama for kelas in type(font).__mro__ for nama in getattr(kelas, '__slots__', ())]
+    return {nama for nama in slot if hasattr(font, nama)}
+
+@dataclass
+class FontTerurai:
+    """Hasil parsing satu file TTF: isi file mentah + metrik/tabel glyph yang dipakai fpdf."""
+    data: bytes
+    atribut: dict
+    desc: object # PDFFontDescriptor, disalin per dokumen karena fpdf memberinya id objek
+
+    def __getstate__(self):
+        atribut = dict(self.atribut, cw=dict(self.atribut['cw'])) # defaultdict(lambda) tidak bisa di-pickle
+        return {'atribut': atribut, 'desc': self.desc} # Isi file dibaca ulang dari path saat dimuat
+
+    def __setstate__(self, state):
+        self.data = b''
+        self.desc = state['desc']
+        lebar_default = self.desc.missing_width
+        self.atribut = dict(state['atribut'], cw=defaultdict(lambda: lebar_default, state['atribut']['cw']))
+
+class RegistriFont:
+    """Cache font TTF se-proses: setiap file diparsing sekali per (path, mtime, style).
+
+    Metrik dan tabel glyph dibagi ke setiap PDF baru; yang dibuat per dokumen hanya objek fontTools
+    (lazy, dari bytes di memori) dan peta subset. Dengan cache_dir, hasil parsing juga disimpan
+    sebagai pickle agar proses baru tidak perlu memparsing ulang.
+    """
+
+    def __init__(self, cache_dir=FONT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._font = {}
+        self._kunci = threading.Lock()
+        self.parsing = 0 # Jumlah file yang benar-benar diparsing (untuk pemantauan)
+
+    def _kunci_font(self, path, style):
+        path = os.path.abspath(path)
+        return path, os.stat(path).st_mtime_ns, style, FPDF_VERSION # Pickle dari versi fpdf lain tidak dipakai
+
+    def _path_pickle(self, kunci):
+        nama = hashlib.sha1(repr(kunci).encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"font-{nama}.pkl")
+
+    def _parse(self, kunci):
+        path, _, style, _ = kunci
+        if not fitur_fpdf()['font_bersama']:
+            return None
+        with open(path, 'rb') as f:
+            data = f.read()
+        font = TTFFont(FPDF(), path, 'parse', style)
+        if _atribut_terisi(font) != set(_ATRIBUT_FONT_BERSAMA + _ATRIBUT_FONT_PER_DOKUMEN):
+            return None # Susunan atribut TTFFont berbeda dari versi teruji; pakai add_font biasa
+        if 'glyf' in font.ttfont and '.notdef' not in font.ttfont['glyf']:
+            return None # fpdf menambal glyph .notdef di ttfont; tidak bisa dibagi, pakai add_font biasa
+        self.parsing += 1
+        return FontTerurai(data, {nama: getattr(font, nama) for nama in _ATRIBUT_FONT_BERSAMA}, font.desc)
+
+    def ambil(self, path, style=''):
+        """FontTerurai untuk file font (diparsing sekali), atau None jika font tidak bisa dibagi."""
+        kunci = self._kunci_font(path, style)
+        with self._kunci:
+            if kunci in self._font:
+                return self._font[kunci]
+            terurai = None
+            if self.cache_dir:
+                try:
+                    with open(self._path_pickle(kunci), 'rb') as f:
+                        terurai = pickle.load(f)
+                    with open(kunci[0], 'rb') as f:
+                        terurai.data = f.read()
+                except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+                    terurai = None
+            if terurai is None:
+                terurai = self._parse(kunci)
+                if terurai is not None and self.cache_dir:
+                    os.makedirs(self.cache_dir, exist_ok=True)
+                    with berkas_atomik(self._path_pickle(kunci)) as f: # Nama sementara unik: aman untuk proses paralel
+                        pickle.dump(terurai, f, protocol=pickle.HIGHEST_PROTOCOL)
+            self._font[kunci] = terurai
+            return terurai
+
+    def pasang(self, pdf, family, style, path):
+        """Pengganti pdf.add_font(family, style, path) yang memakai hasil parsing dari registri."""
+        style = ''.join(sorted(style.upper()))
+        terurai = self.ambil(path, style)
+        fontkey = f"{family.lower()}{style}"
+        if terurai is None or fontkey in pdf.fonts:
+            pdf.add_font(family, style, path)
+            return
+        font = object.__new__(TTFFont)
+        for nama, nilai in terurai.atribut.items():
+            setattr(font, nama, nilai)
+        font.desc = copy.copy(terurai.desc)
+        font.i = len(pdf.fonts) + 1
+        font.fontkey = fontkey
+        font.ttffile = os.path.abspath(path)
+        font.ttfont = ttLib.TTFont(io.BytesIO(terurai.data), recalcTimestamp=False,
+                                   fontNumber=font.collection_font_number, lazy=True)
+        font._hbfont = None
+        font.biggest_size_pt = 0
+        font.missing_glyphs = []
+        font.subset = SubsetMap(font)
+        font.color_font = get_color_font_object(pdf, font, font.palette_index) if pdf.render_color_fonts else None
+        pdf.fonts[fontkey] = font
+        if font.is_cff and font.is_cid_keyed:
+            pdf._set_min_pdf_version("1.6")
+
+    def kosongkan(self):
+        with self._kunci:
+            self._font.clear()
+
+REGISTRI_FONT = RegistriFont() # Dipakai bersama oleh semua ReportBuilder di proses ini
+
+# --- Output Streaming ---
+@contextmanager
+def berkas_atomik(path):
+    """Berkas sementara di folder yang sama yang baru di-os.replace ke path setelah selesai ditulis,
+    sehingga file yang belum lengkap tidak pernah terlihat dengan nama akhirnya."""
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, path_sementara = tempfile.mkstemp(dir=folder, prefix='.' + os.path.basename(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path_sementara, path)
+    except BaseException:
+        if os.path.exists(path_sementara):
+            os.remove(path_sementara)
+        raise
+
+class BufferBerkas:
+    """Pengganti bytearray OutputProducer.buffer: data langsung ditulis ke berkas,
+    yang disimpan hanya panjang (untuk offset xref) dan hash md5 (untuk /ID trailer)."""
+
+    def __init__(self, berkas):
+        self.berkas = berkas
+        self.panjang = 0
+        self.hash = hashlib.md5(usedforsecurity=False)
+
+    def __iadd__(self, data):
+        self.berkas.write(data)
+        self.panjang += len(data)
+        self.hash.update(data)
+        return self
+
+    def __len__(self):
+        return self.panjang
+
+class KontenSpool(PDFContentStream):
+    """Content stream halaman yang isinya baru dibaca dari spool (dan dikompres) saat diserialisasi."""
+
+    def __init__(self, spool, posisi, panjang, substitusi, jumlah_halaman, compress):
+        PDFObject.__init__(self)
+        self._spool = spool
+        self._posisi = posisi
+        self._panjang = panjang
+        self._substitusi = substitusi
+        self._jumlah_halaman = str(jumlah_halaman)
+        self._compress = compress
+        self._contents = b''
+        self.filter = Name("FlateDecode") if compress else None
+        self.length = 0
+
+    def serialize(self, obj_dict=None, _security_handler=None):
+        self._spool.seek(self._posisi)
+        konten = self._spool.read(self._panjang)
+        for item in self._substitusi: # Substitusi {nb} yang dilewati output() karena halaman sudah di-spool
+            konten = konten.replace(item.get_placeholder_string().encode('latin-1'),
+                                    item.render_text_substitution(self._jumlah_halaman).encode('latin-1'))
+        self._contents = zlib.compress(konten, level=self._COMPRESSION_LEVEL) if self._compress else konten
+        self.length = len(self._contents)
+        try:
+            return super().serialize(obj_dict, _security_handler)
+        finally:
+            self._contents = b''
+
+class ProdusenStreaming(OutputProducer):
+    """OutputProducer yang menulis setiap objek PDF langsung ke pdf.berkas_stream, bukan ke satu buffer."""
+
+    def __init__(self, fpdf):
+        super().__init__(fpdf)
+        self.buffer = fpdf.berkas_stream
+
+    def _add_pages(self, _slice=slice(0, None)):
+        page_objs = super()._add_pages(_slice)
+        indeks_obj = {id(obj): i for i, obj in enumerate(self.pdf_objs)}
+        for page_obj in page_objs:
+            posisi = self.fpdf.halaman_spool.get(page_obj.index())
+            if posisi is None:
+                continue
+            konten = KontenSpool(self.fpdf.spool, *posisi, page_obj.get_text_substitutions(),
+                                 self.fpdf.pages_count, self.fpdf.compress)
+            konten.id = page_obj.contents.id
+            self.pdf_objs[indeks_obj[id(page_obj.contents)]] = konten
+            page_obj.contents = konten
+        return page_objs
+
+class PDF(FPDF):
+    def __init__(self, font_family=DEFAULT_FONT_FAMILY, report_title="", streaming=False, **kwargs):
+        super().__init__(**kwargs)
+        self.font_family = font_family
+        self.report_title = report_title
+        self.font_tertunda = {} # fontkey -> (registri, family, style, path); dipasang saat pertama dipakai
+        # Mode streaming: halaman yang selesai dipindah ke spool di disk, PDF ditulis dengan output_streaming().
+        # Tanpa internal fpdf yang dibutuhkan, halaman tetap di memori dan output_streaming() menulis hasil output().
+        self.spool = tempfile.TemporaryFile() if streaming and fitur_fpdf()['streaming'] else None
+        self.halaman_spool = {} # nomor halaman -> (posisi, panjang) di spool
+        self.berkas_stream = None # BufferBerkas selama output_streaming()
+        self.cache_tata_letak = CACHE_TATA_LETAK
+
+    def add_page(self, *args, **kwargs):
+        super().add_page(*args, **kwargs)
+        if self.spool is not None and self.page > 1:
+            self._spool_halaman(self.page - 1) # Footer halaman sebelumnya sudah digambar oleh add_page
+
+    def _spool_halaman(self, nomor):
+        halaman = self.pages[nomor]
+        if nomor in self.halaman_spool or not halaman.contents:
+            return
+        self.spool.seek(0, os.SEEK_END)
+        self.halaman_spool[nomor] = (self.spool.tell(), len(halaman.contents))
+        self.spool.write(halaman.contents)
+        halaman.contents = bytearray()
+
+    def file_id(self):
+        if self.berkas_stream is not None: # Sama dengan _default_file_id, dari hash data yang sudah ditulis
+            id_hash = self.berkas_stream.hash.copy()
+            if self.creation_date:
+                id_hash.update(self.creation_date.strftime("%Y%m%d%H%M%S").encode("utf8"))
+            hash_hex = id_hash.hexdigest().upper()
+            return f"<{hash_hex}><{hash_hex}>"
+        return -1
+
+    def output(self, *args, **kwargs):
+        if self.halaman_spool and self.berkas_stream is None:
+            raise ValueError("Halaman PDF streaming sudah dipindah ke spool; tulis dengan output_streaming(path).")
+        return super().output(*args, **kwargs)
+
+    def output_streaming(self, path):
+        """Menulis PDF ke path objek demi objek (tanpa buffer seluruh dokumen), atomik lewat file sementara.
+
+        Dipakai bersama PDF(streaming=True), sehingga memori puncak dibatasi beberapa halaman.
+        """
+        if self._sign_key:
+            raise ValueError("Output streaming tidak mendukung tanda tangan digital; gunakan output().")
+        if not fitur_fpdf()['streaming']:
+            return tulis_atomik(path, bytes(self.output()))
+        try:
+            with berkas_atomik(path) as berkas:
+                self.berkas_stream = BufferBerkas(berkas)
+                self.output(output_producer_class=ProdusenStreaming)
+        finally:
+            self.berkas_stream = None
+            if self.spool is not None:
+                self.spool.close()
+        return path
+
+    def set_font(self, family=None, style='', size=0):
+        # Font yang tidak pernah dipakai tidak dipasang, sehingga tidak ikut di-subset dan di-embed
+        if self.font_tertunda:
+            style_font = ''.join(sorted(c for c in str(getattr(style, 'style', style)).upper() if c in 'BI'))
+            tertunda = self.font_tertunda.pop((family or self.font_family).lower() + style_font, None)
+            if tertunda:
+                registri, family_font, style_font, path = tertunda
+                registri.pasang(self, family_font, style_font, path)
+        super().set_font(family, style, size)
+
+    def header(self):
+        self.set_font(self.font_family, 'B', 12)
+        # Judul Laporan
+        self.cell(0, 10, self.report_title, border=0, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
+        self.ln(5)
+
+    def footer(self):
+        self.set_y(-15)
+        self.set_font(self.font_family, 'I', 8)
+        # Nomor Halaman ({nb} diganti total halaman saat output, lihat alias_nb_pages)
+        self.cell(0, 10, f'Halaman {self.page_no()}/{self.str_alias_nb_pages}', border=0, align='C')
+
+def print_section_title(pdf, title):
+    pdf.set_font(pdf.font_family, 'B', 14)
+    pdf.cell(0, 10, title, border=0, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='L')
+    pdf.ln(2)
+
+def print_heading(pdf, heading):
+    pdf.set_font(pdf.font_family, 'B', 12)
+    print_teks(pdf, heading, 6, align='L')
+    pdf.ln(1)
+
+def print_paragraph(pdf, text):
+    pdf.set_font(pdf.font_family, '', 11)
+    print_teks(pdf, text.strip(), 5, align='J') # Justified text
+    pdf.ln(3)
+
+def print_list(pdf, intro_text, items):
+    if intro_text:
+        pdf.set_font(pdf.font_family, 'I', 11) # Italic for intro
+        print_teks(pdf, intro_text.strip(), 5, align='L')
+        pdf.ln(1)
+    pdf.set_font(pdf.font_family, '', 11)
+    for item in items:
+        # Ganti align='J' menjadi align='L' untuk memperbaiki error
+        print_teks(pdf, f'  • {item.strip()}', 5, align='L')
+    pdf.ln(3)
+
+class LebarGlyph(dict):
+    """Tabel karakter -> lebar glyph (1/1000 em) untuk satu font, diisi sekali per karakter dari cw fpdf."""
+    def __init__(self, font):
+        super().__init__()
+        self.cw = font.cw
+        self.ttf = not isinstance(font, CoreFont) # cw TTF diindeks kode karakter, cw core font diindeks karakter
+
+    def __missing__(self, karakter):
+        lebar = self.cw[ord(karakter)] if self.ttf else self.cw.get(karakter, 0)
+        self[karakter] = lebar
+        return lebar
+
+    def lebar(self, teks):
+        return sum(map(self.__getitem__, teks))
+
+_CACHE_LEBAR_GLYPH = {} # id(cw) -> LebarGlyph, dipakai ulang lintas tabel dan dokumen
+
+def lebar_glyph(pdf):
+    """LebarGlyph untuk font aktif pdf (dibuat sekali per font)."""
+    font = pdf.current_font
+    tabel = _CACHE_LEBAR_GLYPH.get(id(font.cw))
+    if tabel is None or tabel.cw is not font.cw:
+        tabel = _CACHE_LEBAR_GLYPH[id(font.cw)] = LebarGlyph(font)
+    return tabel
+
+def bungkus_teks(teks, lebar_maks, glyph, skala):
+    """Memecah teks menjadi baris-baris yang muat di lebar_maks (satuan user), seperti word-wrap multi_cell."""
+    batas = lebar_maks / skala # Dalam satuan glyph agar tidak perlu mengalikan tiap kata
+    lebar_spasi = glyph[' ']
+    hasil = []
+    for paragraf in teks.split('\n'):
+        baris, lebar_baris = [], 0
+        for kata in paragraf.split(' '):
+            lebar_kata = glyph.lebar(kata)
+            if lebar_kata > batas: # Kata lebih panjang dari kolom: pecah per karakter
+                if baris:
+                    hasil.append(' '.join(baris))
+                potongan, lebar_potongan = '', 0
+                for karakter in kata:
+                    if potongan and lebar_potongan + glyph[karakter] > batas:
+                        hasil.append(potongan)
+                        potongan, lebar_potongan = '', 0
+                    potongan += karakter
+                    lebar_potongan += glyph[karakter]
+                baris, lebar_baris = [potongan], lebar_potongan
+            elif baris and lebar_baris + lebar_spasi + lebar_kata > batas:
+                hasil.append(' '.join(baris))
+                baris, lebar_baris = [kata], lebar_kata
+            else:
+                lebar_baris += lebar_kata + (lebar_spasi if baris else 0)
+                baris.append(kata)
+        hasil.append(' '.join(baris))
+    return hasil
+
+# --- Cache Tata Letak Teks ---
+UKURAN_CACHE_TATA_LETAK = 1024 # Jumlah blok teks yang pemecahan barisnya disimpan di memori
+FOLDER_CACHE_TATA_LETAK = None # Folder JSON hasil tata letak agar dipakai lintas proses; None = hanya memori
+
+class CacheTataLetak:
+    """Cache LRU pemecahan baris teks, dikunci hash (teks, font, style, ukuran, lebar kolom, perataan).
+
+    Teks statis (pendahuluan, metodologi, daftar pustaka) cukup diukur dan dibungkus sekali;
+    render berikutnya langsung memakai baris yang tersimpan. hit/hit_disk/miss dapat dipantau.
+    """
+
+    def __init__(self, ukuran_maks=UKURAN_CACHE_TATA_LETAK, folder=FOLDER_CACHE_TATA_LETAK):
+        self.ukuran_maks = ukuran_maks
+        self.folder = folder
+        self._entri = OrderedDict()
+        self._kunci = threading.Lock()
+        self.hit = 0
+        self.hit_disk = 0
+        self.miss = 0
+
+    @staticmethod
+    def kunci(pdf, teks, lebar, align):
+        font = pdf.current_font
+        data = '\x00'.join([font.name, pdf.font_style, f"{pdf.font_size_pt:.3f}", f"{lebar:.3f}", align, teks])
+        return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+    def _simpan(self, kunci, baris):
+        with self._kunci:
+            self._entri[kunci] = baris
+            self._entri.move_to_end(kunci)
+            while len(self._entri) > self.ukuran_maks:
+                self._entri.popitem(last=False)
+
+    def ambil(self, kunci, hitung):
+        """Baris tersimpan untuk kunci; jika belum ada, hitung() dipanggil dan hasilnya disimpan."""
+        with self._kunci:
+            baris = self._entri.get(kunci)
+            if baris is not None:
+                self._entri.move_to_end(kunci)
+                self.hit += 1
+                return baris
+        path = os.path.join(self.folder, f"{kunci}.json") if self.folder else None
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    baris = [tuple(b) for b in json.load(f)]
+            except (OSError, ValueError):
+                baris = None
+            if baris is not None:
+                self.hit_disk += 1
+                self._simpan(kunci, baris)
+                return baris
+        baris = hitung()
+        self.miss += 1
+        self._simpan(kunci, baris)
+        if path:
+            os.makedirs(self.folder, exist_ok=True)
+            tulis_atomik(path, json.dumps(baris, ensure_ascii=False).encode('utf-8'))
+        return baris
+
+    def statistik(self):
+        return {'hit': self.hit, 'hit_disk': self.hit_disk, 'miss': self.miss, 'entri': len(self._entri)}
+
+    def kosongkan(self):
+        with self._kunci:
+            self._entri.clear()
+
+CACHE_TATA_LETAK = CacheTataLetak() # Dipakai bersama oleh semua PDF di proses ini
+
+def tata_baris(teks, lebar_maks, glyph, skala, align):
+    """Daftar (baris, diratakan); seperti multi_cell align='J', baris terakhir tiap paragraf tidak diratakan."""
+    hasil = []
+    for paragraf in teks.split('\n'):
+        baris = bungkus_teks(paragraf, lebar_maks, glyph, skala)
+        hasil += [(b, align == 'J' and i < len(baris) - 1) for i, b in enumerate(baris)]
+    return hasil
+
+def text_rata(pdf, x, y, baris, sisa):
+    """Seperti pdf.text, tetapi sisa lebar dibagi ke setiap spasi lewat penyesuaian TJ (cara multi_cell
+    meratakan teks), sehingga satu baris tetap satu string saat teks PDF disalin/diekstrak."""
+    font = pdf.current_font
+    kata = pdf.normalize_text(baris).split(' ')
+    geser = -(sisa / (len(kata) - 1)) * pdf.k * 1000 / pdf.font_size_pt
+    # encode_text menghasilkan '(...) Tj'; yang dipakai hanya string PDF-nya
+    bagian = [font.encode_text(kata[0])[:-3]] + [f"{geser:.3f}{font.encode_text(' ' + k)[:-3]}" for k in kata[1:]]
+    if not pdf.current_font_is_set_on_page:
+        pdf._out(pdf._set_font_for_page(font, pdf.font_size_pt))
+    perintah = f"BT {x * pdf.k:.2f} {(pdf.h - y) * pdf.k:.2f} Td [{' '.join(bagian)}] TJ ET"
+    if pdf.fill_color != pdf.text_color:
+        perintah = f"q {pdf.text_color.serialize().lower()} {perintah} Q"
+    pdf._out(perintah)
+
+def print_teks(pdf, teks, h, align='L'):
+    """Pengganti multi_cell(0, h, teks, align) untuk perataan 'L'/'J' dengan pemecahan baris dari cache."""
+    if not fitur_fpdf()['konten_mentah']:
+        pdf.multi_cell(0, h, teks, border=0, align=align, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        return
+    x = pdf.get_x()
+    lebar = pdf.w - pdf.r_margin - x - 2 * pdf.c_margin
+    glyph = lebar_glyph(pdf)
+    skala = pdf.font_size_pt * 0.001 / pdf.k
+    kunci = CacheTataLetak.kunci(pdf, teks, lebar, align)
+    baris_teks = pdf.cache_tata_letak.ambil(kunci, lambda: tata_baris(teks, lebar, glyph, skala, align))
+    x_teks = x + pdf.c_margin
+    for baris, diratakan in baris_teks:
+        if pdf.will_page_break(h):
+            pdf.add_page(same=True)
+        y_teks = pdf.get_y() + h / 2 + 0.3 * pdf.font_size # Posisi baseline seperti cell()
+        if diratakan and ' ' in baris:
+            text_rata(pdf, x_teks, y_teks, baris, lebar - glyph.lebar(baris) * skala)
+        elif baris:
+            pdf.text(x_teks, y_teks, baris)
+        pdf.set_y(pdf.get_y() + h) # set_y juga mengembalikan x ke margin kiri
+
+@dataclass
+class TataTabel:
+    """Lebar & posisi kolom serta header yang sudah dibungkus; dihitung sekali per tabel."""
+    header: Sequence[str]
+    col_widths: List[float]
+    x_kolom: List[float]
+    lebar_teks: List[float]
+    line_height: float
+    tinggi_baris_teks: float
+    baris_header: List[List[str]]
+
+    @classmethod
+    def dari_pdf(cls, pdf, header, col_widths=None):
+        pdf.set_font(pdf.font_family, 'B', 10)
+        line_height = pdf.font_size * 1.5
+        effective_page_width = pdf.w - 2 * pdf.l_margin
+
+        if col_widths is None:
+            num_cols = len(header)
+            col_width = effective_page_width / num_cols
+            col_widths = [col_width] * num_cols
+        elif sum(col_widths) > effective_page_width:
+             scale_factor = effective_page_width / sum(col_widths)
+             col_widths = [w * scale_factor for w in col_widths]
+
+        # Posisi x tiap kolom dihitung sekali (bukan sum(col_widths[:i]) per sel)
+        x_kolom = list(accumulate(col_widths[:-1], initial=pdf.get_x()))
+
+        # Header yang lebih lebar dari kolomnya dibungkus menjadi beberapa baris (diukur sekali)
+        skala = pdf.font_size_pt * 0.001 / pdf.k
+        lebar_teks = [w - 2 * pdf.c_margin for w in col_widths]
+        glyph_header = lebar_glyph(pdf)
+        baris_header = [bungkus_teks(str(h), w, glyph_header, skala) for h, w in zip(header, lebar_teks)]
+        return cls(header, list(col_widths), x_kolom, lebar_teks, line_height, line_height / 1.3, baris_header)
+
+    @property
+    def jumlah_baris_header(self):
+        return max(len(lines) for lines in self.baris_header) if self.baris_header else 1
+
+    @property
+    def tinggi_header(self):
+        return self.line_height if self.jumlah_baris_header == 1 else self.jumlah_baris_header * self.tinggi_baris_teks
+
+    def cetak_header(self, pdf):
+        pdf.set_font(pdf.font_family, 'B', 10)
+        pdf.set_fill_color(230, 230, 230)
+        pdf.set_x(self.x_kolom[0])
+        if self.jumlah_baris_header == 1:
+            for w, header_text in zip(self.col_widths, self.header):
+                pdf.cell(w, self.line_height, header_text, border=1, align='C', fill=True)
+        else:
+            y_header = pdf.get_y()
+            glyph_header = lebar_glyph(pdf)
+            skala = pdf.font_size_pt * 0.001 / pdf.k
+            offset_header = self.tinggi_baris_teks / 2 + 0.3 * pdf.font_size
+            for x, w, lines in zip(self.x_kolom, self.col_widths, self.baris_header):
+                pdf.rect(x, y_header, w, self.tinggi_header, style='DF')
+                for n, line in enumerate(lines):
+                    pdf.text(x + (w - glyph_header.lebar(line) * skala) / 2, y_header + n * self.tinggi_baris_teks + offset_header, line)
+        pdf.ln(self.tinggi_header)
+        pdf.set_font(pdf.font_family, '', 10)
+
+def print_table(pdf, header, data, col_widths=None):
+    """Tabel dengan header berulang di setiap halaman; setiap sel diukur sekali dan digambar sekali.
+
+    data boleh berupa iterator (mis. generator baris roster) karena dibaca sekali, baris demi baris.
+    """
+    tata = TataTabel.dari_pdf(pdf, header, col_widths)
+    tinggi_baris_teks, tinggi_header = tata.tinggi_baris_teks, tata.tinggi_header
+
+    # Setiap baris diukur (dibungkus dengan tabel lebar glyph yang di-cache) tepat sebelum digambar,
+    # sehingga tabel sebesar apa pun tidak menyimpan hasil ukur seluruh baris sekaligus
+    pdf.set_font(pdf.font_family, '', 10)
+    glyph = lebar_glyph(pdf)
+    skala = pdf.font_size_pt * 0.001 / pdf.k
+    offset_teks = tinggi_baris_teks / 2 + 0.3 * pdf.font_size # Posisi baseline seperti cell()
+    y = None
+    for row in data:
+        lines_row = [bungkus_teks(str(datum), w, glyph, skala) for datum, w in zip(row, tata.lebar_teks)]
+        row_height = max(1, *(len(lines) for lines in lines_row)) * tinggi_baris_teks
+        if y is None or y + row_height > pdf.page_break_trigger:
+            # Header di awal tabel (pindah halaman dulu jika header + baris pertama tidak muat) dan di tiap halaman baru
+            if y is not None or pdf.get_y() + tinggi_header + row_height > pdf.page_break_trigger:
+                pdf.add_page()
+            tata.cetak_header(pdf)
+            y = pdf.get_y()
+        for x, w, lines in zip(tata.x_kolom, tata.col_widths, lines_row):
+            pdf.rect(x, y, w, row_height)
+            for n, line in enumerate(lines):
+                if line:
+                    pdf.text(x + pdf.c_margin, y + n * tinggi_baris_teks + offset_teks, line)
+        y += row_height
+    if y is None: # Tabel tanpa baris: tetap cetak header
+        if pdf.get_y() + tinggi_header > pdf.page_break_trigger:
+            pdf.add_page()
+        tata.cetak_header(pdf)
+        y = pdf.get_y()
+
+    # Pastikan Y diatur setelah baris terakhir
+    pdf.set_y(y)
+    pdf.ln(5) # Spasi setelah tabel
+
+# --- Tabel Cepat (Roster Satu Baris per Sel) ---
+UKURAN_CACHE_SEL = 50_000 # Maks. teks unik per kolom yang hasil potong + encode-nya disimpan selama satu tabel
+
+class KodeGlyph(dict):
+    """Karakter -> isi string PDF (sudah dipetakan ke subset font dan di-escape) untuk font aktif satu dokumen.
+
+    encode_text fpdf bekerja per karakter, jadi hasil per karakter bisa disambung; subset.pick
+    dan escape cukup sekali per karakter, bukan sekali per sel.
+    """
+    def __init__(self, pdf):
+        super().__init__()
+        self.pdf = pdf
+        self.font = pdf.current_font
+
+    def __missing__(self, karakter):
+        kode = self[karakter] = self.font.encode_text(self.pdf.normalize_text(karakter))[1:-4] # '(..) Tj' -> '..'
+        return kode
+
+    def tj(self, teks):
+        return '(' + ''.join(map(self.__getitem__, teks)) + ') Tj'
+
+class KolomCepat(dict):
+    """Teks sel -> perintah konten satu kolom (pergeseran Td + Tj); teks yang melebihi lebar kolom dipotong dengan elipsis.
+
+    Nilai yang berulang (fakultas, JK, jalur, KS) hanya diukur dan di-encode sekali per tabel.
+    """
+    def __init__(self, glyph, kode, td, lebar_maks, skala, elipsis):
+        super().__init__()
+        self.glyph = glyph
+        self.kode = kode
+        self.td = td # Pergeseran dari kolom sebelumnya; sel kosong tetap menggeser agar kolom berikutnya di posisinya
+        self.batas = lebar_maks / skala # Dalam satuan glyph
+        self.elipsis = elipsis
+        self.batas_potong = self.batas - glyph.lebar(elipsis)
+
+    def __missing__(self, teks):
+        if len(self) >= UKURAN_CACHE_SEL:
+            self.clear()
+        glyph = self.glyph
+        tampil = teks
+        if glyph.lebar(teks) > self.batas:
+            lebar, n = 0, 0
+            for karakter in teks:
+                lebar += glyph[karakter]
+                if lebar > self.batas_potong:
+                    break
+                n += 1
+            tampil = teks[:n].rstrip() + self.elipsis
+        hasil = self[teks] = f"{self.td} {self.kode.tj(tampil)}" if tampil else self.td # Dikunci teks asli, bukan hasil potong
+        return hasil
+
+def print_tabel_cepat(pdf, header, data, col_widths=None):
+    """Jalur cepat print_table untuk data seragam satu baris per sel (mis. roster NIM/nama/fakultas/JK/jalur/KS).
+
+    Tampilan sama dengan print_table untuk teks yang muat; teks yang terlalu panjang dipotong
+    dengan elipsis, bukan dibungkus. Setiap halaman digambar sebagai satu path grid dan satu
+    blok teks dengan pergeseran Td yang dihitung sekali, sehingga biaya per sel hanya lookup
+    perintah Tj yang sudah jadi. data boleh berupa iterator. Tanpa internal fpdf yang dibutuhkan,
+    tabel digambar dengan print_table biasa.
+    """
+    if not fitur_fpdf()['konten_mentah']:
+        return print_table(pdf, header, data, col_widths)
+    tata = TataTabel.dari_pdf(pdf, header, col_widths)
+    k, h_pt = pdf.k, pdf.h * pdf.k
+    x_kolom, col_widths = tata.x_kolom, tata.col_widths
+    tinggi_baris, tinggi_header = tata.tinggi_baris_teks, tata.tinggi_header
+    x_kiri, x_kanan = x_kolom[0] * k, (x_kolom[-1] + col_widths[-1]) * k
+    garis_vertikal = [f"{x * k:.2f}" for x in x_kolom[1:]]
+    ukuran_pt = pdf.font_size_pt
+
+    # Header: teks bold di tengah kolom, posisi x dihitung sekali
+    font_header = pdf.current_font
+    glyph_header = lebar_glyph(pdf)
+    kode_header = KodeGlyph(pdf)
+    skala = ukuran_pt * 0.001 / k
+    tinggi_baris_header = tata.line_height if tata.jumlah_baris_header == 1 else tinggi_baris
+    teks_header = [(x + (w - glyph_header.lebar(line) * skala) / 2, n * tinggi_baris_header, kode_header.tj(line))
+                   for x, w, lines in zip(x_kolom, col_widths, tata.baris_header) for n, line in enumerate(lines) if line]
+    offset_header = tinggi_baris_header / 2 + 0.3 * pdf.font_size
+    pdf.set_fill_color(230, 230, 230)
+    warna_header = pdf.fill_color.serialize().lower()
+
+    # Isi: semua pergeseran dalam pt, antar kolom dan dari kolom terakhir ke kolom pertama baris berikutnya
+    pdf.set_font(pdf.font_family, '', 10)
+    font = pdf.current_font
+    glyph = lebar_glyph(pdf)
+    kode = KodeGlyph(pdf)
+    elipsis = '\u2026' if glyph.ttf and glyph['\u2026'] else '...' # Core font (latin-1) tidak punya '…'
+    td_kolom = [''] + [f" {(b - a) * k:.2f} 0 Td" for a, b in zip(x_kolom, x_kolom[1:])]
+    kolom = [KolomCepat(glyph, kode, td, w, skala, elipsis) for td, w in zip(td_kolom, tata.lebar_teks)]
+    td_baris = f" {(x_kolom[0] - x_kolom[-1]) * k:.2f} {-tinggi_baris * k:.2f} Td"
+    offset_teks = tinggi_baris / 2 + 0.3 * pdf.font_size # Posisi baseline seperti cell()
+    warna_teks = pdf.text_color.serialize().lower()
+
+    def gambar_halaman(y_header, baris_halaman):
+        """Header, grid dan teks satu halaman dalam tiga perintah konten."""
+        atas, bawah = h_pt - y_header * k, h_pt - (y_header + tinggi_header) * k
+        kotak_header = ' '.join(f"{x * k:.2f} {bawah:.2f} {w * k:.2f} {atas - bawah:.2f} re" for x, w in zip(x_kolom, col_widths))
+        tf_header = pdf._set_font_for_page(font_header, ukuran_pt, wrap_in_text_object=False)
+        isi_header = ' '.join(f"1 0 0 1 {x * k:.2f} {atas - (dy + offset_header) * k:.2f} Tm {tj}" for x, dy, tj in teks_header)
+        pdf._out(f"q {warna_header} {kotak_header} B {warna_teks} BT {tf_header} {isi_header} ET Q")
+        if not baris_halaman:
+            return
+        atas, bawah = bawah, bawah - len(baris_halaman) * tinggi_baris * k
+        grid = [f"{x_kiri:.2f} {bawah:.2f} {x_kanan - x_kiri:.2f} {atas - bawah:.2f} re"]
+        grid += [f"{x_kiri:.2f} {atas - i * tinggi_baris * k:.2f} m {x_kanan:.2f} {atas - i * tinggi_baris * k:.2f} l"
+                 for i in range(1, len(baris_halaman))]
+        grid += [f"{x} {atas:.2f} m {x} {bawah:.2f} l" for x in garis_vertikal]
+        tf = pdf._set_font_for_page(font, ukuran_pt, wrap_in_text_object=False)
+        awal = f"q {warna_teks} BT {tf} {(x_kolom[0] + pdf.c_margin) * k:.2f} {atas - offset_teks * k:.2f} Td"
+        pdf._out(' '.join(grid) + ' S ' + awal + td_baris.join(baris_halaman) + ' ET Q')
+
+    y = None
+    baris_halaman = []
+    for row in data:
+        if y is None or y + tinggi_baris > pdf.page_break_trigger:
+            # Header di awal tabel (pindah halaman dulu jika header + baris pertama tidak muat) dan di tiap halaman baru
+            if y is not None:
+                gambar_halaman(y_header, baris_halaman)
+                baris_halaman = []
+            if y is not None or pdf.get_y() + tinggi_header + tinggi_baris > pdf.page_break_trigger:
+                pdf.add_page()
+            y_header = pdf.get_y()
+            y = y_header + tinggi_header
+        baris_halaman.append(''.join(map(dict.__getitem__, kolom, map(str, row))))
+        y += tinggi_baris
+    if y is None: # Tabel tanpa baris: tetap cetak header
+        if pdf.get_y() + tinggi_header > pdf.page_break_trigger:
+            pdf.add_page()
+        y_header = pdf.get_y()
+        y = y_header + tinggi_header
+    gambar_halaman(y_header, baris_halaman)
+    pdf.current_font_is_set_on_page = False # Tf di atas berada di dalam q..Q; fpdf harus menyetel ulang font
+
+    pdf.set_y(y)
+    pdf.ln(5) # Spasi setelah tabel
+
+# --- Model Konten Laporan ---
+@dataclass
+class JudulBagian:
+    teks: str
+
+@dataclass
+class Subjudul:
+    teks: str
+
+@dataclass
+class Paragraf:
+    teks: str
+
+@dataclass
+class Daftar:
+    item: Sequence[str]
+    pengantar: Optional[str] = None
+
+@dataclass
+class Tabel:
+    header: Sequence[str]
+    data: Sequence[Sequence]
+    lebar_kolom: Union[Sequence[float], Callable[[FPDF], Sequence[float]], None] = None # mm, atau fungsi pdf -> mm
+    ringkas: bool = False # True = print_tabel_cepat (satu baris per sel, teks panjang dipotong)
+
+Blok = Union[JudulBagian, Subjudul, Paragraf, Daftar, Tabel]
+
+@dataclass
+class Laporan:
+    judul: str
+    penulis: str = ""
+    tanggal: str = field(default_factory=lambda: datetime.date.today().strftime("%d %B %Y"))
+    blok: List[Blok] = field(default_factory=list)
+
+def print_blok(pdf, blok):
+    """Menggambar satu blok konten dengan helper print_* yang sesuai."""
+    if isinstance(blok, JudulBagian):
+        print_section_title(pdf, blok.teks)
+    elif isinstance(blok, Subjudul):
+        print_heading(pdf, blok.teks)
+    elif isinstance(blok, Paragraf):
+        print_paragraph(pdf, blok.teks)
+    elif isinstance(blok, Daftar):
+        print_list(pdf, blok.pengantar, blok.item)
+    elif isinstance(blok, Tabel):
+        lebar_kolom = blok.lebar_kolom(pdf) if callable(blok.lebar_kolom) else blok.lebar_kolom
+        (print_tabel_cepat if blok.ringkas else print_table)(pdf, blok.header, blok.data, lebar_kolom)
+    else:
+        raise TypeError(f"Blok laporan tidak dikenal: {type(blok).__name__}")
+
+# --- Report Builder ---
+class ReportBuilder:
+    """Merender model Laporan menjadi PDF (bytes atau file) berulang kali dalam satu proses.
+
+    Pemeriksaan file font dilakukan sekali saat builder dibuat dan font diparsing sekali per proses
+    (lihat RegistriFont), sehingga satu builder dapat dipakai ulang oleh layanan yang menghasilkan
+    banyak laporan.
+    """
+
+    def __init__(self, font_dir=FONT_DIR, orientation='P', unit='mm', format='A4', verbose=True, registri_font=None,
+                 cache_tata_letak=None):
+        self.registri_font = registri_font or REGISTRI_FONT
+        self.cache_tata_letak = cache_tata_letak or CACHE_TATA_LETAK
+        self.orientation = orientation
+        self.unit = unit
+        self.format = format
+        self.font_files = {style: os.path.join(font_dir, nama) for style, nama in DEJAVU_FILES.items()}
+        self.pakai_dejavu = all(os.path.exists(f) for f in self.font_files.values())
+        if verbose:
+            if self.pakai_dejavu:
+                print("Berhasil menambahkan dan beralih ke font 'DejaVu'.")
+            else:
+                print(f"PERINGATAN: Gagal menambahkan font DejaVu - Satu atau lebih file font DejaVu tidak ditemukan. Kembali ke '{DEFAULT_FONT_FAMILY}'. Karakter Unicode mungkin tidak tampil benar.")
+
+    def buat_pdf(self, judul, streaming=False):
+        """PDF kosong dengan font dan pengaturan halaman laporan, siap diisi helper print_*."""
+        pdf = PDF(orientation=self.orientation, unit=self.unit, format=self.format, report_title=judul, streaming=streaming)
+        pdf.cache_tata_letak = self.cache_tata_letak
+        if self.pakai_dejavu:
+            for style, path in self.font_files.items():
+                pdf.font_tertunda['dejavu' + style] = (self.registri_font, 'DejaVu', style, path)
+            pdf.font_family = 'DejaVu'
+        pdf.alias_nb_pages()
+        pdf.add_page()
+        pdf.set_auto_page_break(auto=True, margin=15)
+        pdf.set_margins(20, 15, 20)
+        return pdf
+
+    def susun(self, laporan, streaming=False):
+        """Menata seluruh laporan ke objek PDF baru (belum ditulis)."""
+        pdf = self.buat_pdf(laporan.judul, streaming)
+
+        # Title Section
+        pdf.set_font(pdf.font_family, 'B', 18)
+        pdf.multi_cell(0, 10, laporan.judul, border=0, align='C')
+        pdf.ln(2)
+        pdf.set_font(pdf.font_family, '', 12)
+        pdf.cell(0, 10, f"Penulis: {laporan.penulis}", border=0, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
+        pdf.cell(0, 10, f"Tanggal: {laporan.tanggal}", border=0, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
+        pdf.ln(10)
+
+        for blok in laporan.blok:
+            print_blok(pdf, blok)
+        return pdf
+
+    def render(self, laporan):
+        """Merender laporan dan mengembalikan isi PDF sebagai bytes."""
+        return bytes(self.susun(laporan).output())
+
+    def render_ke_file(self, laporan, path, streaming=False):
+        """Merender laporan ke path. streaming=True: halaman yang selesai langsung di-spool ke disk dan
+        PDF ditulis objek demi objek, untuk laporan sangat besar (mis. roster satu angkatan)."""
+        if streaming:
+            return self.susun(laporan, streaming=True).output_streaming(path)
+        self.susun(laporan).output(path)
+        return path
+
+# --- Render Batch (Satu PDF per Grup, Paralel) ---
+@dataclass
+class HasilBatch:
+    jumlah: int
+    durasi: float
+    path: List[str]
+
+    @property
+    def dokumen_per_detik(self):
+        return self.jumlah / self.durasi if self.durasi > 0 else float('inf')
+
+def tulis_atomik(path, data):
+    """Menulis bytes ke path lewat berkas_atomik."""
+    with berkas_atomik(path) as f:
+        f.write(data)
+    return path
+
+_BUILDER_WORKER = None # ReportBuilder milik proses worker, dibuat sekali oleh _inisialisasi_worker
+
+def _inisialisasi_worker(font_dir):
+    global _BUILDER_WORKER
+    _BUILDER_WORKER = ReportBuilder(font_dir=font_dir, verbose=False)
+
+def _render_satu(tugas):
+    path, laporan = tugas
+    return tulis_atomik(path, _BUILDER_WORKER.render(laporan))
+
+def render_batch(tugas, folder, font_dir=FONT_DIR, jumlah_worker=None, verbose=True):
+    """Merender banyak laporan: tugas berisi pasangan (nama_file, Laporan), ditulis atomik ke folder.
+
+    Setiap worker membuat satu ReportBuilder dan memakai ulang font dari REGISTRI_FONT. Laporan
+    dikirim ke worker dengan pickle, jadi lebar_kolom Tabel harus list (bukan lambda) jika jumlah_worker > 1.
+    """
+    os.makedirs(folder, exist_ok=True)
+    tugas = [(os.path.join(folder, nama_file), laporan) for nama_file, laporan in tugas]
+    if jumlah_worker is None:
+        jumlah_worker = os.cpu_count() or 1
+    jumlah_worker = max(1, min(jumlah_worker, len(tugas)))
+
+    builder = ReportBuilder(font_dir=font_dir, verbose=verbose)
+    if builder.pakai_dejavu: # Parsing font sekali di proses induk; worker hasil fork mewarisinya
+        for style, path in builder.font_files.items():
+            builder.registri_font.ambil(path, style)
+
+    mulai = time.perf_counter()
+    if jumlah_worker == 1:
+        _inisialisasi_worker(font_dir)
+        ditulis = [_render_satu(t) for t in tugas]
+    else:
+        ukuran_potongan = max(1, len(tugas) // (jumlah_worker * 4))
+        with ProcessPoolExecutor(max_workers=jumlah_worker, initializer=_inisialisasi_worker, initargs=(font_dir,)) as executor:
+            ditulis = list(executor.map(_render_satu, tugas, chunksize=ukuran_potongan))
+    hasil = HasilBatch(len(ditulis), time.perf_counter() - mulai, ditulis)
+    if verbose:
+        print(f"{hasil.jumlah} PDF ditulis ke {folder} dalam {hasil.durasi:.2f} detik "
+              f"({hasil.dokumen_per_detik:.1f} dokumen/detik, {jumlah_worker} worker).")
+    return hasil
@@ -1,7 +1,6 @@
 import datetime
-from fpdf import FPDF
-from fpdf.enums import XPos, YPos # Import for deprecation fix
-import os # To check font file existence
+
+from laporan_pdf import ReportBuilder, Laporan, JudulBagian, Subjudul, Paragraf, Daftar, Tabel
 
 # --- Konten Laporan Penelitian (Sudah Diterjemahkan) ---
 report_title = "Laporan Penelitian Komprehensif: Aplikasi Pembelajaran Bahasa Berbasis AI untuk Pemuda Indonesia"
@@ -143,205 +142,71 @@ references_list = [
 # Catatan: Ini adalah daftar sederhana berdasarkan sumber yang disebutkan.
 # Referensi akademik penuh idealnya mencakup judul laporan/artikel spesifik, tahun, dan URL jika tersedia.
 
-
-# --- PDF Generation ---
-
 # Define font file paths (assuming they are in the same directory)
 FONT_DIR = "" # Leave empty if in same dir, otherwise set path e.g., "fonts/"
-DEJAVU_REGULAR = os.path.join(FONT_DIR, "DejaVuSans.ttf")
-DEJAVU_BOLD = os.path.join(FONT_DIR, "DejaVuSans-Bold.ttf")
-DEJAVU_ITALIC = os.path.join(FONT_DIR, "DejaVuSans-Oblique.ttf") # Or DejaVuSans-Italic.ttf
-DEJAVU_BOLD_ITALIC = os.path.join(FONT_DIR, "DejaVuSans-BoldOblique.ttf") # Or DejaVuSans-BoldItalic.ttf
-
-# Default font family in case DejaVu is not found
-DEFAULT_FONT_FAMILY = 'Helvetica'
-
-class PDF(FPDF):
-    def __init__(self, font_family=DEFAULT_FONT_FAMILY, **kwargs):
-        super().__init__(**kwargs)
-        self.font_family = font_family
-
-    def header(self):
-        self.set_font(self.font_family, 'B', 12)
-        # Judul Laporan
-        self.cell(0, 10, report_title, border=0, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
-        self.ln(5)
-
-    def footer(self):
-        self.set_y(-15)
-        self.set_font(self.font_family, 'I', 8)
-        # Nomor Halaman
-        self.cell(0, 10, f'Halaman {self.page_no()}/{self.alias_nb_pages()}', border=0, align='C')
-
-def print_section_title(pdf, title):
-    pdf.set_font(pdf.font_family, 'B', 14)
-    pdf.cell(0, 10, title, border=0, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='L')
-    pdf.ln(2)
-
-def print_heading(pdf, heading):
-    pdf.set_font(pdf.font_family, 'B', 12)
-    pdf.multi_cell(0, 6, heading, border=0, align='L')
-    pdf.ln(1)
-
-def print_paragraph(pdf, text):
-    pdf.set_font(pdf.font_family, '', 11)
-    pdf.multi_cell(0, 5, text.strip(), border=0, align='J') # Justified text
-    pdf.ln(3)
-
-def print_list(pdf, intro_text, items):
-    if intro_text:
-        pdf.set_font(pdf.font_family, 'I', 11) # Italic for intro
-        pdf.multi_cell(0, 5, intro_text.strip(), border=0, align='L')
-        pdf.ln(1)
-    pdf.set_font(pdf.font_family, '', 11)
-    for item in items:
-        # Ganti align='J' menjadi align='L' untuk memperbaiki error
-        pdf.multi_cell(0, 5, f'  • {item.strip()}', border=0, align='L')
-    pdf.ln(3)
-
-def print_table(pdf, header, data, col_widths=None):
-    pdf.set_font(pdf.font_family, 'B', 10)
-    line_height = pdf.font_size * 1.5
-    effective_page_width = pdf.w - 2 * pdf.l_margin
-
-    if col_widths is None:
-        num_cols = len(header)
-        col_width = effective_page_width / num_cols
-        col_widths = [col_width] * num_cols
-    elif sum(col_widths) > effective_page_width:
-         scale_factor = effective_page_width / sum(col_widths)
-         col_widths = [w * scale_factor for w in col_widths]
-
-    # Header
-    pdf.set_fill_color(230, 230, 230)
-    for i, header_text in enumerate(header):
-        pdf.cell(col_widths[i], line_height, header_text, border=1, align='C', fill=True)
-    pdf.ln(line_height)
-
-    # Data rows
-    pdf.set_font(pdf.font_family, '', 10)
-    pdf.set_fill_color(255, 255, 255)
-    for row in data:
-        x_start = pdf.get_x()
-        y_start = pdf.get_y()
-        max_lines = 1
-        cells_data = []
-
-        for i, datum in enumerate(row):
-            datum_str = str(datum)
-            # Terima DeprecationWarning untuk split_only untuk saat ini
-            lines = pdf.multi_cell(col_widths[i], line_height/1.3, datum_str, border=0, align='L', split_only=True)
-            max_lines = max(max_lines, len(lines))
-            cells_data.append(lines)
-
-        row_height = max_lines * line_height / 1.3
-        for i, lines in enumerate(cells_data):
-             pdf.set_xy(x_start + sum(col_widths[:i]), y_start)
-             # Hapus ln=3 dari multi_cell untuk fix DeprecationWarning lain (efek visual mungkin perlu dicek)
-             pdf.multi_cell(col_widths[i], line_height/1.3, "\n".join(lines), border=1, align='L') # ln=3 dihapus
-
-        # Pastikan Y diatur setelah baris terpanjang
-        pdf.set_y(y_start + row_height)
-
-    pdf.ln(5) # Spasi setelah tabel
-
-# --- Create PDF Document ---
-pdf = PDF(orientation='P', unit='mm', format='A4')
-
-# --- Add Unicode Font ---
-font_family_to_use = DEFAULT_FONT_FAMILY
-try:
-    if not all(os.path.exists(f) for f in [DEJAVU_REGULAR, DEJAVU_BOLD, DEJAVU_ITALIC, DEJAVU_BOLD_ITALIC]):
-        raise FileNotFoundError("Satu atau lebih file font DejaVu tidak ditemukan.")
-
-    pdf.add_font('DejaVu', '', DEJAVU_REGULAR)
-    pdf.add_font('DejaVu', 'B', DEJAVU_BOLD)
-    pdf.add_font('DejaVu', 'I', DEJAVU_ITALIC)
-    pdf.add_font('DejaVu', 'BI', DEJAVU_BOLD_ITALIC)
-    font_family_to_use = 'DejaVu'
-    print(f"Berhasil menambahkan dan beralih ke font '{font_family_to_use}'.")
-    pdf.font_family = font_family_to_use
 
-except Exception as e:
-     print(f"PERINGATAN: Gagal menambahkan font DejaVu - {e}. Kembali ke '{font_family_to_use}'. Karakter Unicode mungkin tidak tampil benar.")
+# --- Model Konten Laporan (urutan sama dengan tampilan PDF) ---
+table1_widths = lambda pdf: [pdf.w * 0.3 - pdf.l_margin, pdf.w * 0.3 - pdf.l_margin, pdf.w * 0.3 - pdf.l_margin]
+table3_widths = lambda pdf: [pdf.w * 0.3 - pdf.l_margin, pdf.w * 0.3 - pdf.l_margin, pdf.w * 0.3 - pdf.l_margin]
+table6_widths = lambda pdf: [pdf.w * 0.4 - pdf.l_margin, pdf.w * 0.5 - pdf.l_margin]
+
+laporan_riset = Laporan(
+    judul=report_title,
+    penulis=report_author,
+    tanggal=report_date,
+    blok=[
+        # Pendahuluan & Metodologi
+        JudulBagian("Pendahuluan"),
+        Paragraf(introduction_text),
+        JudulBagian("Metodologi"),
+        Paragraf(methodology_text),
+
+        # Temuan
+        JudulBagian(findings_title),
+        # Section 1
+        Subjudul(heading1),
+        Paragraf(text1),
+        Tabel(table1_header, table1_data, table1_widths),
+        # Section 2
+        Subjudul(heading2),
+        Daftar(text2_list, text2_intro),
+        Daftar(text2_limitations_list, text2_limitations_intro),
+        # Section 3
+        Subjudul(heading3),
+        Daftar(text3_list, text3_intro),
+        Daftar(text3_proficiency_list, text3_proficiency_intro),
+        Tabel(table3_header, table3_data, table3_widths),
+        # Section 4
+        Subjudul(heading4),
+        Daftar(text4_3T_list, text4_3T_intro),
+        Daftar(text4_urban_list, text4_urban_intro),
+        # Section 5
+        Subjudul(heading5),
+        Daftar(text5_features_list, text5_intro),
+        Daftar(text5_concerns_list, text5_concerns_intro),
+        # Section 6
+        Subjudul(heading6),
+        Paragraf(text6_intro),
+        Daftar(text6_contribution_list),
+        Tabel(table6_header, table6_data, table6_widths),
+
+        # Kesimpulan
+        JudulBagian(conclusion_title),
+        Paragraf(conclusion_text),
+
+        # Daftar Pustaka (daftar tanpa intro)
+        JudulBagian(references_title),
+        Daftar(references_list),
+    ],
+)
 
-# --- Continue PDF Setup ---
-pdf.alias_nb_pages()
-pdf.add_page()
-pdf.set_auto_page_break(auto=True, margin=15)
-pdf.set_margins(20, 15, 20)
-
-# Title Section
-pdf.set_font(pdf.font_family, 'B', 18)
-pdf.multi_cell(0, 10, report_title, border=0, align='C')
-pdf.ln(2)
-pdf.set_font(pdf.font_family, '', 12)
-# Ganti label Author & Date ke Bahasa Indonesia
-pdf.cell(0, 10, f"Penulis: {report_author}", border=0, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
-pdf.cell(0, 10, f"Tanggal: {report_date}", border=0, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
-pdf.ln(10)
-
-# --- Add Content Sections (calling helper functions) ---
-# Pendahuluan
-print_section_title(pdf, "Pendahuluan") # Ganti judul section
-print_paragraph(pdf, introduction_text)
-
-# Metodologi
-print_section_title(pdf, "Metodologi") # Ganti judul section
-print_paragraph(pdf, methodology_text)
-
-# Temuan
-print_section_title(pdf, findings_title)
-
-# Section 1
-print_heading(pdf, heading1)
-print_paragraph(pdf, text1)
-table1_widths = [pdf.w * 0.3 - pdf.l_margin, pdf.w * 0.3 - pdf.l_margin, pdf.w * 0.3 - pdf.l_margin]
-print_table(pdf, table1_header, table1_data, table1_widths)
-
-# Section 2
-print_heading(pdf, heading2)
-print_list(pdf, text2_intro, text2_list)
-print_list(pdf, text2_limitations_intro, text2_limitations_list)
-
-# Section 3
-print_heading(pdf, heading3)
-print_list(pdf, text3_intro, text3_list)
-print_list(pdf, text3_proficiency_intro, text3_proficiency_list)
-table3_widths = [pdf.w * 0.3 - pdf.l_margin, pdf.w * 0.3 - pdf.l_margin, pdf.w * 0.3 - pdf.l_margin]
-print_table(pdf, table3_header, table3_data, table3_widths)
-
-# Section 4
-print_heading(pdf, heading4)
-print_list(pdf, text4_3T_intro, text4_3T_list)
-print_list(pdf, text4_urban_intro, text4_urban_list)
-
-# Section 5
-print_heading(pdf, heading5)
-print_list(pdf, text5_intro, text5_features_list)
-print_list(pdf, text5_concerns_intro, text5_concerns_list)
-
-# Section 6
-print_heading(pdf, heading6)
-print_paragraph(pdf, text6_intro)
-print_list(pdf, None, text6_contribution_list)
-table6_widths = [pdf.w * 0.4 - pdf.l_margin, pdf.w * 0.5 - pdf.l_margin]
-print_table(pdf, table6_header, table6_data, table6_widths)
-
-# Kesimpulan
-print_section_title(pdf, conclusion_title)
-print_paragraph(pdf, conclusion_text)
-
-# Daftar Pustaka
-print_section_title(pdf, references_title)
-# Gunakan print_list tanpa intro untuk format daftar pustaka
-print_list(pdf, None, references_list)
-
-# --- Save the PDF ---
 # Ganti nama file output ke Bahasa Indonesia
 output_filename = "Laporan_Riset_Aplikasi_Bahasa_Indonesia_v3.pdf"
-try:
-    pdf.output(output_filename)
-    print(f"Berhasil menghasilkan PDF: {output_filename}")
-except Exception as e:
-    print(f"Gagal menghasilkan PDF: {e}")
\ No newline at end of file
+
+# --- Save the PDF ---
+if __name__ == "__main__":
+    try:
+        ReportBuilder(font_dir=FONT_DIR).render_ke_file(laporan_riset, output_filename)
+        print(f"Berhasil menghasilkan PDF: {output_filename}")
+    except Exception as e:
+        print(f"Gagal menghasilkan PDF: {e}")